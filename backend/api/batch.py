@@ -0,0 +1,96 @@
+"""
+Batch API - run several independent GET requests in one HTTP round-trip.
+
+Mini App views that need e.g. a prospect, its journal and its call script
+send them together instead of paying a Telegram WebView round-trip (and TLS
+setup) for each. Sub-requests are dispatched in-process through the app
+itself, concurrently, with the caller's Telegram initData forwarded, so each
+one goes through the normal route and permission checks. The initData is
+verified once for the whole batch (a bad one fails it with a single 401) and
+the sub-requests reuse that user and the memberships resolved among them.
+"""
+import asyncio
+
+import httpx
+import orjson
+from fastapi import APIRouter, Header, Request
+
+from models import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from services.org_access import share_memberships
+from services.telegram import get_telegram_user, share_verified_user
+
+router = APIRouter()
+
+# Only API routes can be batched, and a batch cannot contain another batch
+_ALLOWED_PREFIX = "/api/"
+_BATCH_PATH = "/api/batch"
+
+# Response headers worth passing back to the client
+_FORWARDED_HEADERS = ("content-type", "content-disposition", "x-next-cursor")
+
+
+async def _dispatch(
+    client: httpx.AsyncClient,
+    sub: BatchSubRequest,
+    init_data: str
+) -> BatchSubResponse:
+    """Run one sub-request against the app and capture its result."""
+    path = sub.url.split("?", 1)[0]
+    if not path.startswith(_ALLOWED_PREFIX) or path.rstrip("/") == _BATCH_PATH:
+        return BatchSubResponse(
+            id=sub.id,
+            status=400,
+            body={"detail": "Only /api/ routes (other than /api/batch) can be batched"}
+        )
+
+    response = await client.request(
+        sub.method,
+        sub.url,
+        headers={"X-Telegram-Init-Data": init_data}
+    )
+
+    content_type = response.headers.get("content-type", "")
+    if "json" in content_type:
+        body = orjson.loads(response.content) if response.content else None
+    else:
+        body = response.text
+
+    return BatchSubResponse(
+        id=sub.id,
+        status=response.status_code,
+        headers={
+            name: response.headers[name]
+            for name in _FORWARDED_HEADERS
+            if name in response.headers
+        },
+        body=body
+    )
+
+
+@router.post("/batch")
+async def run_batch(
+    data: BatchRequest,
+    request: Request,
+    x_telegram_init_data: str = Header(...)
+) -> BatchResponse:
+    """
+    Execute independent GET sub-requests concurrently.
+
+    Each entry is {"id", "method": "GET", "url": "/api/..."}; results come
+    back in the same order as {"id", "status", "headers", "body"}. A failing
+    sub-request only affects its own entry.
+    """
+    # Verified once here; a bad initData fails the whole batch with one 401
+    tg_user = get_telegram_user(x_telegram_init_data)
+
+    # App exceptions become 500 sub-responses instead of failing the batch
+    transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False)
+    # Sub-requests run in copies of this context, so they see the shared auth
+    with share_verified_user(x_telegram_init_data, tg_user), share_memberships():
+        async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+            responses = await asyncio.gather(*[
+                _dispatch(client, sub, x_telegram_init_data)
+                for sub in data.requests
+            ])
+
+    return BatchResponse(responses=list(responses))
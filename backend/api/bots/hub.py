@@ -10,9 +10,11 @@ Handles:
 - Bot access management
 """
 import secrets
+from collections import Counter
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, Header, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Header, HTTPException, BackgroundTasks, Response
+from postgrest.types import ReturnMethod
 
 from models import (
     TelegramUser, User,
@@ -28,6 +30,8 @@ from models import (
 )
 from services import get_supabase_admin, get_telegram_user
 from services.cache import cache_get, cache_set, cache_delete, cache_invalidate, cache_invalidate_multi
+from services.org_access import get_org_membership, require_org_admin
+from services.lead_agent_catalog import get_products_json, invalidate_catalog
 from services.notifications import (
     notify_admin_new_request,
     notify_user_approved,
@@ -48,71 +52,6 @@ async def get_current_user(x_telegram_init_data: str = Header(...)) -> TelegramU
     return get_telegram_user(x_telegram_init_data)
 
 
-def _cached_get_user_id(telegram_id: int) -> str:
-    """Get user ID from telegram_id, with caching."""
-    cache_key = f"user:{telegram_id}"
-    cached = cache_get("auth", cache_key)
-    if cached is not None:
-        return cached
-
-    db = get_supabase_admin()
-    result = db.table("users").select("id").eq("telegram_id", telegram_id).single().execute()
-    if not result.data:
-        raise HTTPException(404, "User not found")
-
-    user_id = result.data["id"]
-    cache_set("auth", cache_key, user_id)
-    return user_id
-
-
-def _cached_verify_admin(telegram_id: int, org_id: str) -> str:
-    """Verify user is admin of org, return user_id. Cached."""
-    user_id = _cached_get_user_id(telegram_id)
-
-    cache_key = f"membership:{user_id}:{org_id}"
-    cached = cache_get("auth", cache_key)
-    if cached is not None:
-        if cached.get("role") != "admin":
-            raise HTTPException(403, "Admin access required")
-        return user_id
-
-    db = get_supabase_admin()
-    membership = db.table("memberships").select("role").eq(
-        "user_id", user_id
-    ).eq("org_id", org_id).single().execute()
-
-    if not membership.data:
-        raise HTTPException(403, "Not a member of this organization")
-
-    cache_set("auth", cache_key, membership.data)
-
-    if membership.data["role"] != "admin":
-        raise HTTPException(403, "Admin access required")
-
-    return user_id
-
-
-def _cached_verify_member(telegram_id: int, org_id: str) -> tuple:
-    """Verify user is member of org, return (user_id, role). Cached."""
-    user_id = _cached_get_user_id(telegram_id)
-
-    cache_key = f"membership:{user_id}:{org_id}"
-    cached = cache_get("auth", cache_key)
-    if cached is not None:
-        return user_id, cached.get("role", "member")
-
-    db = get_supabase_admin()
-    membership = db.table("memberships").select("role").eq(
-        "user_id", user_id
-    ).eq("org_id", org_id).execute()
-
-    if not membership.data:
-        raise HTTPException(403, "Not a member of this organization")
-
-    cache_set("auth", cache_key, membership.data[0])
-    return user_id, membership.data[0]["role"]
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # USER ENDPOINTS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -163,7 +102,7 @@ async def get_me(x_telegram_init_data: str = Header(...)) -> dict:
         for m in memberships.data:
             db.table("memberships").update({
                 "last_active_at": now
-            }).eq("id", m["id"]).execute()
+            }, returning=ReturnMethod.minimal).eq("id", m["id"]).execute()
 
     # Get any pending requests
     pending_requests = db.table("membership_requests").select(
@@ -200,7 +139,7 @@ async def create_organization(
         user_id = user_result.data[0]["id"]
         db.table("users").update({
             "full_name": data.admin_full_name
-        }).eq("id", user_id).execute()
+        }, returning=ReturnMethod.minimal).eq("id", user_id).execute()
     else:
         # Create new user with provided name
         new_user = db.table("users").insert({
@@ -245,7 +184,7 @@ async def get_organization(
 ) -> dict:
     """Get organization details (must be a member)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    user_id, role = _cached_verify_member(tg_user.id, org_id)
+    user_id, role = get_org_membership(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Get org
@@ -268,7 +207,7 @@ async def get_organization_details(
 ) -> OrgDetails:
     """Get organization details with stats (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     # Check cache
     cache_key = f"org_details:{org_id}"
@@ -284,11 +223,11 @@ async def get_organization_details(
         raise HTTPException(404, "Organization not found")
 
     # Get stats
-    members_count = db.table("memberships").select("id", count="exact").eq(
+    members_count = db.table("memberships").select("id", count="exact", head=True).eq(
         "org_id", org_id
     ).execute()
 
-    pending_count = db.table("membership_requests").select("id", count="exact").eq(
+    pending_count = db.table("membership_requests").select("id", count="exact", head=True).eq(
         "org_id", org_id
     ).eq("status", "pending").execute()
 
@@ -324,15 +263,11 @@ async def update_organization(
 ) -> dict:
     """Update organization details (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
-    # Build update data
-    update_data = {}
-    if data.name is not None:
-        update_data["name"] = data.name
-    if data.description is not None:
-        update_data["description"] = data.description
+    # Only the fields that were sent
+    update_data = data.model_dump(mode="json", exclude_none=True)
 
     if not update_data:
         raise HTTPException(400, "No fields to update")
@@ -355,7 +290,7 @@ async def get_invite_code(
 ) -> InviteCode:
     """Get the invite code for an organization (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     # Check cache
     invite_cache_key = f"invite:{org_id}"
@@ -408,7 +343,7 @@ async def regenerate_invite_code(
 ) -> InviteCode:
     """Regenerate the invite code for an organization (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Generate new invite code with 24-hour expiration
@@ -419,7 +354,7 @@ async def regenerate_invite_code(
     db.table("organizations").update({
         "invite_code": new_code,
         "invite_code_expires_at": expires_at.isoformat()
-    }).eq("id", org_id).execute()
+    }, returning=ReturnMethod.minimal).eq("id", org_id).execute()
 
     # Get org name
     org = db.table("organizations").select("name").eq("id", org_id).single().execute()
@@ -462,7 +397,7 @@ async def send_invite_link(
     If the current code is expired, a new one is generated automatically.
     """
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Get org details
@@ -481,7 +416,7 @@ async def send_invite_link(
         db.table("organizations").update({
             "invite_code": new_code,
             "invite_code_expires_at": expires_at.isoformat()
-        }).eq("id", org_id).execute()
+        }, returning=ReturnMethod.minimal).eq("id", org_id).execute()
         invite_code = new_code
         cache_delete("org", f"invite:{org_id}")
     else:
@@ -561,7 +496,7 @@ async def create_membership_request(
         if data.full_name:
             db.table("users").update({
                 "full_name": data.full_name
-            }).eq("id", user["id"]).execute()
+            }, returning=ReturnMethod.minimal).eq("id", user["id"]).execute()
     else:
         # Create user
         user_data = {
@@ -652,7 +587,7 @@ async def list_membership_requests(
 ) -> List[MembershipRequest]:
     """List membership requests for an organization (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     # Check cache (only for default pending status)
     cache_key = f"requests:{org_id}:{status or 'all'}"
@@ -695,7 +630,7 @@ async def approve_membership_request(
     request_data = request.data
 
     # Verify admin of this org
-    admin_user_id = _cached_verify_admin(tg_user.id, request_data["org_id"])
+    admin_user_id = require_org_admin(tg_user.id, request_data["org_id"])
 
     if data.approved:
         # Create membership
@@ -724,7 +659,7 @@ async def approve_membership_request(
         # Update request status
         db.table("membership_requests").update({
             "status": "approved"
-        }).eq("id", request_id).execute()
+        }, returning=ReturnMethod.minimal).eq("id", request_id).execute()
 
         # Notify user
         requester = db.table("users").select("telegram_id").eq(
@@ -744,6 +679,7 @@ async def approve_membership_request(
         cache_invalidate("org", f"requests:{org_id}")
         cache_invalidate("org", f"members:{org_id}")
         cache_invalidate("org", f"org_details:{org_id}")
+        cache_invalidate("membership", f"member:{org_id}:")
 
         return {"status": "approved", "bot_access": bot_names}
 
@@ -751,7 +687,7 @@ async def approve_membership_request(
         # Reject
         db.table("membership_requests").update({
             "status": "rejected"
-        }).eq("id", request_id).execute()
+        }, returning=ReturnMethod.minimal).eq("id", request_id).execute()
 
         cache_invalidate("org", f"requests:{request_data['org_id']}")
 
@@ -781,7 +717,7 @@ async def list_members(
 ) -> List[Member]:
     """List all members of an organization."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_member(tg_user.id, org_id)
+    get_org_membership(tg_user.id, org_id)
 
     # Check cache
     cache_key = f"members:{org_id}"
@@ -835,7 +771,7 @@ async def remove_member(
 ) -> dict:
     """Remove a member from an organization (admin only). Cannot remove admins."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Get the target membership
@@ -851,16 +787,16 @@ async def remove_member(
         raise HTTPException(400, "Cannot remove an admin member")
 
     # Delete bot access first (cascade should handle this, but being explicit)
-    db.table("bot_member_access").delete().eq("membership_id", member_id).execute()
+    db.table("bot_member_access").delete(returning=ReturnMethod.minimal).eq("membership_id", member_id).execute()
 
     # Delete membership
-    db.table("memberships").delete().eq("id", member_id).execute()
+    db.table("memberships").delete(returning=ReturnMethod.minimal).eq("id", member_id).execute()
 
     # Invalidate members and org details caches
     cache_invalidate("org", f"members:{org_id}")
     cache_invalidate("org", f"org_details:{org_id}")
-    # Invalidate removed user's auth cache
-    cache_invalidate("auth", f"membership:{target.data['user_id']}")
+    # Invalidate the removed user's cached membership
+    cache_invalidate("membership", f"member:{org_id}:")
 
     return {
         "status": "removed",
@@ -877,7 +813,7 @@ async def update_member_bots(
 ) -> dict:
     """Update bot access for a member (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    admin_user_id = _cached_verify_admin(tg_user.id, org_id)
+    admin_user_id = require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Verify target membership exists and belongs to this org
@@ -899,7 +835,7 @@ async def update_member_bots(
     to_remove = current_bot_ids - new_bot_ids
     if to_remove:
         for bot_id in to_remove:
-            db.table("bot_member_access").delete().eq(
+            db.table("bot_member_access").delete(returning=ReturnMethod.minimal).eq(
                 "membership_id", member_id
             ).eq("bot_id", bot_id).execute()
 
@@ -935,7 +871,7 @@ async def update_member_role(
 ) -> dict:
     """Update role for a member (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Validate role
@@ -954,11 +890,13 @@ async def update_member_role(
     db.table("memberships").update({
         "role": data.role,
         "updated_at": datetime.now(timezone.utc).isoformat()
-    }).eq("id", member_id).execute()
+    }, returning=ReturnMethod.minimal).eq("id", member_id).execute()
 
     # Invalidate members and org details caches
     cache_delete("org", f"members:{org_id}")
-    cache_delete("org", f"orgDetails:{org_id}")
+    cache_delete("org", f"org_details:{org_id}")
+    # Invalidate the member's cached role so the change applies immediately
+    cache_invalidate("membership", f"member:{org_id}:")
 
     return {
         "status": "updated",
@@ -998,7 +936,7 @@ async def log_activity(
 ) -> dict:
     """Log member activity (called from mini-apps)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    user_id, _ = _cached_verify_member(tg_user.id, data.org_id)
+    user_id, _ = get_org_membership(tg_user.id, data.org_id)
     db = get_supabase_admin()
 
     # Get membership id for logging
@@ -1020,7 +958,7 @@ async def log_activity(
     # Update last_active_at
     db.table("memberships").update({
         "last_active_at": datetime.now(timezone.utc).isoformat()
-    }).eq("id", membership.data["id"]).execute()
+    }, returning=ReturnMethod.minimal).eq("id", membership.data["id"]).execute()
 
     return {"status": "logged"}
 
@@ -1033,7 +971,7 @@ async def get_team_analytics(
 ) -> TeamAnalytics:
     """Get team activity analytics (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     # Check cache (keyed by org + period)
     cache_key = f"team_analytics:{org_id}:{period}"
@@ -1069,7 +1007,7 @@ async def get_team_analytics(
     for m in members_result.data:
         # Count activities
         activity_result = db.table("member_activity_log").select(
-            "id", count="exact"
+            "id", count="exact", head=True
         ).eq("membership_id", m["id"]).gte(
             "created_at", period_start.isoformat()
         ).execute()
@@ -1084,8 +1022,7 @@ async def get_team_analytics(
         bots_accessed[m["id"]] = list(set(b["bot_id"] for b in bots_result.data if b["bot_id"]))
 
     # Get leads generated and diary entries per member for this period
-    leads_by_user = {}
-    diary_by_user = {}
+    diary_by_user = Counter()
 
     leads_result = db.table("lead_agent_prospects").select(
         "created_by"
@@ -1093,9 +1030,7 @@ async def get_team_analytics(
         "created_at", period_start.isoformat()
     ).not_.is_("created_by", "null").execute()
 
-    for p in leads_result.data:
-        uid = p["created_by"]
-        leads_by_user[uid] = leads_by_user.get(uid, 0) + 1
+    leads_by_user = Counter(p["created_by"] for p in leads_result.data)
 
     # Get all prospect IDs for this org to filter journal entries
     org_prospect_ids = db.table("lead_agent_prospects").select(
@@ -1110,9 +1045,7 @@ async def get_team_analytics(
             "created_at", period_start.isoformat()
         ).execute()
 
-        for d in diary_result.data:
-            uid = d["user_id"]
-            diary_by_user[uid] = diary_by_user.get(uid, 0) + 1
+        diary_by_user = Counter(d["user_id"] for d in diary_result.data)
 
     # Build member activity list
     member_activities = []
@@ -1164,7 +1097,7 @@ async def get_agent_analytics(
 ) -> AgentAnalytics:
     """Get agent usage analytics (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     # Check cache
     cache_key = f"agent_analytics:{org_id}:{period}"
@@ -1198,7 +1131,7 @@ async def get_agent_analytics(
     for bot in bots_result.data:
         # Count task_completed activities for this bot
         tasks_result = db.table("member_activity_log").select(
-            "id", count="exact"
+            "id", count="exact", head=True
         ).eq("org_id", org_id).eq("bot_id", bot["id"]).eq(
             "action_type", "task_completed"
         ).gte("created_at", period_start.isoformat()).execute()
@@ -1243,7 +1176,7 @@ async def get_lead_agent_overview(
 ) -> LeadAgentOverview:
     """Get lead agent overview stats for admin dashboard."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     cache_key = f"la_overview:{org_id}"
     cached = cache_get("analytics", cache_key)
@@ -1259,12 +1192,7 @@ async def get_lead_agent_overview(
 
     active_leads = sum(1 for p in prospects.data if p["status"] != "closed")
 
-    # Count pending scheduled follow-ups
-    followups = db.table("lead_agent_scheduled_notifications").select(
-        "id", count="exact"
-    ).eq("status", "pending").execute()
-
-    # Filter to only this org's prospects
+    # Count pending scheduled follow-ups for this org's prospects
     org_prospect_ids = [p["id"] for p in db.table("lead_agent_prospects").select(
         "id"
     ).eq("org_id", org_id).execute().data]
@@ -1272,7 +1200,7 @@ async def get_lead_agent_overview(
     scheduled_count = 0
     if org_prospect_ids:
         org_followups = db.table("lead_agent_scheduled_notifications").select(
-            "id", count="exact"
+            "id", count="exact", head=True
         ).eq("status", "pending").in_(
             "prospect_id", org_prospect_ids
         ).execute()
@@ -1373,7 +1301,7 @@ async def get_billing_overview(
 ) -> BillingOverview:
     """Get billing overview for an organization (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
 
     # Check cache
     cache_key = f"billing:{org_id}"
@@ -1428,7 +1356,7 @@ async def get_billing_overview(
     )
 
     # Get usage stats
-    members_count = db.table("memberships").select("id", count="exact").eq("org_id", org_id).execute()
+    members_count = db.table("memberships").select("id", count="exact", head=True).eq("org_id", org_id).execute()
 
     usage = {
         "members_used": members_count.count or 0,
@@ -1479,24 +1407,11 @@ async def list_products(
     Viewable by all members, but only editable by admins.
     """
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_member(tg_user.id, org_id)
-
-    # Check cache
-    cache_key = f"products:{org_id}"
-    cached = cache_get("catalog", cache_key)
-    if cached is not None:
-        return cached
-
-    db = get_supabase_admin()
-
-    # Get all products
-    result = db.table("lead_agent_products").select("*").eq(
-        "org_id", org_id
-    ).order("created_at", desc=True).execute()
+    get_org_membership(tg_user.id, org_id)
 
-    products = [Product(**p) for p in result.data]
-    cache_set("catalog", cache_key, products)
-    return products
+    # Cached as encoded JSON (shared with the lead agent product list)
+    body = await get_products_json(org_id)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/orgs/{org_id}/products")
@@ -1507,7 +1422,7 @@ async def create_product(
 ) -> Product:
     """Create a new product/service (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Create product
@@ -1520,7 +1435,7 @@ async def create_product(
     }
 
     result = db.table("lead_agent_products").insert(product_data).execute()
-    cache_delete("catalog", f"products:{org_id}")
+    invalidate_catalog(org_id)
     return Product(**result.data[0])
 
 
@@ -1533,7 +1448,7 @@ async def update_product(
 ) -> Product:
     """Update a product/service (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Verify product belongs to this org
@@ -1544,16 +1459,8 @@ async def update_product(
     if not product_check.data:
         raise HTTPException(404, "Product not found")
 
-    # Build update data
-    update_data = {}
-    if data.name is not None:
-        update_data["name"] = data.name
-    if data.description is not None:
-        update_data["description"] = data.description
-    if data.price is not None:
-        update_data["price"] = str(data.price)
-    if data.is_active is not None:
-        update_data["is_active"] = data.is_active
+    # Only the fields that were sent (Decimal price -> string in JSON mode)
+    update_data = data.model_dump(mode="json", exclude_none=True)
 
     if not update_data:
         raise HTTPException(400, "No fields to update")
@@ -1562,7 +1469,7 @@ async def update_product(
         "id", product_id
     ).execute()
 
-    cache_delete("catalog", f"products:{org_id}")
+    invalidate_catalog(org_id)
     return Product(**result.data[0])
 
 
@@ -1574,7 +1481,7 @@ async def delete_product(
 ) -> dict:
     """Delete a product/service (admin only)."""
     tg_user = get_telegram_user(x_telegram_init_data)
-    _cached_verify_admin(tg_user.id, org_id)
+    require_org_admin(tg_user.id, org_id)
     db = get_supabase_admin()
 
     # Verify product belongs to this org and get name for response
@@ -1586,7 +1493,7 @@ async def delete_product(
         raise HTTPException(404, "Product not found")
 
     # Delete product
-    db.table("lead_agent_products").delete().eq("id", product_id).execute()
+    db.table("lead_agent_products").delete(returning=ReturnMethod.minimal).eq("id", product_id).execute()
 
-    cache_delete("catalog", f"products:{org_id}")
+    invalidate_catalog(org_id)
     return {"status": "deleted", "product_id": product_id, "name": product.data[0]["name"]}
@@ -9,26 +9,37 @@ Handles:
 - vCard generation for contacts
 """
 import asyncio
+import base64
+import logging
+import uuid
 from datetime import datetime, timezone
 from typing import List, Optional
-from fastapi import APIRouter, Header, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, BackgroundTasks, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from postgrest.types import ReturnMethod
 
 from models import (
     TelegramUser,
     ProductCreate, ProductUpdate, Product,
     ProspectCreate, ProspectManualCreate, ProspectStatusUpdate, ProspectContactUpdate, Prospect, ProspectCard,
-    PainPoint, ScrapeRequest, SearchHistory,
+    ProspectBatchCreate, ProspectBatchResult,
+    ScrapeRequest, ScrapeBatchRequest, ScrapeFailure, ScrapeBatchResult, SearchHistory,
     LeadAgentDashboard, CurrencyUpdate,
     JournalEntryCreate, JournalEntryUpdate, JournalEntry
 )
 from services import get_supabase_admin, get_telegram_user
-from services.cache import cache_get, cache_set, cache_delete, cache_invalidate
-from services.url_scraper import URLScraperService, ScraperError
-from services.ai_lead_agent import LeadAgentAI
+from services.cache import cache_get, cache_set, cache_delete, cache_invalidate, cache_singleflight
+from services.url_scraper import ExtractedBusiness, ScraperError, compute_dedup_hash, get_url_scraper
+from services.ai_lead_agent import get_lead_agent_ai
 from services.bot_task_logger import BotTaskLogger, TaskTimer
-from config import settings
+from services.insights_worker import enqueue_insights
+from services.org_access import get_org_membership, remember_org_membership, require_org_admin
+from services.lead_agent_catalog import get_active_products, get_products_json, invalidate_catalog
+from services.postgrest_async import pg_count, pg_get, pg_query_template, pg_rpc, pg_select_one
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+logger = logging.getLogger(__name__)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -36,132 +47,232 @@ router = APIRouter()
 # ─────────────────────────────────────────────────────────────────────────────
 
 async def get_current_user(x_telegram_init_data: str = Header(...)) -> TelegramUser:
-    """Extract and verify Telegram user from initData header."""
+    """
+    Extract and verify Telegram user from initData header.
+    Used as a dependency so initData is verified once per request.
+    """
     return get_telegram_user(x_telegram_init_data)
 
 
 async def verify_org_member(user_telegram_id: int, org_id: str) -> tuple[str, str]:
     """
     Verify user is a member of the organization.
-    Returns (user_id, role). Uses auth cache.
+    Returns (user_id, role). Cached (see services.org_access).
     """
-    # Cached user lookup
-    user_cache_key = f"user:{user_telegram_id}"
-    user_id = cache_get("auth", user_cache_key)
-
-    if user_id is None:
-        db = get_supabase_admin()
-        user_result = db.table("users").select("id").eq(
-            "telegram_id", user_telegram_id
-        ).execute()
+    return get_org_membership(user_telegram_id, org_id)
+
+
+async def verify_org_admin(user_telegram_id: int, org_id: str) -> str:
+    """
+    Verify user is an admin of the organization.
+    Returns user_id.
+    """
+    return require_org_admin(user_telegram_id, org_id)
 
-        if not user_result.data:
-            raise HTTPException(404, "User not found")
 
-        user_id = user_result.data[0]["id"]
-        cache_set("auth", user_cache_key, user_id)
+# vCard 3.0 (RFC 2426) text-value escaping (str.translate is single-pass, so escapes never stack)
+_VCARD_ESCAPE = str.maketrans({
+    "\\": "\\\\",
+    ",": "\\,",
+    ";": "\\;",
+    "\n": "\\n",
+    "\r": None,
+})
 
-    # Cached membership lookup
-    membership_cache_key = f"membership:{user_id}:{org_id}"
-    cached_membership = cache_get("auth", membership_cache_key)
+# Characters not allowed (or awkward) in download filenames, mapped in one pass
+_FILENAME_TRANS = str.maketrans({c: "_" for c in ' /\\:*?"<>|\t\r\n'})
 
-    if cached_membership is not None:
-        return user_id, cached_membership.get("role", "member")
+# Columns needed to build a vCard (id and created_at for the export's cursor)
+VCARD_COLUMNS = "id, created_at, business_name, phone, email, address, website, google_maps_url"
 
+# Columns for the prospect list: no pain_points / call_script JSONB, only
+# the generated pain_points_count (migration 020)
+PROSPECT_LIST_COLUMNS = (
+    "id, business_name, phone, email, address, website, google_maps_url, "
+    "business_summary, pain_points_count, status, search_query, source, created_at"
+)
+
+# Exactly the columns SearchHistory reads (dashboard and search history)
+SEARCH_COLUMNS = ",".join(SearchHistory.model_fields)
+
+# Query strings for the dashboard and search history, encoded once
+_STATUS_COUNTS_QUERY = pg_query_template("lead_agent_prospect_status_counts", {
+    "select": "status,count",
+    "org_id": "eq.{org_id}"
+})
+_SEARCHES_QUERY = pg_query_template("lead_agent_searches", {
+    "select": SEARCH_COLUMNS,
+    "org_id": "eq.{org_id}",
+    "order": "created_at.desc",
+    "limit": "{limit}"
+})
+
+
+def _build_vcard(prospect: dict) -> str:
+    """Build a CRLF-terminated vCard 3.0 for a prospect row."""
+    name = prospect["business_name"].translate(_VCARD_ESCAPE)
+    phone = prospect.get("phone")
+    email = prospect.get("email")
+    address = prospect.get("address")
+    website = prospect.get("website")
+    maps_url = prospect.get("google_maps_url")
+
+    # Fixed shape: one template with optional lines instead of list + join.
+    # URL is a uri value, not text: no escaping.
+    return (
+        f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:{name}\r\nORG:{name}\r\n"
+        + (f"TEL;TYPE=WORK,VOICE:{phone.translate(_VCARD_ESCAPE)}\r\n" if phone else "")
+        + (f"EMAIL;TYPE=WORK:{email.translate(_VCARD_ESCAPE)}\r\n" if email else "")
+        + (f"ADR;TYPE=WORK:;;{address.translate(_VCARD_ESCAPE)};;;;\r\n" if address else "")
+        + (f"URL:{website}\r\n" if website else "")
+        + (f"NOTE:Google Maps: {maps_url.translate(_VCARD_ESCAPE)}\r\n" if maps_url else "")
+        + "END:VCARD\r\n"
+    )
+
+
+async def get_prospect_for_member(
+    prospect_id: str,
+    user_telegram_id: int,
+    with_follow_up: bool = False
+) -> tuple[dict, str, str]:
+    """
+    Load a prospect and verify the user is a member of its organization.
+    Returns (prospect, user_id, role). One round-trip (la_get_prospect_for_member).
+
+    With with_follow_up, the earliest pending follow-up notification is added
+    to the prospect as "next_follow_up" (or None).
+    """
     db = get_supabase_admin()
-    membership = db.table("memberships").select("role").eq(
-        "user_id", user_id
-    ).eq("org_id", org_id).execute()
+    result = db.rpc("la_get_prospect_for_member", {
+        "p_prospect_id": prospect_id,
+        "p_telegram_id": user_telegram_id,
+        "p_with_follow_up": with_follow_up
+    }).execute()
+
+    if not result.data:
+        raise HTTPException(404, "Prospect not found")
 
-    if not membership.data:
+    if not result.data.get("user_id"):
+        raise HTTPException(404, "User not found")
+
+    if not result.data.get("role"):
         raise HTTPException(403, "Not a member of this organization")
 
-    cache_set("auth", membership_cache_key, membership.data[0])
-    return user_id, membership.data[0]["role"]
+    prospect = result.data["prospect"]
+    user_id, role = result.data["user_id"], result.data["role"]
 
+    if with_follow_up:
+        prospect["next_follow_up"] = result.data.get("next_follow_up")
 
-async def verify_org_admin(user_telegram_id: int, org_id: str) -> str:
+    # Warm the membership cache for the org-scoped endpoints
+    remember_org_membership(user_telegram_id, prospect["org_id"], user_id, role)
+
+    return prospect, user_id, role
+
+
+def _check_member_write_result(data: Optional[dict], not_found: str) -> dict:
     """
-    Verify user is an admin of the organization.
-    Returns user_id.
+    Raise the same errors as get_prospect_for_member for a la_*_as_member /
+    la_*_as_author result, then return it.
     """
-    user_id, role = await verify_org_member(user_telegram_id, org_id)
-    if role != "admin":
-        raise HTTPException(403, "Admin access required")
-    return user_id
+    if not data or not data.get("found"):
+        raise HTTPException(404, not_found)
 
+    if not data.get("user_id"):
+        raise HTTPException(404, "User not found")
 
-def get_org_currency(org_settings: dict) -> str:
-    """Get organization's lead agent currency from settings."""
-    return org_settings.get("lead_agent_currency", "USD")
+    if not data.get("role"):
+        raise HTTPException(403, "Not a member of this organization")
 
+    return data
 
-async def generate_ai_insights_task(
-    prospect_id: str,
-    org_id: str,
-    business_description: Optional[str] = None
-):
-    """
-    Background task to generate AI insights for a prospect.
 
-    Two-tier LLM pipeline:
-    - Tier 1 (GPT-4o-mini): Already extracted business_description from URL (passed in)
-    - Tier 2 (GPT-4o): Generate strategic insights, pain points, and call script
-    """
-    db = get_supabase_admin()
+# Keyset pagination: the cursor is "<created_at>|<id>" of the last row returned,
+# so rows sharing a created_at (bulk inserts) are neither skipped nor repeated.
+# It is sent base64url-encoded: an opaque token that can go straight into a
+# query string (a raw "+00:00" offset would be read back as a space).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-    try:
-        # Get prospect
-        prospect_result = db.table("lead_agent_prospects").select("*").eq(
-            "id", prospect_id
-        ).single().execute()
 
-        if not prospect_result.data:
-            return
+def _encode_cursor(row: dict) -> str:
+    """Cursor pointing just past a row in (created_at DESC, id DESC) order."""
+    raw = f"{row['created_at']}|{row['id']}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
-        prospect_data = prospect_result.data
 
-        # Get org's products
-        products_result = db.table("lead_agent_products").select("*").eq(
-            "org_id", org_id
-        ).eq("is_active", True).execute()
+def _apply_cursor(query, before: str):
+    """Restrict a (created_at DESC, id DESC) query to rows after the cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(before + "=" * (-len(before) % 4)).decode()
+        created_at, _, row_id = raw.partition("|")
+        created_at = datetime.fromisoformat(created_at).isoformat()
+        row_id = str(uuid.UUID(row_id))
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+    return query.or_(
+        f'created_at.lt."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+    )
 
-        products = [Product(**p) for p in products_result.data]
 
-        # Generate insights using GPT-4o (with business description from GPT-4o-mini)
-        ai = LeadAgentAI(settings.openai_api_key)
+async def _timed_scrape(url: str) -> tuple[ExtractedBusiness, int]:
+    """Scrape a business from a URL. Returns (business, execution_time_ms)."""
+    with TaskTimer() as timer:
+        business = await get_url_scraper().scrape_business(url)
+    return business, timer.execution_time_ms
 
-        with TaskTimer() as timer:
-            summary, pain_points, call_script = await ai.generate_prospect_insights(
-                business_name=prospect_data["business_name"],
-                business_address=prospect_data.get("address"),
-                business_website=prospect_data.get("website"),
-                products=products,
-                business_description=business_description
-            )
 
-        # Update prospect with AI-generated content (including call script)
-        db.table("lead_agent_prospects").update({
-            "business_summary": summary,
-            "pain_points": [pp.dict() for pp in pain_points],
-            "call_script": call_script,
-            "ai_generated_at": datetime.now(timezone.utc).isoformat()
-        }).eq("id", prospect_id).execute()
+async def _timed_scrape_with_insights(
+    url: str,
+    org_id: str
+) -> tuple[ExtractedBusiness, tuple[str, list, list], int, int]:
+    """
+    Scrape a business and generate its insights in one GPT-4o call.
 
-        # Log bot task for reporting
-        BotTaskLogger.log_lead_agent_insights(
-            org_id=org_id,
-            prospect_id=prospect_id,
-            business_name=prospect_data["business_name"],
-            pain_points_count=len(pain_points),
-            tokens_used=0,  # Token tracking would require modifying ai_lead_agent.py
-            execution_time_ms=timer.execution_time_ms
+    Returns (business, (summary, pain_points, call_script), fetch_ms, ai_ms):
+    the page fetch and the GPT-4o call are timed separately, so the scrape and
+    insights logs each record their own part.
+    """
+    with TaskTimer() as fetch_timer:
+        (url, page_text), product_rows = await asyncio.gather(
+            get_url_scraper().fetch_page_text(url),
+            get_active_products(org_id)
+        )
+    products = [Product.model_construct(**p) for p in product_rows]
+
+    with TaskTimer() as ai_timer:
+        business, *insights = await get_lead_agent_ai().extract_with_insights(
+            url, page_text, products
         )
+    return business, tuple(insights), fetch_timer.execution_time_ms, ai_timer.execution_time_ms
+
+
+def _discard_task(task: asyncio.Task):
+    """Cancel a task whose result is no longer needed, without leaving its error unretrieved."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
-        print(f"[LeadAgent] AI insights generated for prospect {prospect_id}")
 
-    except Exception as e:
-        print(f"Error generating AI insights for prospect {prospect_id}: {e}")
+def get_org_currency(org_settings: dict) -> str:
+    """Get organization's lead agent currency from settings."""
+    return org_settings.get("lead_agent_currency", "USD")
+
+
+async def get_org_settings(org_id: str) -> dict:
+    """
+    Get an organization's settings JSON (cached in the org pool).
+    Invalidated by update_currency, the only settings writer.
+    """
+    cache_key = f"settings:{org_id}"
+    cached = cache_get("org", cache_key)
+    if cached is not None:
+        return cached
+
+    org_row = await pg_select_one("organizations", {"select": "settings", "id": f"eq.{org_id}"})
+    org_settings = (org_row or {}).get("settings") or {}
+    cache_set("org", cache_key, org_settings)
+    return org_settings
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -171,36 +282,23 @@ async def generate_ai_insights_task(
 @router.get("/products")
 async def list_products(
     org_id: str = Query(...),
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> List[Product]:
     """List all products for the organization."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     await verify_org_member(tg_user.id, org_id)
 
-    # Check cache
-    cache_key = f"products:{org_id}"
-    cached = cache_get("catalog", cache_key)
-    if cached is not None:
-        return cached
-
-    db = get_supabase_admin()
-    result = db.table("lead_agent_products").select("*").eq(
-        "org_id", org_id
-    ).order("created_at", desc=True).execute()
-
-    products = [Product(**p) for p in result.data]
-    cache_set("catalog", cache_key, products)
-    return products
+    # Cached as encoded JSON (shared with the hub product list)
+    body = await get_products_json(org_id)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/products")
 async def create_product(
     org_id: str = Query(...),
     data: ProductCreate = ...,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> Product:
     """Create a new product (admin only)."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     await verify_org_admin(tg_user.id, org_id)
 
     db = get_supabase_admin()
@@ -213,71 +311,68 @@ async def create_product(
     }
 
     result = db.table("lead_agent_products").insert(product_data).execute()
-    cache_delete("catalog", f"products:{org_id}")
+    invalidate_catalog(org_id)
     return Product(**result.data[0])
 
 
+def _check_product_admin_result(result) -> dict:
+    """
+    Raise the same errors as verify_org_admin for a la_*_product_as_admin
+    result, then return the result data.
+    """
+    if not result.data or not result.data.get("found"):
+        raise HTTPException(404, "Product not found")
+
+    if not result.data.get("user_id"):
+        raise HTTPException(404, "User not found")
+
+    if not result.data.get("role"):
+        raise HTTPException(403, "Not a member of this organization")
+
+    if result.data["role"] != "admin":
+        raise HTTPException(403, "Admin access required")
+
+    return result.data
+
+
 @router.put("/products/{product_id}")
 async def update_product(
     product_id: str,
     data: ProductUpdate,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> Product:
     """Update a product (admin only)."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     db = get_supabase_admin()
 
-    # Get product to verify org ownership
-    product_result = db.table("lead_agent_products").select("org_id").eq(
-        "id", product_id
-    ).single().execute()
+    # Only the fields that were sent (Decimal price -> string in JSON mode)
+    update_data = data.model_dump(mode="json", exclude_none=True)
 
-    if not product_result.data:
-        raise HTTPException(404, "Product not found")
+    # Org lookup, admin check and update in one round-trip
+    result = _check_product_admin_result(db.rpc("la_update_product_as_admin", {
+        "p_product_id": product_id,
+        "p_telegram_id": tg_user.id,
+        "p_patch": update_data
+    }).execute())
 
-    await verify_org_admin(tg_user.id, product_result.data["org_id"])
-
-    # Build update data
-    update_data = {}
-    if data.name is not None:
-        update_data["name"] = data.name
-    if data.description is not None:
-        update_data["description"] = data.description
-    if data.price is not None:
-        update_data["price"] = str(data.price)
-    if data.is_active is not None:
-        update_data["is_active"] = data.is_active
-
-    result = db.table("lead_agent_products").update(update_data).eq(
-        "id", product_id
-    ).execute()
-
-    cache_delete("catalog", f"products:{product_result.data['org_id']}")
-    return Product(**result.data[0])
+    invalidate_catalog(result["org_id"])
+    return Product(**result["product"])
 
 
 @router.delete("/products/{product_id}")
 async def delete_product(
     product_id: str,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> dict:
     """Delete a product (admin only)."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     db = get_supabase_admin()
 
-    # Get product to verify org ownership
-    product_result = db.table("lead_agent_products").select("org_id").eq(
-        "id", product_id
-    ).single().execute()
-
-    if not product_result.data:
-        raise HTTPException(404, "Product not found")
-
-    await verify_org_admin(tg_user.id, product_result.data["org_id"])
-
-    db.table("lead_agent_products").delete().eq("id", product_id).execute()
+    # Org lookup, admin check and delete in one round-trip
+    result = _check_product_admin_result(db.rpc("la_delete_product_as_admin", {
+        "p_product_id": product_id,
+        "p_telegram_id": tg_user.id
+    }).execute())
 
-    cache_delete("catalog", f"products:{product_result.data['org_id']}")
+    invalidate_catalog(result["org_id"])
     return {"status": "deleted"}
 
 
@@ -292,53 +387,74 @@ async def list_prospects(
     search_query: Optional[str] = Query(None),
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0),
-    x_telegram_init_data: str = Header(...)
+    before: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header"),
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> List[ProspectCard]:
-    """List prospects with optional filters."""
-    tg_user = get_telegram_user(x_telegram_init_data)
+    """
+    List prospects with optional filters, newest first.
+
+    Paginate by passing the X-Next-Cursor response header back as `before`
+    (keyset: cost doesn't grow with depth like `offset` does). The header is
+    absent on the last page.
+    """
     await verify_org_member(tg_user.id, org_id)
 
     db = get_supabase_admin()
 
     # Build query
-    query = db.table("lead_agent_prospects").select("*").eq("org_id", org_id)
+    query = db.table("lead_agent_prospects").select(PROSPECT_LIST_COLUMNS).eq("org_id", org_id)
 
     if status:
         query = query.eq("status", status)
     if search_query:
         query = query.eq("search_query", search_query)
+    if before:
+        query = _apply_cursor(query, before)
+
+    query = query.order("created_at", desc=True).order("id", desc=True).limit(limit)
+    if offset:
+        query = query.offset(offset)
+    result = query.execute()
+
+    # Shape rows as ProspectCard dicts without building models: rows come from
+    # our own table. The list view doesn't show pain points, so only their
+    # count is sent; the detail endpoint returns the full list.
+    # Serialized straight to JSON bytes.
+    cards = [
+        {
+            "id": p["id"],
+            "business_name": p["business_name"],
+            "phone": p.get("phone"),
+            "email": p.get("email"),
+            "address": p.get("address"),
+            "website": p.get("website"),
+            "google_maps_url": p.get("google_maps_url"),
+            "summary": p.get("business_summary"),
+            "pain_points": [],
+            "pain_points_count": p.get("pain_points_count") or 0,
+            "call_script": [],
+            "ai_overview": None,
+            "next_follow_up": None,
+            "status": p["status"],
+            "search_query": p.get("search_query"),
+            "source": p.get("source", "gemini_search"),
+            "created_at": p["created_at"]
+        }
+        for p in result.data
+    ]
 
-    result = query.order("created_at", desc=True).limit(limit).offset(offset).execute()
-
-    # Convert to ProspectCard
-    cards = []
-    for p in result.data:
-        pain_points = [PainPoint(**pp) for pp in p.get("pain_points", [])]
-        cards.append(ProspectCard(
-            id=p["id"],
-            business_name=p["business_name"],
-            phone=p.get("phone"),
-            email=p.get("email"),
-            address=p.get("address"),
-            website=p.get("website"),
-            google_maps_url=p.get("google_maps_url"),
-            summary=p.get("business_summary"),
-            pain_points=pain_points,
-            status=p["status"],
-            search_query=p.get("search_query"),
-            source=p.get("source", "gemini_search"),
-            created_at=p["created_at"]
-        ))
+    headers = {}
+    if len(result.data) == limit:
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(result.data[-1])
 
-    return cards
+    return ORJSONResponse(content=cards, headers=headers)
 
 
 @router.post("/prospects/scrape")
 async def scrape_prospect(
     org_id: str = Query(...),
     data: ScrapeRequest = ...,
-    background_tasks: BackgroundTasks = ...,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> ProspectCard:
     """
     Scrape a prospect from a URL.
@@ -347,50 +463,51 @@ async def scrape_prospect(
     1. GPT-4o-mini (cheap): Fetch & extract business info from HTML
     2. GPT-4o (smart): Generate insights & pain points with pattern recognition
 
-    Returns the prospect immediately, AI insights are generated in background.
+    Returns the prospect immediately, AI insights are queued for the insights worker.
+    With with_insights, both tiers run as a single GPT-4o call instead and the
+    prospect is returned with its insights.
     """
-    tg_user = get_telegram_user(x_telegram_init_data)
     user_id, _ = await verify_org_member(tg_user.id, org_id)
 
     db = get_supabase_admin()
 
+    # Scrape business info from URL (shared GPT-4o-mini scraper service).
+    # The products check is independent, so the scrape starts right away and
+    # is dropped if the check fails.
+    logger.info("Scraping URL: %s", data.url)
+    if data.with_insights:
+        scrape_task = asyncio.create_task(_timed_scrape_with_insights(data.url, org_id))
+    else:
+        scrape_task = asyncio.create_task(_timed_scrape(data.url))
+
     # Check if organization has any active products
-    products = db.table("lead_agent_products").select("id").eq(
-        "org_id", org_id
-    ).eq("is_active", True).execute()
+    try:
+        has_products = bool(await get_active_products(org_id))
+    except BaseException:
+        _discard_task(scrape_task)
+        raise
 
-    if not products.data:
+    if not has_products:
+        _discard_task(scrape_task)
         raise HTTPException(
             status_code=400,
             detail="Please add at least one product or service before adding leads. The AI needs your products to generate relevant insights."
         )
 
-    # Initialize URL scraper service (GPT-4o-mini)
-    scraper = URLScraperService(settings.openai_api_key)
-
-    # Scrape business info from URL with timing
-    print(f"[LeadAgent] Scraping URL: {data.url}")
     try:
-        with TaskTimer() as scrape_timer:
-            business = await scraper.scrape_business(data.url)
+        if data.with_insights:
+            business, insights, scrape_ms, insights_ms = await scrape_task
+        else:
+            business, scrape_ms = await scrape_task
+            insights = None
     except ScraperError as e:
-        print(f"[LeadAgent] Scraper error: {e.technical_detail}")
+        logger.warning("Scraper error for %s: %s", data.url, e.technical_detail)
         raise HTTPException(
             status_code=400,
             detail=e.message
         )
 
-    # Check for duplicates
     dedup_hash = business.get_dedup_hash()
-    existing = db.table("lead_agent_prospects").select("id").eq(
-        "org_id", org_id
-    ).eq("dedup_hash", dedup_hash).execute()
-
-    if existing.data:
-        raise HTTPException(
-            status_code=409,
-            detail="This business has already been added to your prospects."
-        )
 
     # Insert new prospect (phone/email are added manually by user)
     prospect_data = {
@@ -407,8 +524,29 @@ async def scrape_prospect(
         "status": "not_contacted",
         "created_by": user_id
     }
+    if insights is not None:
+        summary, pain_points, call_script = insights
+        prospect_data.update({
+            "business_summary": summary,
+            "pain_points": [pp.dict() for pp in pain_points],
+            "call_script": call_script,
+            "ai_generated_at": datetime.now(timezone.utc).isoformat()
+        })
+
+    # Insert and dedup in one round-trip: ON CONFLICT (org_id, dedup_hash)
+    # DO NOTHING returns no rows when the business already exists.
+    result = db.table("lead_agent_prospects").upsert(
+        prospect_data,
+        on_conflict="org_id,dedup_hash",
+        ignore_duplicates=True
+    ).execute()
+
+    if not result.data:
+        raise HTTPException(
+            status_code=409,
+            detail="This business has already been added to your prospects."
+        )
 
-    result = db.table("lead_agent_prospects").insert(prospect_data).execute()
     prospect = result.data[0]
 
     # Log bot task for reporting
@@ -417,36 +555,137 @@ async def scrape_prospect(
         user_id=user_id,
         business_name=business.business_name,
         source="url_scrape",
-        execution_time_ms=scrape_timer.execution_time_ms
+        execution_time_ms=scrape_ms
     )
 
-    # Queue AI insights generation (Tier 2: GPT-4o)
-    # Pass the business description from GPT-4o-mini to GPT-4o for better context
-    background_tasks.add_task(
-        generate_ai_insights_task,
-        prospect["id"],
-        org_id,
-        business.description  # Pre-extracted by GPT-4o-mini
-    )
+    if insights is not None:
+        # Generated with the extraction: the scrape log has the page fetch
+        # time, this one the GPT-4o call
+        BotTaskLogger.log_lead_agent_insights(
+            org_id=org_id,
+            prospect_id=prospect["id"],
+            business_name=business.business_name,
+            pain_points_count=len(pain_points),
+            tokens_used=0,
+            execution_time_ms=insights_ms
+        )
+    else:
+        # Queue AI insights generation (Tier 2: GPT-4o)
+        # Pass the business description from GPT-4o-mini to GPT-4o for better context
+        enqueue_insights(
+            prospect["id"],
+            org_id,
+            business.description  # Pre-extracted by GPT-4o-mini
+        )
 
-    print(f"[LeadAgent] Created prospect: {business.business_name}")
+    logger.info("Created prospect: %s", business.business_name)
 
     cache_delete("analytics", f"la_dashboard:{org_id}")
 
-    return ProspectCard(
-        id=prospect["id"],
-        business_name=prospect["business_name"],
-        phone=prospect.get("phone"),
-        email=prospect.get("email"),
-        address=prospect.get("address"),
-        website=prospect.get("website"),
-        google_maps_url=prospect.get("google_maps_url"),
-        summary=None,  # AI generation pending
-        pain_points=[],  # AI generation pending
-        status=prospect["status"],
-        search_query=None,
-        source="url_scrape",
-        created_at=prospect["created_at"]
+    return ProspectCard.from_row(prospect)
+
+
+@router.post("/prospects/scrape/batch")
+async def scrape_prospects_batch(
+    org_id: str = Query(...),
+    data: ScrapeBatchRequest = ...,
+    tg_user: TelegramUser = Depends(get_current_user)
+) -> ScrapeBatchResult:
+    """
+    Scrape several prospects from URLs in one request.
+
+    The URLs are scraped concurrently (URLScraperService.scrape_many), the
+    businesses are inserted in a single upsert and their AI insights are
+    queued for the insights worker. URLs that cannot be scraped are reported
+    back instead of failing the whole batch.
+    """
+    user_id, _ = await verify_org_member(tg_user.id, org_id)
+
+    db = get_supabase_admin()
+
+    # Check if organization has any active products
+    if not await get_active_products(org_id):
+        raise HTTPException(
+            status_code=400,
+            detail="Please add at least one product or service before adding leads. The AI needs your products to generate relevant insights."
+        )
+
+    urls = list(dict.fromkeys(data.urls))
+    logger.info("Scraping %d URLs for org %s", len(urls), org_id)
+    with TaskTimer() as timer:
+        scraped = await get_url_scraper().scrape_many(urls)
+
+    # The scrapes overlap, so each one is logged with its share of the wall time
+    scrape_ms = timer.execution_time_ms // len(urls)
+
+    rows = {}
+    businesses = {}
+    failed = []
+    for url, outcome in zip(urls, scraped):
+        if isinstance(outcome, ScraperError):
+            logger.warning("Scraper error for %s: %s", url, outcome.technical_detail)
+            failed.append(ScrapeFailure(url=url, error=outcome.message))
+            continue
+
+        business = outcome
+        dedup_hash = business.get_dedup_hash()
+        if dedup_hash in rows:
+            continue
+        rows[dedup_hash] = {
+            "org_id": org_id,
+            "business_name": business.business_name,
+            "phone": None,
+            "email": None,
+            "address": business.address,
+            "website": business.website,
+            "google_maps_url": business.google_maps_url,
+            "dedup_hash": dedup_hash,
+            "search_query": None,
+            "source": "url_scrape",
+            "status": "not_contacted",
+            "created_by": user_id
+        }
+        businesses[dedup_hash] = business
+
+    created = []
+    if rows:
+        # One round-trip: ON CONFLICT (org_id, dedup_hash) DO NOTHING returns only
+        # the rows that were actually inserted.
+        result = db.table("lead_agent_prospects").upsert(
+            list(rows.values()),
+            on_conflict="org_id,dedup_hash",
+            ignore_duplicates=True
+        ).execute()
+        created = result.data or []
+
+    for prospect in created:
+        business = businesses[prospect["dedup_hash"]]
+
+        BotTaskLogger.log_lead_agent_scrape(
+            org_id=org_id,
+            user_id=user_id,
+            business_name=business.business_name,
+            source="url_scrape",
+            execution_time_ms=scrape_ms
+        )
+
+        # Someone is waiting on these, so they go to the regular (urgent) queue
+        enqueue_insights(prospect["id"], org_id, business.description)
+
+    logger.info(
+        "Batch scrape for org %s: %d created, %d failed", org_id, len(created), len(failed)
+    )
+
+    if created:
+        cache_delete("analytics", f"la_dashboard:{org_id}")
+
+    return ScrapeBatchResult(
+        created=[
+            ProspectCard.from_row(prospect)
+            for prospect in created
+        ],
+        skipped_duplicates=len(urls) - len(failed) - len(created),
+        failed=failed
     )
 
 
@@ -454,8 +693,7 @@ async def scrape_prospect(
 async def create_prospect_manually(
     org_id: str = Query(...),
     data: ProspectManualCreate = ...,
-    background_tasks: BackgroundTasks = ...,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> ProspectCard:
     """
     Manually create a prospect (for sites that block scraping).
@@ -463,39 +701,17 @@ async def create_prospect_manually(
     This is a fallback when automated scraping fails. AI insights are still
     generated in the background based on the provided information.
     """
-    tg_user = get_telegram_user(x_telegram_init_data)
     user_id, _ = await verify_org_member(tg_user.id, org_id)
 
     db = get_supabase_admin()
 
     # Check if organization has any active products
-    products = db.table("lead_agent_products").select("id").eq(
-        "org_id", org_id
-    ).eq("is_active", True).execute()
-
-    if not products.data:
+    if not await get_active_products(org_id):
         raise HTTPException(
             status_code=400,
             detail="Please add at least one product or service before adding leads. The AI needs your products to generate relevant insights."
         )
 
-    # Generate dedup hash (business name + website)
-    import hashlib
-    website = data.website or ""
-    dedup_key = f"{data.business_name.lower().strip()}:{website.lower().strip()}"
-    dedup_hash = hashlib.sha256(dedup_key.encode()).hexdigest()[:32]
-
-    # Check for duplicates
-    existing = db.table("lead_agent_prospects").select("id").eq(
-        "org_id", org_id
-    ).eq("dedup_hash", dedup_hash).execute()
-
-    if existing.data:
-        raise HTTPException(
-            status_code=409,
-            detail="This business has already been added to your prospects."
-        )
-
     # Insert new prospect
     prospect_data = {
         "org_id": org_id,
@@ -505,76 +721,185 @@ async def create_prospect_manually(
         "address": data.address,
         "website": data.website,
         "google_maps_url": data.google_maps_url,
-        "dedup_hash": dedup_hash,
+        "dedup_hash": compute_dedup_hash(data.business_name, data.website),
         "search_query": None,  # No search query for manual entry
         "source": "manual",
         "status": "not_contacted",
         "created_by": user_id
     }
 
-    result = db.table("lead_agent_prospects").insert(prospect_data).execute()
+    # Insert and dedup in one round-trip: ON CONFLICT (org_id, dedup_hash)
+    # DO NOTHING returns no rows when the business already exists.
+    result = db.table("lead_agent_prospects").upsert(
+        prospect_data,
+        on_conflict="org_id,dedup_hash",
+        ignore_duplicates=True
+    ).execute()
+
+    if not result.data:
+        raise HTTPException(
+            status_code=409,
+            detail="This business has already been added to your prospects."
+        )
+
     prospect = result.data[0]
 
     # Queue AI insights generation (with user-provided description if available)
-    background_tasks.add_task(
-        generate_ai_insights_task,
+    enqueue_insights(
         prospect["id"],
         org_id,
         data.description  # Pass user-provided description to AI
     )
 
-    print(f"[LeadAgent] Manually created prospect: {data.business_name}")
+    logger.info("Manually created prospect: %s", data.business_name)
 
     cache_delete("analytics", f"la_dashboard:{org_id}")
 
-    return ProspectCard(
-        id=prospect["id"],
-        business_name=prospect["business_name"],
-        phone=prospect.get("phone"),
-        email=prospect.get("email"),
-        address=prospect.get("address"),
-        website=prospect.get("website"),
-        google_maps_url=prospect.get("google_maps_url"),
-        summary=None,  # AI generation pending
-        pain_points=[],  # AI generation pending
-        status=prospect["status"],
-        search_query=None,
-        source="manual",
-        created_at=prospect["created_at"]
+    return ProspectCard.from_row(prospect)
+
+
+@router.post("/prospects/batch")
+async def create_prospects_batch(
+    org_id: str = Query(...),
+    data: ProspectBatchCreate = ...,
+    tg_user: TelegramUser = Depends(get_current_user)
+) -> ProspectBatchResult:
+    """
+    Manually create several prospects in one request (bulk import).
+
+    All rows go to the database in a single insert; businesses that already
+    exist (or repeat within the batch) are skipped. AI insights for the new
+    prospects are queued as non-urgent jobs (OpenAI Batch API when enabled).
+    """
+    user_id, _ = await verify_org_member(tg_user.id, org_id)
+
+    db = get_supabase_admin()
+
+    # Check if organization has any active products
+    if not await get_active_products(org_id):
+        raise HTTPException(
+            status_code=400,
+            detail="Please add at least one product or service before adding leads. The AI needs your products to generate relevant insights."
+        )
+
+    # Dedupe within the batch first; the database handles existing prospects
+    rows = {}
+    descriptions = {}
+    for item in data.prospects:
+        dedup_hash = compute_dedup_hash(item.business_name, item.website)
+        if dedup_hash in rows:
+            continue
+        rows[dedup_hash] = {
+            "org_id": org_id,
+            "business_name": item.business_name,
+            "phone": item.phone,
+            "email": item.email,
+            "address": item.address,
+            "website": item.website,
+            "google_maps_url": item.google_maps_url,
+            "dedup_hash": dedup_hash,
+            "search_query": None,
+            "source": "manual",
+            "status": "not_contacted",
+            "created_by": user_id
+        }
+        descriptions[dedup_hash] = item.description
+
+    # One round-trip: ON CONFLICT (org_id, dedup_hash) DO NOTHING returns only
+    # the rows that were actually inserted.
+    result = db.table("lead_agent_prospects").upsert(
+        list(rows.values()),
+        on_conflict="org_id,dedup_hash",
+        ignore_duplicates=True
+    ).execute()
+
+    created = result.data or []
+
+    for prospect in created:
+        # Nobody is waiting on a bulk import, so these can take the cheaper batch path
+        enqueue_insights(
+            prospect["id"], org_id, descriptions.get(prospect["dedup_hash"]), urgent=False
+        )
+
+    logger.info(
+        "Bulk-created %d/%d prospects for org %s", len(created), len(data.prospects), org_id
+    )
+
+    if created:
+        cache_delete("analytics", f"la_dashboard:{org_id}")
+
+    return ProspectBatchResult(
+        created=[
+            ProspectCard.from_row(prospect)
+            for prospect in created
+        ],
+        skipped_duplicates=len(data.prospects) - len(created)
     )
 
 
 # NOTE: More specific routes (with sub-paths) must be defined BEFORE
 # the generic /prospects/{prospect_id} route to ensure correct routing.
 
+@router.get("/prospects/vcards")
+async def export_prospect_vcards(
+    org_id: str = Query(...),
+    status: Optional[str] = Query(None),
+    tg_user: TelegramUser = Depends(get_current_user)
+):
+    """
+    Export the organization's prospects as a single .vcf file.
+
+    Streams one vCard (3.0, RFC 2426) per prospect, reading the table page by
+    page with the keyset cursor, so memory use does not grow with the number
+    of prospects and no prospect is repeated or skipped between pages.
+    """
+    await verify_org_member(tg_user.id, org_id)
+
+    db = get_supabase_admin()
+    page_size = 500
+
+    def generate_vcards():
+        before = None
+        while True:
+            query = db.table("lead_agent_prospects").select(VCARD_COLUMNS).eq("org_id", org_id)
+            if status:
+                query = query.eq("status", status)
+            if before:
+                query = _apply_cursor(query, before)
+
+            page = query.order("created_at", desc=True).order(
+                "id", desc=True
+            ).limit(page_size).execute()
+
+            for prospect in page.data:
+                yield _build_vcard(prospect)
+
+            if len(page.data) < page_size:
+                return
+            before = _encode_cursor(page.data[-1])
+
+    return StreamingResponse(
+        generate_vcards(),
+        media_type="text/vcard",
+        headers={"Content-Disposition": 'attachment; filename="prospects.vcf"'}
+    )
+
+
 @router.get("/prospects/{prospect_id}/call-script")
 async def get_call_script(
     prospect_id: str,
-    x_telegram_init_data: str = Header(...)
+    background_tasks: BackgroundTasks,
+    tg_user: TelegramUser = Depends(get_current_user)
 ):
     """
     Get the call script for a prospect.
 
     For new prospects, returns the pre-generated script from the database.
-    For existing prospects without a stored script, generates one on-demand.
+    For existing prospects without a stored script, generates one on-demand;
+    storing and logging it happen after the response is sent.
     """
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get prospect with call script
-    result = db.table("lead_agent_prospects").select("*").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    if not result.data:
-        raise HTTPException(404, "Prospect not found")
-
-    prospect = result.data
-
-    org_id = prospect["org_id"]
-
-    # Verify org membership
-    await verify_org_member(tg_user.id, org_id)
+    # Get prospect with call script and verify org membership
+    prospect, user_id, _ = await get_prospect_for_member(prospect_id, tg_user.id)
 
     # Return the stored call script if available
     call_script = prospect.get("call_script", [])
@@ -593,15 +918,34 @@ async def get_call_script(
             detail="No pain points available yet. Please wait for AI insights to be generated."
         )
 
-    # Get organization's products for context
-    products_result = db.table("lead_agent_products").select("*").eq(
-        "org_id", org_id
-    ).eq("is_active", True).execute()
+    # Parallel clicks (or clients) for the same prospect share one generation;
+    # only the request that runs it schedules the write
+    script_items = await cache_singleflight(
+        f"call_script:{prospect_id}",
+        lambda: _generate_call_script(prospect, pain_points, user_id, background_tasks)
+    )
+
+    return {
+        "business_name": prospect["business_name"],
+        "script_items": script_items
+    }
+
+
+async def _generate_call_script(
+    prospect: dict,
+    pain_points: list,
+    user_id: str,
+    background_tasks: BackgroundTasks
+) -> list:
+    """Generate a prospect's call script with AI and schedule storing and logging it."""
+    org_id = prospect["org_id"]
 
-    products = [Product(**p) for p in products_result.data] if products_result.data else []
+    # Get organization's products for context
+    # Trusted DB rows, only used to build the prompt: skip validation
+    products = [Product.model_construct(**p) for p in await get_active_products(org_id)]
 
     # Generate call script using AI
-    ai = LeadAgentAI(api_key=settings.openai_api_key)
+    ai = get_lead_agent_ai()
 
     with TaskTimer() as script_timer:
         script_items = await ai.generate_call_script(
@@ -616,214 +960,113 @@ async def get_call_script(
             detail="Failed to generate call script. Please try again."
         )
 
-    # Store the generated script for future use
+    # Neither write affects the response
+    background_tasks.add_task(
+        _store_call_script,
+        prospect["id"],
+        org_id,
+        prospect["business_name"],
+        script_items,
+        user_id,
+        script_timer.execution_time_ms
+    )
+
+    return script_items
+
+
+def _store_call_script(
+    prospect_id: str,
+    org_id: str,
+    business_name: str,
+    script_items: list,
+    user_id: str,
+    execution_time_ms: int
+):
+    """Store a generated call script for future use and log the bot task."""
+    db = get_supabase_admin()
+
     db.table("lead_agent_prospects").update({
         "call_script": script_items
-    }).eq("id", prospect_id).execute()
-
-    # Get user_id for task logging
-    user_result = db.table("users").select("id").eq("telegram_id", tg_user.id).single().execute()
-    user_id = user_result.data["id"] if user_result.data else None
+    }, returning=ReturnMethod.minimal).eq("id", prospect_id).execute()
 
     # Log bot task for reporting
     BotTaskLogger.log_lead_agent_call_script(
         org_id=org_id,
         prospect_id=prospect_id,
-        business_name=prospect["business_name"],
+        business_name=business_name,
         user_id=user_id,
         tokens_used=0,  # Token tracking would require modifying ai_lead_agent.py
-        execution_time_ms=script_timer.execution_time_ms
+        execution_time_ms=execution_time_ms
     )
 
-    return {
-        "business_name": prospect["business_name"],
-        "script_items": script_items
-    }
-
 
 @router.get("/prospects/{prospect_id}")
 async def get_prospect(
     prospect_id: str,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> ProspectCard:
     """Get a single prospect with full details."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get prospect
-    result = db.table("lead_agent_prospects").select("*").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    if not result.data:
-        raise HTTPException(404, "Prospect not found")
-
-    prospect = result.data
-
-    # Verify org membership
-    await verify_org_member(tg_user.id, prospect["org_id"])
-
-    # Convert to ProspectCard
-    pain_points = [PainPoint(**pp) for pp in prospect.get("pain_points", [])]
-    call_script = prospect.get("call_script", [])
-
-    # Get latest pending follow-up notification for this prospect
-    next_follow_up = None
-    notif_result = db.table("lead_agent_scheduled_notifications").select(
-        "scheduled_for, message, ai_reasoning"
-    ).eq("prospect_id", prospect_id).eq(
-        "status", "pending"
-    ).order("scheduled_for", desc=False).limit(1).execute()
-
-    if notif_result.data:
-        n = notif_result.data[0]
-        next_follow_up = {
-            "date": n["scheduled_for"],
-            "message": n["message"],
-            "reasoning": n.get("ai_reasoning", "")
-        }
-
-    return ProspectCard(
-        id=prospect["id"],
-        business_name=prospect["business_name"],
-        phone=prospect.get("phone"),
-        email=prospect.get("email"),
-        address=prospect.get("address"),
-        website=prospect.get("website"),
-        google_maps_url=prospect.get("google_maps_url"),
-        summary=prospect.get("business_summary"),
-        pain_points=pain_points,
-        call_script=call_script,
-        ai_overview=prospect.get("ai_overview"),
-        next_follow_up=next_follow_up,
-        status=prospect["status"],
-        search_query=prospect.get("search_query"),
-        source=prospect.get("source", "gemini_search"),
-        created_at=prospect["created_at"]
+    # Get prospect (with its next pending follow-up) and verify org membership
+    prospect, _, _ = await get_prospect_for_member(
+        prospect_id, tg_user.id, with_follow_up=True
     )
 
+    # Pain points, call script, AI overview and follow-up are all on the row
+    return ProspectCard.from_row(prospect)
+
 
 @router.patch("/prospects/{prospect_id}/status")
 async def update_prospect_status(
     prospect_id: str,
     data: ProspectStatusUpdate,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> ProspectCard:
     """Update the status of a prospect."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
+    # Membership check and update in one round-trip
+    result = _check_member_write_result(await pg_rpc("la_update_prospect_as_member", {
+        "p_prospect_id": prospect_id,
+        "p_telegram_id": tg_user.id,
+        "p_patch": {"status": data.status}
+    }), "Prospect not found")
 
-    # Get prospect
-    prospect_result = db.table("lead_agent_prospects").select("*").eq(
-        "id", prospect_id
-    ).single().execute()
+    cache_delete("analytics", f"la_dashboard:{result['org_id']}")
 
-    if not prospect_result.data:
-        raise HTTPException(404, "Prospect not found")
-
-    # Verify org membership
-    await verify_org_member(tg_user.id, prospect_result.data["org_id"])
-
-    # Update status
-    result = db.table("lead_agent_prospects").update({
-        "status": data.status
-    }).eq("id", prospect_id).execute()
-
-    cache_delete("analytics", f"la_dashboard:{prospect_result.data['org_id']}")
-
-    prospect = result.data[0]
-    return ProspectCard(
-        id=prospect["id"],
-        business_name=prospect["business_name"],
-        phone=prospect.get("phone"),
-        email=prospect.get("email"),
-        address=prospect.get("address"),
-        website=prospect.get("website"),
-        google_maps_url=prospect.get("google_maps_url"),
-        summary=prospect.get("business_summary"),
-        pain_points=prospect.get("pain_points") or [],
-        status=prospect["status"],
-        search_query=prospect.get("search_query"),
-        source=prospect.get("source") or "url_scrape",
-        created_at=prospect["created_at"]
-    )
+    return ProspectCard.from_row(result["prospect"])
 
 
 @router.patch("/prospects/{prospect_id}/contact")
 async def update_prospect_contact(
     prospect_id: str,
     data: ProspectContactUpdate,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> ProspectCard:
     """Update the contact information of a prospect."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get prospect
-    prospect_result = db.table("lead_agent_prospects").select("*").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    if not prospect_result.data:
-        raise HTTPException(404, "Prospect not found")
+    # Membership check and update in one round-trip (only the fields that were sent)
+    result = _check_member_write_result(await pg_rpc("la_update_prospect_as_member", {
+        "p_prospect_id": prospect_id,
+        "p_telegram_id": tg_user.id,
+        "p_patch": data.model_dump(mode="json", exclude_none=True)
+    }), "Prospect not found")
 
-    # Verify org membership
-    await verify_org_member(tg_user.id, prospect_result.data["org_id"])
+    cache_delete("vcard", prospect_id)
 
-    # Build update dict
-    update_data = {}
-    if data.phone is not None:
-        update_data["phone"] = data.phone
-    if data.email is not None:
-        update_data["email"] = data.email
-
-    # Update contact info
-    result = db.table("lead_agent_prospects").update(update_data).eq(
-        "id", prospect_id
-    ).execute()
-
-    prospect = result.data[0]
-    return ProspectCard(
-        id=prospect["id"],
-        business_name=prospect["business_name"],
-        phone=prospect.get("phone"),
-        email=prospect.get("email"),
-        address=prospect.get("address"),
-        website=prospect.get("website"),
-        google_maps_url=prospect.get("google_maps_url"),
-        summary=prospect.get("business_summary"),
-        pain_points=prospect.get("pain_points") or [],
-        status=prospect["status"],
-        search_query=prospect.get("search_query"),
-        source=prospect.get("source") or "url_scrape",
-        created_at=prospect["created_at"]
-    )
+    return ProspectCard.from_row(result["prospect"])
 
 
 @router.delete("/prospects/{prospect_id}")
 async def delete_prospect(
     prospect_id: str,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> dict:
     """Delete a prospect."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get prospect
-    prospect_result = db.table("lead_agent_prospects").select("org_id").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    if not prospect_result.data:
-        raise HTTPException(404, "Prospect not found")
-
-    # Verify org membership
-    await verify_org_member(tg_user.id, prospect_result.data["org_id"])
-
-    # Delete prospect
-    db.table("lead_agent_prospects").delete().eq("id", prospect_id).execute()
+    # Membership check and delete in one round-trip
+    result = _check_member_write_result(await pg_rpc("la_delete_prospect_as_member", {
+        "p_prospect_id": prospect_id,
+        "p_telegram_id": tg_user.id
+    }), "Prospect not found")
 
-    cache_delete("analytics", f"la_dashboard:{prospect_result.data['org_id']}")
+    cache_delete("analytics", f"la_dashboard:{result['org_id']}")
+    cache_delete("vcard", prospect_id)
 
     return {"status": "deleted"}
 
@@ -831,56 +1074,24 @@ async def delete_prospect(
 @router.get("/prospects/{prospect_id}/vcard")
 async def get_prospect_vcard(
     prospect_id: str,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> dict:
     """Generate vCard data for the prospect."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get prospect
-    result = db.table("lead_agent_prospects").select("*").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    if not result.data:
-        raise HTTPException(404, "Prospect not found")
-
-    prospect = result.data
-
-    # Verify org membership
-    await verify_org_member(tg_user.id, prospect["org_id"])
-
-    # Generate vCard
-    lines = [
-        "BEGIN:VCARD",
-        "VERSION:3.0",
-        f"FN:{prospect['business_name']}",
-        f"ORG:{prospect['business_name']}",
-    ]
-
-    if prospect.get("phone"):
-        lines.append(f"TEL;TYPE=WORK,VOICE:{prospect['phone']}")
-
-    if prospect.get("email"):
-        lines.append(f"EMAIL;TYPE=WORK:{prospect['email']}")
-
-    if prospect.get("address"):
-        lines.append(f"ADR;TYPE=WORK:;;{prospect['address']};;;;")
-
-    if prospect.get("website"):
-        lines.append(f"URL:{prospect['website']}")
-
-    if prospect.get("google_maps_url"):
-        lines.append(f"NOTE:Google Maps: {prospect['google_maps_url']}")
+    # Cached vCard: only the (cached) membership check is left to do
+    cached = cache_get("vcard", prospect_id)
+    if cached is not None:
+        org_id, vcard, filename = cached
+        await verify_org_member(tg_user.id, org_id)
+        return {"vcard": vcard, "filename": filename}
 
-    lines.append("END:VCARD")
+    # Get prospect and verify org membership
+    prospect, _, _ = await get_prospect_for_member(prospect_id, tg_user.id)
 
-    vcard_data = "\n".join(lines)
+    vcard = _build_vcard(prospect)
+    filename = f"{prospect['business_name'].translate(_FILENAME_TRANS)[:80]}.vcf"
+    cache_set("vcard", prospect_id, (prospect["org_id"], vcard, filename))
 
-    return {
-        "vcard": vcard_data,
-        "filename": f"{prospect['business_name'].replace(' ', '_')}.vcf"
-    }
+    return {"vcard": vcard, "filename": filename}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -890,41 +1101,43 @@ async def get_prospect_vcard(
 @router.get("/prospects/{prospect_id}/journal")
 async def list_journal_entries(
     prospect_id: str,
-    x_telegram_init_data: str = Header(...)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    before: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header"),
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> List[JournalEntry]:
-    """List all journal entries for a prospect (sorted by newest first)."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
+    """
+    List journal entries for a prospect (sorted by newest first).
 
-    # Get prospect to verify org membership
-    prospect = db.table("lead_agent_prospects").select("org_id").eq(
-        "id", prospect_id
-    ).single().execute()
+    Returns every entry unless `limit` is given; then pages with the
+    X-Next-Cursor header / `before` cursor like the prospect list.
+    """
+    # Verify org membership via the prospect
+    await get_prospect_for_member(prospect_id, tg_user.id)
 
-    if not prospect.data:
-        raise HTTPException(404, "Prospect not found")
+    db = get_supabase_admin()
 
-    await verify_org_member(tg_user.id, prospect.data["org_id"])
+    # Fetch entries with author names embedded (one round-trip)
+    query = db.table("lead_agent_journal_entries").select(
+        "*, author:users!user_id(full_name)"
+    ).eq("prospect_id", prospect_id)
 
-    # Fetch entries
-    result = db.table("lead_agent_journal_entries").select("*").eq(
-        "prospect_id", prospect_id
-    ).order("created_at", desc=True).execute()
+    if before:
+        query = _apply_cursor(query, before)
 
-    # Look up author names from memberships
-    org_id = prospect.data["org_id"]
-    user_ids = list({e["user_id"] for e in result.data})
-    name_map = {}
-    if user_ids:
-        members = db.table("memberships").select(
-            "user_id, users(full_name)"
-        ).eq("org_id", org_id).in_("user_id", user_ids).execute()
-        name_map = {m["user_id"]: m["users"]["full_name"] for m in members.data}
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    if limit:
+        query = query.limit(limit)
+    result = query.execute()
+
+    if limit and len(result.data) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(result.data[-1])
 
     entries = []
     for e in result.data:
+        author = e.pop("author", None) or {}
         entry = JournalEntry(**e)
-        entry.author_name = name_map.get(e["user_id"])
+        entry.author_name = author.get("full_name")
         entries.append(entry)
 
     return entries
@@ -935,21 +1148,13 @@ async def create_journal_entry(
     prospect_id: str,
     data: JournalEntryCreate,
     background_tasks: BackgroundTasks,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> JournalEntry:
     """Create a new journal entry and trigger AI notification scheduling."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get prospect to verify org membership
-    prospect = db.table("lead_agent_prospects").select("*").eq(
-        "id", prospect_id
-    ).single().execute()
+    # Verify org membership via the prospect
+    _, user_id, _ = await get_prospect_for_member(prospect_id, tg_user.id)
 
-    if not prospect.data:
-        raise HTTPException(404, "Prospect not found")
-
-    user_id, _ = await verify_org_member(tg_user.id, prospect.data["org_id"])
+    db = get_supabase_admin()
 
     # Insert entry
     entry_data = {
@@ -980,88 +1185,57 @@ async def update_journal_entry(
     entry_id: str,
     data: JournalEntryUpdate,
     background_tasks: BackgroundTasks,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> JournalEntry:
     """Update a journal entry and re-trigger AI notification scheduling."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get entry to verify existence
-    entry_result = db.table("lead_agent_journal_entries").select("*").eq(
-        "id", entry_id
-    ).eq("prospect_id", prospect_id).single().execute()
-
-    if not entry_result.data:
-        raise HTTPException(404, "Journal entry not found")
-
-    # Get prospect for org verification
-    prospect = db.table("lead_agent_prospects").select("org_id").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    user_id, _ = await verify_org_member(tg_user.id, prospect.data["org_id"])
+    # Only the fields that were sent
+    update_data = data.model_dump(mode="json", exclude_none=True)
+
+    # Entry lookup, membership and author checks and update in one round-trip
+    # (a patch that changes nothing returns the entry as-is, without writing)
+    result = _check_member_write_result(await pg_rpc("la_update_journal_entry_as_author", {
+        "p_entry_id": entry_id,
+        "p_prospect_id": prospect_id,
+        "p_telegram_id": tg_user.id,
+        "p_patch": update_data
+    }), "Journal entry not found")
 
     # Only the creator can edit their entries
-    if entry_result.data["user_id"] != user_id:
+    user_id = result["user_id"]
+    if result["author_id"] != user_id:
         raise HTTPException(403, "You can only edit your own entries")
 
-    # Build update dict
-    update_data = {}
-    if data.content is not None:
-        update_data["content"] = data.content
-    if data.interaction_type is not None:
-        update_data["interaction_type"] = data.interaction_type
-
-    if not update_data:
-        return JournalEntry(**entry_result.data)
-
-    result = db.table("lead_agent_journal_entries").update(update_data).eq(
-        "id", entry_id
-    ).execute()
-
-    # Re-trigger AI notification scheduling
-    from services.timekeeping_agent import process_timekeeping_agent
-    background_tasks.add_task(
-        process_timekeeping_agent,
-        prospect_id=prospect_id,
-        user_id=user_id,
-        entry_id=entry_id
-    )
+    if result.get("changed"):
+        # Re-trigger AI notification scheduling
+        from services.timekeeping_agent import process_timekeeping_agent
+        background_tasks.add_task(
+            process_timekeeping_agent,
+            prospect_id=prospect_id,
+            user_id=user_id,
+            entry_id=entry_id
+        )
 
-    return JournalEntry(**result.data[0])
+    return JournalEntry(**result["entry"])
 
 
 @router.delete("/prospects/{prospect_id}/journal/{entry_id}")
 async def delete_journal_entry(
     prospect_id: str,
     entry_id: str,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> dict:
     """Delete a journal entry."""
-    tg_user = get_telegram_user(x_telegram_init_data)
-    db = get_supabase_admin()
-
-    # Get entry to verify existence
-    entry_result = db.table("lead_agent_journal_entries").select("user_id").eq(
-        "id", entry_id
-    ).eq("prospect_id", prospect_id).single().execute()
-
-    if not entry_result.data:
-        raise HTTPException(404, "Journal entry not found")
-
-    # Get prospect for org verification
-    prospect = db.table("lead_agent_prospects").select("org_id").eq(
-        "id", prospect_id
-    ).single().execute()
-
-    user_id, _ = await verify_org_member(tg_user.id, prospect.data["org_id"])
+    # Entry lookup, membership and author checks and delete in one round-trip
+    result = _check_member_write_result(await pg_rpc("la_delete_journal_entry_as_author", {
+        "p_entry_id": entry_id,
+        "p_prospect_id": prospect_id,
+        "p_telegram_id": tg_user.id
+    }), "Journal entry not found")
 
     # Only the creator can delete their entries
-    if entry_result.data["user_id"] != user_id:
+    if result["author_id"] != result["user_id"]:
         raise HTTPException(403, "You can only delete your own entries")
 
-    db.table("lead_agent_journal_entries").delete().eq("id", entry_id).execute()
-
     return {"status": "deleted"}
 
 
@@ -1072,30 +1246,43 @@ async def delete_journal_entry(
 @router.get("/dashboard")
 async def get_dashboard(
     org_id: str = Query(...),
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> LeadAgentDashboard:
     """Get dashboard statistics."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     await verify_org_member(tg_user.id, org_id)
 
     # Check cache
     cache_key = f"la_dashboard:{org_id}"
     cached = cache_get("analytics", cache_key)
     if cached is not None:
-        return cached
-
-    db = get_supabase_admin()
+        return Response(content=cached, media_type="application/json")
+
+    # Concurrent misses for the same org share one load
+    body = await cache_singleflight(cache_key, lambda: _load_dashboard(org_id, cache_key))
+    return Response(content=body, media_type="application/json")
+
+
+async def _load_dashboard(org_id: str, cache_key: str) -> bytes:
+    """Build the dashboard, cache its encoded body and return it."""
+    # The four lookups are independent: await them concurrently on the async
+    # PostgREST client so a cache miss costs one round-trip, not four
+    org_settings, status_counts, products_count, searches = await asyncio.gather(
+        # Org settings for currency (cached separately: they outlive the dashboard)
+        get_org_settings(org_id),
+        # Prospect counts per status (grouped in the database, <= 4 rows)
+        pg_get(_STATUS_COUNTS_QUERY, org_id=org_id),
+        # Active products (HEAD request: exact count, no rows transferred)
+        pg_count("lead_agent_products", {
+            "org_id": f"eq.{org_id}",
+            "is_active": "eq.true"
+        }),
+        # Recent searches
+        pg_get(_SEARCHES_QUERY, org_id=org_id, limit=5)
+    )
 
-    # Get org settings for currency
-    org_result = db.table("organizations").select("settings").eq("id", org_id).single().execute()
-    org_settings = org_result.data.get("settings", {}) if org_result.data else {}
     currency = get_org_currency(org_settings)
 
     # Count prospects by status
-    prospects = db.table("lead_agent_prospects").select("status").eq(
-        "org_id", org_id
-    ).execute()
-
     by_status = {
         "not_contacted": 0,
         "contacted": 0,
@@ -1103,50 +1290,34 @@ async def get_dashboard(
         "closed": 0
     }
 
-    for p in prospects.data:
-        status = p["status"]
-        by_status[status] = by_status.get(status, 0) + 1
-
-    # Count products
-    products = db.table("lead_agent_products").select("id", count="exact").eq(
-        "org_id", org_id
-    ).eq("is_active", True).execute()
-
-    # Get recent searches
-    searches_result = db.table("lead_agent_searches").select("*").eq(
-        "org_id", org_id
-    ).order("created_at", desc=True).limit(5).execute()
-
-    recent_searches = [SearchHistory(**s) for s in searches_result.data]
+    by_status.update({row["status"]: row["count"] for row in status_counts})
 
     result = LeadAgentDashboard(
-        total_prospects=len(prospects.data),
+        total_prospects=sum(by_status.values()),
         by_status=by_status,
-        products_count=products.count or 0,
-        recent_searches=recent_searches,
+        products_count=products_count,
+        recent_searches=searches,
         currency=currency
     )
-    cache_set("analytics", cache_key, result)
-    return result
+    # Cache the encoded body so hits skip serialization entirely
+    body = result.model_dump_json().encode()
+    cache_set("analytics", cache_key, body)
+    return body
 
 
 @router.get("/searches")
 async def get_searches(
     org_id: str = Query(...),
     limit: int = Query(20, le=100),
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> List[SearchHistory]:
     """List past searches."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     await verify_org_member(tg_user.id, org_id)
 
-    db = get_supabase_admin()
+    searches = await pg_get(_SEARCHES_QUERY, org_id=org_id, limit=limit)
 
-    result = db.table("lead_agent_searches").select("*").eq(
-        "org_id", org_id
-    ).order("created_at", desc=True).limit(limit).execute()
-
-    return [SearchHistory(**s) for s in result.data]
+    # Validated once by FastAPI against List[SearchHistory]
+    return searches
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1157,25 +1328,18 @@ async def get_searches(
 async def update_currency(
     org_id: str = Query(...),
     data: CurrencyUpdate = ...,
-    x_telegram_init_data: str = Header(...)
+    tg_user: TelegramUser = Depends(get_current_user)
 ) -> dict:
     """Update organization's lead agent currency (admin only)."""
-    tg_user = get_telegram_user(x_telegram_init_data)
     await verify_org_admin(tg_user.id, org_id)
 
-    db = get_supabase_admin()
-
-    # Get current settings
-    org_result = db.table("organizations").select("settings").eq(
-        "id", org_id
-    ).single().execute()
+    # Merge into settings server-side: one round-trip, no lost concurrent updates
+    await pg_rpc("merge_org_settings", {
+        "p_org_id": org_id,
+        "p_patch": {"lead_agent_currency": data.currency.upper()}
+    })
 
-    settings_dict = org_result.data.get("settings", {}) if org_result.data else {}
-    settings_dict["lead_agent_currency"] = data.currency.upper()
-
-    # Update settings
-    db.table("organizations").update({
-        "settings": settings_dict
-    }).eq("id", org_id).execute()
+    cache_delete("org", f"settings:{org_id}")
+    cache_delete("analytics", f"la_dashboard:{org_id}")
 
     return {"currency": data.currency.upper(), "status": "updated"}
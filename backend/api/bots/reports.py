@@ -18,6 +18,7 @@ from models.reports import (
 from services import get_supabase_admin, get_telegram_user
 from services.cache import cache_get, cache_set, cache_delete
 from services.report_scheduler import generate_team_report, generate_agent_report
+from services.org_access import require_org_admin
 
 router = APIRouter()
 
@@ -28,37 +29,7 @@ router = APIRouter()
 
 async def verify_org_admin(user_telegram_id: int, org_id: str) -> str:
     """Verify user is an admin of the organization. Returns user_id. Cached."""
-    # Cached user lookup
-    user_cache_key = f"user:{user_telegram_id}"
-    user_id = cache_get("auth", user_cache_key)
-
-    if user_id is None:
-        db = get_supabase_admin()
-        user = db.table("users").select("id").eq("telegram_id", user_telegram_id).single().execute()
-        if not user.data:
-            raise HTTPException(404, "User not found")
-        user_id = user.data["id"]
-        cache_set("auth", user_cache_key, user_id)
-
-    # Cached membership lookup
-    membership_cache_key = f"membership:{user_id}:{org_id}"
-    cached_membership = cache_get("auth", membership_cache_key)
-
-    if cached_membership is not None:
-        if cached_membership.get("role") != "admin":
-            raise HTTPException(403, "Admin access required")
-        return user_id
-
-    db = get_supabase_admin()
-    membership = db.table("memberships").select("role").eq(
-        "user_id", user_id
-    ).eq("org_id", org_id).single().execute()
-
-    if not membership.data or membership.data["role"] != "admin":
-        raise HTTPException(403, "Admin access required")
-
-    cache_set("auth", membership_cache_key, membership.data)
-    return user_id
+    return require_org_admin(user_telegram_id, org_id)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -283,4 +254,5 @@ async def list_bot_tasks(
 
     result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
 
-    return [BotTaskLogEntry(**t) for t in result.data]
+    # Validated once by FastAPI against List[BotTaskLogEntry]
+    return result.data
@@ -19,14 +19,29 @@ class Settings(BaseSettings):
     bot_hub_token: str = ""
     BOT_USERNAME: str = "apex_workforce_bot"
     MINI_APP_SHORTNAME: str = "hub"  # The shortname configured in BotFather for the Web App
+    init_data_max_age_seconds: int = 86400  # Reject initData older than this (0 = no limit)
 
     # AI Services
     openai_api_key: str = ""  # For URL scraping and business insights generation
+    insights_workers: int = 4  # Concurrent AI insights worker loops
+    openai_max_concurrency: int = 8  # Chat completion calls in flight at once (all services)
+    openai_max_retries: int = 3  # Retries for transient OpenAI errors (429, 5xx, timeouts)
+    openai_rpm_limit: int = 0  # Client-side requests/minute budget for chat completions (0 = off)
+    openai_tpm_limit: int = 0  # Client-side tokens/minute budget for chat completions (0 = off)
+    insights_job_timeout_seconds: int = 120  # Deadline for a single-prospect insights call
+    insights_timeout_per_prospect_seconds: int = 30  # Added to the deadline per extra prospect in a batched call
+    insights_batch_api_enabled: bool = False  # Send non-urgent insights via the OpenAI Batch API
+    insights_batch_flush_seconds: int = 300  # How often deferred insights are submitted / polled
+    insights_batch_max_rows: int = 1000  # Submit early once this many insights are deferred
 
     # App settings
     app_url: str = "http://localhost:8000"  # For generating invite links
     debug: bool = True
 
+    # Logging
+    log_level: str = "INFO"
+    log_file: str = ""  # Optional rotating log file, in addition to stdout
+
     class Config:
         env_file = str(ENV_FILE)
         env_file_encoding = "utf-8"
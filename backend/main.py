@@ -4,29 +4,57 @@ Workforce Accelerator - FastAPI Backend
 Entry point for the application.
 """
 import asyncio
+import logging
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 
+from api import batch
 from api.bots import hub, lead_agent, reports
 from config import settings
+from logging_config import setup_logging, shutdown_logging
 from services.notification_scheduler import notification_scheduler_loop
 from services.report_scheduler import report_scheduler_loop
+from services.insights_worker import insights_worker_loop
+from services.insights_batch import insights_batch_loop
+from services.postgrest_async import close_async_postgrest
+from services.url_scraper import close_fetch_client, load_tokenizer
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
+    setup_logging()
+
+    # Page text for scraper extraction is cut by tokens
+    await load_tokenizer()
+
     # Start notification scheduler in background
     notification_task = asyncio.create_task(notification_scheduler_loop(poll_interval_seconds=60))
-    print("[Startup] Notification scheduler started")
+    logger.info("Notification scheduler started")
 
     # Start report scheduler in background (runs hourly)
     report_task = asyncio.create_task(report_scheduler_loop(poll_interval_seconds=3600))
-    print("[Startup] Report scheduler started")
+    logger.info("Report scheduler started")
+
+    # Start AI insights workers (drain the in-process insights queue)
+    insights_tasks = [
+        asyncio.create_task(insights_worker_loop(worker_id=i))
+        for i in range(settings.insights_workers)
+    ]
+    logger.info("Insights workers started")
+
+    # Submit/collect non-urgent insights through the OpenAI Batch API
+    if settings.insights_batch_api_enabled:
+        insights_tasks.append(asyncio.create_task(
+            insights_batch_loop(poll_interval_seconds=settings.insights_batch_flush_seconds)
+        ))
 
     yield
 
@@ -36,11 +64,20 @@ async def lifespan(app: FastAPI):
     try:
         await notification_task
     except asyncio.CancelledError:
-        print("[Shutdown] Notification scheduler stopped")
+        logger.info("Notification scheduler stopped")
     try:
         await report_task
     except asyncio.CancelledError:
-        print("[Shutdown] Report scheduler stopped")
+        logger.info("Report scheduler stopped")
+    for task in insights_tasks:
+        task.cancel()
+    await asyncio.gather(*insights_tasks, return_exceptions=True)
+    logger.info("Insights workers stopped")
+
+    await close_async_postgrest()
+    await close_fetch_client()
+
+    shutdown_logging()
 
 
 # Create app
@@ -48,6 +85,7 @@ app = FastAPI(
     title="Workforce Accelerator API",
     description="Backend for Telegram Mini App platform",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -58,6 +96,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor
 )
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -67,6 +106,7 @@ app.add_middleware(
 app.include_router(hub.router, prefix="/api/hub", tags=["Hub Bot"])
 app.include_router(lead_agent.router, prefix="/api/lead-agent", tags=["Lead Agent"])
 app.include_router(reports.router, prefix="/api/hub", tags=["Reports"])
+app.include_router(batch.router, prefix="/api", tags=["Batch"])
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -79,12 +119,29 @@ if static_path.exists():
     app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
 
+@lru_cache(maxsize=1)
+def discover_mini_apps() -> dict[str, Path]:
+    """
+    Find all Mini Apps (static/mini-apps/<bot_name>/index.html).
+
+    Scanned once per process; call discover_mini_apps.cache_clear() to rescan.
+    """
+    mini_apps_path = static_path / "mini-apps"
+    if not mini_apps_path.is_dir():
+        return {}
+
+    return {
+        index_file.parent.name: index_file
+        for index_file in sorted(mini_apps_path.glob("*/index.html"))
+    }
+
+
 @app.get("/app/{bot_name}")
 async def serve_mini_app(bot_name: str):
     """Serve Mini App HTML for a specific bot."""
-    file_path = static_path / "mini-apps" / bot_name / "index.html"
+    file_path = discover_mini_apps().get(bot_name)
 
-    if not file_path.exists():
+    if file_path is None:
         return {"error": f"Mini App '{bot_name}' not found"}
 
     return FileResponse(file_path, media_type="text/html")
@@ -112,7 +169,7 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "mini_apps": {
-            "hub": "/app/hub",
-            "lead-agent": "/app/lead-agent"
+            bot_name: f"/app/{bot_name}"
+            for bot_name in discover_mini_apps()
         }
     }
@@ -20,12 +20,17 @@ from .lead_agent import (
     PainPoint,
     ProspectCreate,
     ProspectManualCreate,
+    ProspectBatchCreate,
     ProspectStatusUpdate,
     ProspectContactUpdate,
     Prospect,
     ProspectCard,
+    ProspectBatchResult,
     SearchRequest,
     ScrapeRequest,
+    ScrapeBatchRequest,
+    ScrapeFailure,
+    ScrapeBatchResult,
     SearchResult,
     SearchHistory,
     LeadAgentDashboard,
@@ -63,6 +68,12 @@ from .reports import (
     GenerateReportRequest,
     ReportSummaryResponse
 )
+from .batch import (
+    BatchSubRequest,
+    BatchRequest,
+    BatchSubResponse,
+    BatchResponse
+)
 
 __all__ = [
     "TelegramUser",
@@ -88,12 +99,17 @@ __all__ = [
     "PainPoint",
     "ProspectCreate",
     "ProspectManualCreate",
+    "ProspectBatchCreate",
     "ProspectStatusUpdate",
     "ProspectContactUpdate",
     "Prospect",
     "ProspectCard",
+    "ProspectBatchResult",
     "SearchRequest",
     "ScrapeRequest",
+    "ScrapeBatchRequest",
+    "ScrapeFailure",
+    "ScrapeBatchResult",
     "SearchResult",
     "SearchHistory",
     "LeadAgentDashboard",
@@ -127,5 +143,10 @@ __all__ = [
     "ReportListItem",
     "ReportsList",
     "GenerateReportRequest",
-    "ReportSummaryResponse"
+    "ReportSummaryResponse",
+    # Batch gateway models
+    "BatchSubRequest",
+    "BatchRequest",
+    "BatchSubResponse",
+    "BatchResponse"
 ]
@@ -0,0 +1,30 @@
+"""
+Batch gateway models - several API GETs in one HTTP request.
+"""
+from typing import Any, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class BatchSubRequest(BaseModel):
+    """One request inside a batch (path relative to the app, e.g. /api/lead-agent/...)."""
+    id: str = Field(..., min_length=1, max_length=64)
+    method: Literal["GET"] = "GET"
+    url: str = Field(..., min_length=1, max_length=2048)
+
+
+class BatchRequest(BaseModel):
+    """Independent read requests to run together."""
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=20)
+
+
+class BatchSubResponse(BaseModel):
+    """Result of one sub-request, matched to it by id."""
+    id: str
+    status: int
+    headers: dict[str, str] = {}
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    """Sub-request results, in request order."""
+    responses: List[BatchSubResponse]
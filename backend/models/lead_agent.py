@@ -2,9 +2,9 @@
 Lead Agent models for products, prospects, and search operations.
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from decimal import Decimal
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field, field_validator
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -75,6 +75,11 @@ class ProspectManualCreate(BaseModel):
     description: Optional[str] = Field(None, max_length=2000)
 
 
+class ProspectBatchCreate(BaseModel):
+    """Manually create several prospects at once (bulk import)."""
+    prospects: List[ProspectManualCreate] = Field(..., min_length=1, max_length=100)
+
+
 class ProspectStatusUpdate(BaseModel):
     """Update prospect status."""
     status: str = Field(
@@ -127,8 +132,12 @@ class ProspectCard(BaseModel):
     address: Optional[str] = None
     website: Optional[str] = None
     google_maps_url: Optional[str] = None
-    summary: Optional[str] = None
+    # Stored as business_summary on lead_agent_prospects
+    summary: Optional[str] = Field(
+        None, validation_alias=AliasChoices("summary", "business_summary")
+    )
     pain_points: List[PainPoint] = []
+    pain_points_count: Optional[int] = None  # Set by the list view, which skips pain_points
     call_script: List[CallScriptItem] = []
     ai_overview: Optional[str] = None
     next_follow_up: Optional[dict] = None
@@ -137,6 +146,34 @@ class ProspectCard(BaseModel):
     source: str = "gemini_search"
     created_at: datetime
 
+    @field_validator("pain_points", "call_script", mode="before")
+    @classmethod
+    def _null_as_empty(cls, value):
+        """Columns not filled in yet are NULL in the database."""
+        return value or []
+
+    @field_validator("source", mode="before")
+    @classmethod
+    def _default_source(cls, value):
+        return value or "gemini_search"
+
+    @classmethod
+    def from_row(cls, row: dict) -> "ProspectCard":
+        """
+        Build a card from a lead_agent_prospects row (or an RPC's prospect JSON).
+
+        The row is validated as-is in one pydantic-core call: columns map onto
+        fields by name (business_summary onto summary) and unknown columns are
+        ignored.
+        """
+        return cls.model_validate(row)
+
+
+class ProspectBatchResult(BaseModel):
+    """Outcome of a bulk prospect import."""
+    created: List[ProspectCard] = []
+    skipped_duplicates: int = 0
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SEARCH MODELS
@@ -150,6 +187,29 @@ class SearchRequest(BaseModel):
 class ScrapeRequest(BaseModel):
     """Request to scrape a business from a URL."""
     url: str = Field(..., min_length=10, max_length=500)
+    # Extract and generate insights in one GPT-4o call: the response takes
+    # longer, but the prospect comes back with its insights
+    with_insights: bool = False
+
+
+class ScrapeBatchRequest(BaseModel):
+    """Request to scrape several businesses from URLs at once."""
+    urls: List[Annotated[str, Field(min_length=10, max_length=500)]] = Field(
+        ..., min_length=1, max_length=25
+    )
+
+
+class ScrapeFailure(BaseModel):
+    """A URL from a batch scrape that could not be turned into a prospect."""
+    url: str
+    error: str
+
+
+class ScrapeBatchResult(BaseModel):
+    """Outcome of a batch URL scrape."""
+    created: List[ProspectCard] = []
+    skipped_duplicates: int = 0
+    failed: List[ScrapeFailure] = []
 
 
 class SearchResult(BaseModel):
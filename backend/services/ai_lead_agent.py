@@ -5,11 +5,269 @@ This is the second tier of our two-tier LLM pipeline:
 1. GPT-4o-mini (cheap) - Extract & summarize business info from HTML
 2. GPT-4o (smart) - Generate insights & pain points with pattern recognition
 """
-import json
-from typing import List, Optional
-from openai import AsyncOpenAI
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 from models.lead_agent import PainPoint, Product
+from config import settings
+from services.openai_client import create_chat_completion, get_openai_client
+from services.url_scraper import ExtractedBusiness, ScraperError
+
+
+logger = logging.getLogger(__name__)
+
+
+# Largest number of prospects analysed in a single batched insights call
+MAX_INSIGHTS_BATCH = 10
+
+INSIGHTS_SYSTEM_PROMPT = "You are a B2B sales intelligence assistant. You identify business pain points and match them to solutions. For call scripts, you help sales reps sound like someone who genuinely cares - not a salesperson. You frame questions positively to invite opinion, never assuming problems or incompetence. Respond only with valid JSON."
+
+INSIGHTS_GUIDE = """TASKS:
+1. Generate a brief business summary (2-3 sentences) about what this business does, their target market, and potential needs. If we have their website description, use that information. Be concise and focused.
+
+2. Identify the TOP 3 pain points this business might have that our products/services could solve. For each pain point:
+   - Give it a short, clear title (max 6 words)
+   - Explain the pain point in 1-2 sentences
+   - If applicable, mention which of our products would help (use exact product name or null)
+
+3. Create a CALL SCRIPT with 3 conversational Q&A's based on the pain points.
+
+Each Q&A has 3 parts:
+   a) YOUR OPENING QUESTION - Frame it positively, inviting their opinion. Never assume a problem or imply incompetence. Sound like you're asking a loved one their take on something. Keep it simple, straight to the point, and genuinely curious. The question should make them think "of course I want that, it's a no-brainer".
+   b) THEIR EXPECTED RESPONSE - What the prospect will likely say back (a short, natural reply).
+   c) OUR VALUE RESPONSE - How we deliver value in response. Reference our specific product/service. Keep it conversational and benefit-focused.
+
+EXAMPLE (for a fitness club prospect, pain point: "hard to identify sports talent"):
+   BAD question: "Do you find it hard to identify sports talent in the UAE?"
+   (This implies they're not competent. People expect strangers to help them, not question them.)
+
+   GOOD question: "Would you guys be interested in finding new players?"
+   Their response: "Sure, what kind of players?"
+   Our response: "We use rigorous testing methods to identify talented young players in Dubai and when we know which sport they are good at, we send them to you."
+
+   WHY THIS WORKS: It doesn't sound salesy. It doesn't sound scripted. It sounds like something a person who cares about you would ask. It immediately brings down a person's guard and invites them to engage.
+
+RULES FOR CALL SCRIPT:
+- Never assume the person will run away - no emotionally sticky opening lines
+- Questions should invite their opinion, not point out a weakness
+- Frame questions so the value is obvious: "would you be interested in X?"
+- Keep questions under 15 words
+- Sound like a person who genuinely cares, not a salesperson
+"""
+
+
+class _PainPointResult(BaseModel):
+    """A pain point as GPT-4o returns it."""
+    model_config = ConfigDict(extra="forbid")
+
+    title: str = Field(description="Short, clear title (max 6 words)")
+    description: str = Field(description="The pain point in 1-2 sentences")
+    relevant_product: Optional[str] = Field(
+        description="Exact name of our product that would help, or null"
+    )
+
+
+class _ScriptItemResult(BaseModel):
+    """A call script Q&A as GPT-4o returns it."""
+    model_config = ConfigDict(extra="forbid")
+
+    question: str = Field(description="Our opening question (under 15 words)")
+    answer: str = Field(description="How we deliver value, referencing our product/service")
+
+
+class _InsightsResult(BaseModel):
+    """What GPT-4o returns for one prospect (strict structured output)."""
+    model_config = ConfigDict(extra="forbid")
+
+    business_summary: str = Field(description="2-3 sentence business summary")
+    pain_points: List[_PainPointResult] = Field(description="The top 3 pain points")
+    call_script: List[_ScriptItemResult] = Field(description="3 Q&A's based on the pain points")
+
+
+class _ProspectInsightsResult(_InsightsResult):
+    """One prospect's entry in a multi-prospect insights answer."""
+    prospect_id: str = Field(description="The PROSPECT ID exactly as given")
+
+
+class _BatchInsightsResult(BaseModel):
+    """What GPT-4o returns for several prospects at once."""
+    model_config = ConfigDict(extra="forbid")
+
+    prospects: List[_ProspectInsightsResult]
+
+
+class _ScrapeInsightsResult(BaseModel):
+    """
+    Extracted business details plus insights, from one call.
+
+    Structured outputs are generated in schema order, so the extraction fields
+    come first: the model identifies the business before analysing it.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    business_name: str = Field(description="The company/business name")
+    description: Optional[str] = Field(
+        description="A 2-3 sentence description of what the business does, their services, and target market"
+    )
+    address: Optional[str] = Field(description="Physical address if found, or null")
+    google_maps_url: Optional[str] = Field(description="Google Maps link if found on page, or null")
+    business_summary: str = Field(description="2-3 sentence business summary")
+    pain_points: List[_PainPointResult] = Field(description="The top 3 pain points")
+    call_script: List[_ScriptItemResult] = Field(description="3 Q&A's based on the pain points")
+
+
+class _CallScriptResult(BaseModel):
+    """What GPT-4o returns for a call script."""
+    model_config = ConfigDict(extra="forbid")
+
+    script_items: List[_ScriptItemResult] = Field(description="One Q&A per pain point")
+
+
+def _response_format(name: str, model: type[BaseModel]) -> dict:
+    """Strict structured output: the model can only answer with this schema."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": model.model_json_schema()
+        }
+    }
+
+
+_INSIGHTS_RESPONSE_FORMAT = _response_format("prospect_insights", _InsightsResult)
+_BATCH_INSIGHTS_RESPONSE_FORMAT = _response_format("batch_prospect_insights", _BatchInsightsResult)
+_SCRAPE_INSIGHTS_RESPONSE_FORMAT = _response_format("scraped_prospect_insights", _ScrapeInsightsResult)
+_CALL_SCRIPT_RESPONSE_FORMAT = _response_format("call_script", _CallScriptResult)
+
+
+# Static part of the single-prospect insights prompt. It leads the user
+# message so OpenAI's automatic prompt caching can reuse it across calls.
+_INSIGHTS_PROMPT_PREFIX = (
+    "You are a B2B sales intelligence assistant. Analyze the business prospect "
+    "described at the end of this message and generate insights.\n\n"
+    + INSIGHTS_GUIDE
+)
+
+
+# Static part of the multi-prospect insights prompt
+_BATCH_INSIGHTS_PROMPT_PREFIX = (
+    "You are a B2B sales intelligence assistant. Analyze EACH of the business "
+    "prospects listed at the end of this message independently and generate "
+    "insights for every one of them.\n\n"
+    "Apply the following tasks to each prospect separately, and return one "
+    "entry per prospect.\n\n"
+    + INSIGHTS_GUIDE
+)
+
+
+# Static part of the scrape-and-insights prompt (extraction and insights in
+# one call; the website content comes last)
+_SCRAPE_INSIGHTS_PROMPT_PREFIX = (
+    "You are a B2B sales intelligence assistant. The website content of a "
+    "business prospect is at the end of this message. First extract the "
+    "business's details from it, then analyze the business and generate "
+    "insights.\n\n"
+    """EXTRACTION:
+- Extract the actual business name, not the website domain
+- For description, summarize what the business does based on the content
+- Use null for any field you cannot find
+- For ADDRESS: Look for physical addresses, office locations, or mailing addresses
+
+"""
+    + INSIGHTS_GUIDE
+)
+
+
+def _format_products(products: List[Product], with_price: bool = True) -> str:
+    """Build the products/services context block for insight and script prompts."""
+    return _products_context(
+        tuple((p.name, p.description, p.price) for p in products),
+        with_price
+    )
+
+
+@lru_cache(maxsize=256)
+def _products_context(products: tuple, with_price: bool) -> str:
+    """
+    Products context for a (name, description, price) tuple per product.
+
+    An org's catalogue rarely changes, and every prospect processed for it
+    would otherwise rebuild the same block; keyed on the product fields, an
+    edited product simply produces a new entry.
+    """
+    if not products:
+        return "No products defined yet."
+    return "\n".join([
+        f"- {name}: {description or 'No description'} (Price: {price} per unit)"
+        if with_price and price else f"- {name}: {description or 'No description'}"
+        for name, description, price in products
+    ])
+
+
+def _parse_insights(
+    result: Union[_InsightsResult, _ScrapeInsightsResult]
+) -> tuple[str, List[PainPoint], list]:
+    """Extract (summary, pain_points, call_script) from one insights answer."""
+    pain_points = [
+        PainPoint(**pp.model_dump()) for pp in result.pain_points[:3]
+    ]
+    call_script = [item.model_dump() for item in result.call_script[:3]]
+    return result.business_summary, pain_points, call_script
+
+
+def build_insights_request(
+    business_name: str,
+    business_address: Optional[str],
+    business_website: Optional[str],
+    products: List[Product],
+    business_description: Optional[str] = None
+) -> dict:
+    """
+    Build the chat completion request body for one prospect's insights.
+
+    Shared by the direct call (generate_prospect_insights) and the OpenAI
+    Batch API path, so both send exactly the same prompt.
+    """
+    products_context = _format_products(products)
+
+    # Include business description if available (from URL scraper)
+    description_context = ""
+    if business_description:
+        description_context = f"\n- About: {business_description}"
+
+    # Invariant instructions first, then the org's products, then the
+    # prospect: the longest possible prefix is shared between calls
+    prompt = (
+        f"{_INSIGHTS_PROMPT_PREFIX}\n\n"
+        f"OUR PRODUCTS/SERVICES:\n{products_context}\n\n"
+        f"PROSPECT INFORMATION:\n"
+        f"- Business Name: {business_name}\n"
+        f"- Address: {business_address or 'Unknown'}\n"
+        f"- Website: {business_website or 'Unknown'}{description_context}"
+    )
+
+    return {
+        "model": "gpt-4o",  # Stronger reasoning for pattern recognition & insights
+        "messages": [
+            {
+                "role": "system",
+                "content": INSIGHTS_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "response_format": _INSIGHTS_RESPONSE_FORMAT,
+        "temperature": 0.7,
+        "max_tokens": 1100
+    }
 
 
 class LeadAgentAI:
@@ -17,7 +275,7 @@ class LeadAgentAI:
 
     def __init__(self, api_key: str):
         """Initialize with OpenAI API key."""
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
 
     async def generate_prospect_insights(
         self,
@@ -43,138 +301,292 @@ class LeadAgentAI:
         Returns:
             tuple: (business_summary, list_of_pain_points, call_script_items)
         """
-        # Build products context
-        if products:
-            products_context = "\n".join([
-                f"- {p.name}: {p.description or 'No description'} "
-                f"(Price: {p.price} per unit)" if p.price else f"- {p.name}: {p.description or 'No description'}"
-                for p in products
-            ])
-        else:
-            products_context = "No products defined yet."
-
-        # Include business description if available (from URL scraper)
-        description_context = ""
-        if business_description:
-            description_context = f"\n- About: {business_description}"
-
-        prompt = f"""You are a B2B sales intelligence assistant. Analyze this business prospect and generate insights.
-
-PROSPECT INFORMATION:
-- Business Name: {business_name}
-- Address: {business_address or 'Unknown'}
-- Website: {business_website or 'Unknown'}{description_context}
+        request = build_insights_request(
+            business_name, business_address, business_website, products, business_description
+        )
 
-OUR PRODUCTS/SERVICES:
-{products_context}
+        try:
+            response = await create_chat_completion(self.client, **request)
 
-TASKS:
-1. Generate a brief business summary (2-3 sentences) about what this business does, their target market, and potential needs. If we have their website description, use that information. Be concise and focused.
+            result = _InsightsResult.model_validate_json(response.choices[0].message.content)
+            return _parse_insights(result)
 
-2. Identify the TOP 3 pain points this business might have that our products/services could solve. For each pain point:
-   - Give it a short, clear title (max 6 words)
-   - Explain the pain point in 1-2 sentences
-   - If applicable, mention which of our products would help (use exact product name or null)
+        except Exception:
+            logger.exception("Error generating AI insights")
+            # Return empty fallback
+            return "", [], []
 
-3. Create a CALL SCRIPT with 3 conversational Q&A's based on the pain points.
+    async def extract_with_insights(
+        self,
+        url: str,
+        page_text: str,
+        products: List[Product]
+    ) -> tuple[ExtractedBusiness, str, List[PainPoint], list]:
+        """
+        Extract a business from its page and generate its insights in a single GPT-4o call.
 
-Each Q&A has 3 parts:
-   a) YOUR OPENING QUESTION - Frame it positively, inviting their opinion. Never assume a problem or imply incompetence. Sound like you're asking a loved one their take on something. Keep it simple, straight to the point, and genuinely curious. The question should make them think "of course I want that, it's a no-brainer".
-   b) THEIR EXPECTED RESPONSE - What the prospect will likely say back (a short, natural reply).
-   c) OUR VALUE RESPONSE - How we deliver value in response. Reference our specific product/service. Keep it conversational and benefit-focused.
+        The two-tier pipeline (GPT-4o-mini extraction, then GPT-4o insights)
+        stays the default and the cheaper path for bulk work; this one saves
+        the second round-trip when a user waits for one prospect.
 
-EXAMPLE (for a fitness club prospect, pain point: "hard to identify sports talent"):
-   BAD question: "Do you find it hard to identify sports talent in the UAE?"
-   (This implies they're not competent. People expect strangers to help them, not question them.)
+        Args:
+            url: The page's (normalized) URL
+            page_text: Cleaned page text (URLScraperService.fetch_page_text)
+            products: List of organization's products/services
 
-   GOOD question: "Would you guys be interested in finding new players?"
-   Their response: "Sure, what kind of players?"
-   Our response: "We use rigorous testing methods to identify talented young players in Dubai and when we know which sport they are good at, we send them to you."
+        Returns:
+            tuple: (business, business_summary, list_of_pain_points, call_script_items)
 
-   WHY THIS WORKS: It doesn't sound salesy. It doesn't sound scripted. It sounds like something a person who cares about you would ask. It immediately brings down a person's guard and invites them to engage.
+        Raises:
+            ScraperError: If the call fails or the business is not identified
+        """
+        prompt = (
+            f"{_SCRAPE_INSIGHTS_PROMPT_PREFIX}\n\n"
+            f"OUR PRODUCTS/SERVICES:\n{_format_products(products)}\n\n"
+            f"URL: {url}\n\n"
+            f"WEBSITE CONTENT:\n{page_text}"
+        )
 
-RULES FOR CALL SCRIPT:
-- Never assume the person will run away - no emotionally sticky opening lines
-- Questions should invite their opinion, not point out a weakness
-- Frame questions so the value is obvious: "would you be interested in X?"
-- Keep questions under 15 words
-- Sound like a person who genuinely cares, not a salesperson
+        try:
+            response = await create_chat_completion(
+                self.client,
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": INSIGHTS_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format=_SCRAPE_INSIGHTS_RESPONSE_FORMAT,
+                temperature=0.7,
+                max_tokens=1400
+            )
+            result = _ScrapeInsightsResult.model_validate_json(response.choices[0].message.content)
+        except Exception as e:
+            logger.exception("Error scraping %s with AI insights", url)
+            raise ScraperError(
+                "An error occurred while analyzing the website content. Please try again.",
+                f"Scrape with insights error: {str(e)}"
+            )
 
-Respond ONLY with valid JSON in this exact format:
-{{
-    "business_summary": "...",
-    "pain_points": [
-        {{
-            "title": "...",
-            "description": "...",
-            "relevant_product": "product name or null"
-        }},
-        {{
-            "title": "...",
-            "description": "...",
-            "relevant_product": "product name or null"
-        }},
-        {{
-            "title": "...",
-            "description": "...",
-            "relevant_product": "product name or null"
-        }}
-    ],
-    "call_script": [
-        {{
-            "question": "Would you guys be interested in...?",
-            "answer": "We use... to help you..."
-        }},
-        {{
-            "question": "...",
-            "answer": "..."
-        }},
-        {{
-            "question": "...",
-            "answer": "..."
-        }}
-    ]
-}}"""
+        business_name = result.business_name.strip()
+        if not business_name:
+            raise ScraperError(
+                "Could not identify the business name from the website content. The page might not contain sufficient business information.",
+                "No valid business_name in response"
+            )
+
+        business = ExtractedBusiness(
+            business_name=business_name,
+            description=result.description,
+            address=result.address,
+            website=url,
+            google_maps_url=result.google_maps_url
+        )
+        return (business, *_parse_insights(result))
+
+    async def submit_insights_batch(self, requests: Dict[str, dict]) -> tuple[str, str]:
+        """
+        Submit insight requests to the OpenAI Batch API (half price, 24h window).
+
+        Args:
+            requests: custom_id (prospect ID) -> body from build_insights_request
+
+        Returns:
+            tuple: (batch_id, input_file_id)
+        """
+        lines = [
+            orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            })
+            for custom_id, body in requests.items()
+        ]
+        input_file = await self.client.files.create(
+            file=("insights.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id, input_file.id
+
+    async def fetch_insights_batch(
+        self,
+        batch_id: str
+    ) -> tuple[str, Optional[Dict[str, tuple[str, List[PainPoint], list]]]]:
+        """
+        Check a submitted insights batch and download its results once finished.
+
+        Returns:
+            tuple: (status, results). results is None while the batch is still
+            running or if it did not complete; otherwise custom_id ->
+            (business_summary, pain_points, call_script_items) for every
+            request that succeeded (empty if none did).
+        """
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            return batch.status, None
+
+        if batch.error_file_id:
+            errors = await self.client.files.content(batch.error_file_id)
+            error_lines = [line for line in errors.text.splitlines() if line.strip()]
+            if error_lines:
+                logger.warning(
+                    "Insights batch %s has %d failed requests, e.g. %.500s",
+                    batch_id, len(error_lines), error_lines[0]
+                )
+
+        # Completed without an output file: every request failed
+        if not batch.output_file_id:
+            return batch.status, {}
+
+        output = await self.client.files.content(batch.output_file_id)
+
+        results = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = orjson.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[item["custom_id"]] = _parse_insights(_InsightsResult.model_validate_json(content))
+            except Exception:
+                logger.exception("Error parsing batched insights line")
+
+        return batch.status, results
+
+    async def generate_prospect_insights_many(
+        self,
+        prospects: List[dict],
+        products: List[Product],
+        concurrency: int = 10,
+        timeout: Optional[float] = None
+    ) -> dict[str, tuple[str, List[PainPoint], list]]:
+        """
+        Generate insights for several prospects with one call each, concurrently.
+
+        For prospects a batched call (generate_prospect_insights_batch) did not
+        cover: each prospect gets its own generate_prospect_insights call, up to
+        `concurrency` at a time (within the process-wide OpenAI limits).
+
+        Args:
+            prospects: Dicts with id, business_name, address, website and an
+                optional business_description
+            products: List of organization's products/services
+            concurrency: Maximum calls in flight for this request
+            timeout: Deadline in seconds for each call (None: no deadline)
+
+        Returns:
+            dict: prospect_id -> (business_summary, pain_points, call_script_items).
+            Prospects whose call failed or timed out are missing from the result.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate_one(prospect: dict) -> tuple[str, List[PainPoint], list]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self.generate_prospect_insights(
+                            business_name=prospect["business_name"],
+                            business_address=prospect.get("address"),
+                            business_website=prospect.get("website"),
+                            products=products,
+                            business_description=prospect.get("business_description")
+                        ),
+                        timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("AI insights for prospect %s timed out", prospect["id"])
+                    return "", [], []
+
+        results = await asyncio.gather(*(generate_one(p) for p in prospects))
+        # generate_prospect_insights returns an empty summary when its call fails
+        return {
+            str(prospect["id"]): result
+            for prospect, result in zip(prospects, results)
+            if result[0]
+        }
+
+    async def cancel_insights_batch(self, batch_id: str):
+        """Cancel a submitted insights batch."""
+        await self.client.batches.cancel(batch_id)
+
+    async def generate_prospect_insights_batch(
+        self,
+        prospects: List[dict],
+        products: List[Product]
+    ) -> dict[str, tuple[str, List[PainPoint], list]]:
+        """
+        Generate insights for several prospects of one organization in a single call.
+
+        Uses the same guidance as generate_prospect_insights, but asks the model
+        for one JSON entry per prospect so N prospects cost one round-trip.
+
+        Args:
+            prospects: Dicts with id, business_name, address, website and an
+                optional business_description (at most MAX_INSIGHTS_BATCH)
+            products: List of organization's products/services
+
+        Returns:
+            dict: prospect_id -> (business_summary, pain_points, call_script_items).
+            Prospects the model skipped are missing from the result.
+        """
+        prospects_context = "\n\n".join([
+            f"PROSPECT ID: {p['id']}\n"
+            f"- Business Name: {p['business_name']}\n"
+            f"- Address: {p.get('address') or 'Unknown'}\n"
+            f"- Website: {p.get('website') or 'Unknown'}"
+            + (f"\n- About: {p['business_description']}" if p.get("business_description") else "")
+            for p in prospects
+        ])
+
+        # Same ordering as build_insights_request: static instructions, then
+        # products, then the prospects
+        prompt = (
+            f"{_BATCH_INSIGHTS_PROMPT_PREFIX}\n\n"
+            f"OUR PRODUCTS/SERVICES:\n{_format_products(products)}\n\n"
+            f"PROSPECTS:\n{prospects_context}"
+        )
 
         try:
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",  # Stronger reasoning for pattern recognition & insights
+            response = await create_chat_completion(
+                self.client,
+                model="gpt-4o",
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a B2B sales intelligence assistant. You identify business pain points and match them to solutions. For call scripts, you help sales reps sound like someone who genuinely cares - not a salesperson. You frame questions positively to invite opinion, never assuming problems or incompetence. Respond only with valid JSON."
+                        "content": INSIGHTS_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
                         "content": prompt
                     }
                 ],
-                response_format={"type": "json_object"},
+                response_format=_BATCH_INSIGHTS_RESPONSE_FORMAT,
                 temperature=0.7,
-                max_tokens=1100
+                max_tokens=1100 * len(prospects)
             )
 
-            result = json.loads(response.choices[0].message.content)
-
-            # Extract and validate data
-            business_summary = result.get("business_summary", "")
-
-            pain_points = []
-            for pp in result.get("pain_points", [])[:3]:
-                pain_points.append(PainPoint(
-                    title=pp.get("title", ""),
-                    description=pp.get("description", ""),
-                    relevant_product=pp.get("relevant_product")
-                ))
+            result = _BatchInsightsResult.model_validate_json(response.choices[0].message.content)
 
-            call_script = result.get("call_script", [])[:3]
+            known_ids = {str(p["id"]) for p in prospects}
+            insights = {}
+            for item in result.prospects:
+                prospect_id = item.prospect_id
+                if prospect_id in known_ids:
+                    insights[prospect_id] = _parse_insights(item)
 
-            return business_summary, pain_points, call_script
+            return insights
 
-        except Exception as e:
-            print(f"Error generating AI insights: {e}")
-            # Return empty fallback
-            return "", [], []
+        except Exception:
+            logger.exception("Error generating batched AI insights")
+            return {}
 
     async def generate_call_script(
         self,
@@ -200,13 +612,7 @@ Respond ONLY with valid JSON in this exact format:
             return []
 
         # Build products context for answers
-        if products:
-            products_context = "\n".join([
-                f"- {p.name}: {p.description or 'No description'}"
-                for p in products
-            ])
-        else:
-            products_context = "No products defined yet."
+        products_context = _format_products(products, with_price=False)
 
         # Format pain points for the prompt
         pain_points_text = "\n".join([
@@ -241,28 +647,11 @@ RULES:
 - Never assume the person will run away
 - Questions invite opinion, not point out weakness
 - Simple and straight to the point
-- Sound like someone who genuinely cares, not a salesperson
-
-Respond ONLY with valid JSON:
-{{
-    "script_items": [
-        {{
-            "question": "Would you guys be interested in...?",
-            "answer": "We use... to help you..."
-        }},
-        {{
-            "question": "...",
-            "answer": "..."
-        }},
-        {{
-            "question": "...",
-            "answer": "..."
-        }}
-    ]
-}}"""
+- Sound like someone who genuinely cares, not a salesperson"""
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await create_chat_completion(
+                self.client,
                 model="gpt-4o",
                 messages=[
                     {
@@ -274,14 +663,20 @@ Respond ONLY with valid JSON:
                         "content": prompt
                     }
                 ],
-                response_format={"type": "json_object"},
+                response_format=_CALL_SCRIPT_RESPONSE_FORMAT,
                 temperature=0.8,  # Slightly higher for natural language variation
                 max_tokens=700
             )
 
-            result = json.loads(response.choices[0].message.content)
-            return result.get("script_items", [])
+            result = _CallScriptResult.model_validate_json(response.choices[0].message.content)
+            return [item.model_dump() for item in result.script_items]
 
-        except Exception as e:
-            print(f"Error generating call script: {e}")
+        except Exception:
+            logger.exception("Error generating call script")
             return []
+
+
+@lru_cache()
+def get_lead_agent_ai() -> LeadAgentAI:
+    """Get the shared LeadAgentAI (uses the process-wide OpenAI client)."""
+    return LeadAgentAI(settings.openai_api_key)
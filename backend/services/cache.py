@@ -4,7 +4,9 @@ In-memory TTL cache service for reducing redundant Supabase queries.
 Uses cachetools.TTLCache with separate pools for different data types,
 each with an appropriate TTL based on how frequently the data changes.
 """
+import asyncio
 import threading
+from typing import Any, Awaitable, Callable
 from cachetools import TTLCache
 
 
@@ -19,6 +21,14 @@ _lock = threading.Lock()
 # Auth: user lookups by telegram_id, membership checks (every request)
 _auth_cache = TTLCache(maxsize=512, ttl=60)
 
+# Membership: (org_id, telegram_id) -> (user_id, role), checked on every
+# org-scoped request. Sized for every active member/org pair to stay resident.
+_membership_cache = TTLCache(maxsize=10_000, ttl=60)
+
+# Init data: verified Telegram users keyed by a digest of the raw initData.
+# Short TTL so an expired auth_date is re-checked soon after it lapses.
+_init_data_cache = TTLCache(maxsize=10_000, ttl=60)
+
 # Org: org details, invite codes, member lists
 _org_cache = TTLCache(maxsize=256, ttl=120)
 
@@ -34,14 +44,36 @@ _analytics_cache = TTLCache(maxsize=256, ttl=30)
 # Reports: activity reports
 _reports_cache = TTLCache(maxsize=128, ttl=60)
 
+# Insights: AI insights keyed by a fingerprint of every prompt input, so an
+# identical re-submission within a day reuses the earlier GPT-4o result
+_insights_cache = TTLCache(maxsize=2048, ttl=86400)
+
+# Pages: URL -> fetched HTML (at most 50KB each), so re-scraping a URL soon
+# after skips the network round-trip
+_pages_cache = TTLCache(maxsize=128, ttl=3600)
+
+# Scrape: ExtractedBusiness keyed by a digest of the URL and the page text,
+# so an unchanged page is not sent to GPT-4o-mini again within a day
+_scrape_cache = TTLCache(maxsize=1024, ttl=86400)
+
+# vCards: prospect_id -> (org_id, vcard, filename). Only contact edits and
+# deletes change them, and both invalidate explicitly.
+_vcard_cache = TTLCache(maxsize=1024, ttl=3600)
+
 # Pool registry for easy access
 _pools = {
     "auth": _auth_cache,
+    "membership": _membership_cache,
+    "init_data": _init_data_cache,
     "org": _org_cache,
     "catalog": _catalog_cache,
     "plans": _plans_cache,
     "analytics": _analytics_cache,
     "reports": _reports_cache,
+    "insights": _insights_cache,
+    "pages": _pages_cache,
+    "scrape": _scrape_cache,
+    "vcard": _vcard_cache,
 }
 
 
@@ -93,3 +125,52 @@ def cache_invalidate_multi(pools: list[str], prefix: str = ""):
     """Invalidate entries across multiple pools at once."""
     for pool in pools:
         cache_invalidate(pool, prefix)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# VERSIONED KEYS
+# ─────────────────────────────────────────────────────────────────────────────
+# Readers put the current version of a namespace in their cache keys; a write
+# bumps it. Every entry built before the write becomes unreachable at once
+# (and ages out of its pool), including one a concurrent reader stores after
+# the write from a query that started before it - the race a plain
+# cache_delete cannot close.
+
+_versions: dict[str, int] = {}
+
+
+def cache_version(namespace: str) -> int:
+    """Get the current version of a key namespace (0 until first bumped)."""
+    with _lock:
+        return _versions.get(namespace, 0)
+
+
+def cache_bump(namespace: str) -> int:
+    """Invalidate every key built with the namespace's current version."""
+    with _lock:
+        _versions[namespace] = _versions.get(namespace, 0) + 1
+        return _versions[namespace]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SINGLEFLIGHT
+# ─────────────────────────────────────────────────────────────────────────────
+# On a cold key, concurrent requests would each run the same queries. The
+# first caller starts the load; the others await that same task.
+
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def cache_singleflight(key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run load() once for all concurrent callers with the same key.
+
+    The shared task is shielded, so a caller that disconnects does not
+    cancel the load for the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
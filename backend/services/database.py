@@ -2,17 +2,52 @@
 Supabase database client.
 """
 from functools import lru_cache
-from supabase import create_client, Client
+
+import httpx
+from supabase import create_client, Client, ClientOptions
 from config import settings
 
 
+# Keep-alive pool for PostgREST calls. Without it every request pays a fresh
+# TCP + TLS handshake to Supabase.
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=30
+)
+_HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+
+def _pooled_http_client() -> httpx.Client:
+    """
+    Build a pooled HTTP/2 client for one Supabase client.
+
+    Not shared between Supabase clients: postgrest-py writes its base URL and
+    auth headers onto the httpx client it is given.
+    """
+    return httpx.Client(
+        http2=True,
+        limits=_HTTP_LIMITS,
+        timeout=_HTTP_TIMEOUT,
+        follow_redirects=True
+    )
+
+
 @lru_cache()
 def get_supabase() -> Client:
-    """Get Supabase client with anon key (respects RLS)."""
-    return create_client(settings.supabase_url, settings.supabase_key)
+    """Get Supabase client with anon key (respects RLS). Reuses pooled connections."""
+    return create_client(
+        settings.supabase_url,
+        settings.supabase_key,
+        options=ClientOptions(httpx_client=_pooled_http_client())
+    )
 
 
 @lru_cache()
 def get_supabase_admin() -> Client:
-    """Get Supabase client with service key (bypasses RLS)."""
-    return create_client(settings.supabase_url, settings.supabase_service_key)
+    """Get Supabase client with service key (bypasses RLS). Reuses pooled connections."""
+    return create_client(
+        settings.supabase_url,
+        settings.supabase_service_key,
+        options=ClientOptions(httpx_client=_pooled_http_client())
+    )
@@ -0,0 +1,287 @@
+"""
+Insights Batch - OpenAI Batch API path for non-urgent AI insights.
+
+Bulk imports do not need their insights within seconds, so instead of a
+direct GPT-4o call they are deferred here and submitted through the OpenAI
+Batch API, which costs half as much per token and has its own, higher rate
+limits. Results arrive within the 24h completion window.
+
+A single loop (started in the FastAPI lifespan when
+settings.insights_batch_api_enabled is on) does two things every
+settings.insights_batch_flush_seconds, or sooner once
+settings.insights_batch_max_rows insights are waiting:
+1. Submit all deferred prospects as one batch, tracked in
+   lead_agent_insight_batches (migration 018).
+2. Poll submitted batches and write finished results back with
+   la_apply_prospect_insights.
+
+Anything that cannot go through the Batch API (submission error, failed or
+expired batch, missing result) falls back to the regular insights queue.
+
+The Supabase client is synchronous, so its calls run in a thread
+(asyncio.to_thread) to keep the event loop free.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from postgrest.types import ReturnMethod
+
+from models import Product
+from services import get_supabase_admin
+from services.ai_lead_agent import build_insights_request, get_lead_agent_ai
+from services.bot_task_logger import BotTaskLogger
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# (prospect_id, org_id, business_description) waiting to be submitted
+_deferred: list[tuple[str, str, Optional[str]]] = []
+
+# Set when enough insights are deferred to submit before the next tick
+_flush_now: Optional[asyncio.Event] = None
+
+# Batch statuses that will never produce results
+_DEAD_STATUSES = ("failed", "expired", "cancelled")
+
+
+def _get_flush_event() -> asyncio.Event:
+    """Get the shared flush event (created lazily inside the running loop)."""
+    global _flush_now
+    if _flush_now is None:
+        _flush_now = asyncio.Event()
+    return _flush_now
+
+
+def defer_insights(
+    prospect_id: str,
+    org_id: str,
+    business_description: Optional[str] = None
+):
+    """Defer AI insight generation for a prospect to the next Batch API submission."""
+    _deferred.append((prospect_id, org_id, business_description))
+    if len(_deferred) >= settings.insights_batch_max_rows:
+        _get_flush_event().set()
+
+
+def _fall_back_to_queue(jobs: list[tuple[str, str, Optional[str]]]):
+    """Hand jobs that could not go through the Batch API to the regular insights queue."""
+    # Imported here: insights_worker imports this module for defer_insights
+    from services.insights_worker import enqueue_insights
+
+    for prospect_id, org_id, business_description in jobs:
+        enqueue_insights(prospect_id, org_id, business_description)
+
+
+async def insights_batch_loop(poll_interval_seconds: int = 300):
+    """
+    Background loop that submits deferred insights and collects finished batches.
+
+    Args:
+        poll_interval_seconds: Seconds between submit/poll rounds
+    """
+    logger.info("Insights batch loop started (interval %ss)", poll_interval_seconds)
+    flush_now = _get_flush_event()
+
+    while True:
+        try:
+            await asyncio.wait_for(flush_now.wait(), timeout=poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        flush_now.clear()
+
+        try:
+            await submit_deferred_insights()
+        except Exception:
+            logger.exception("Error submitting deferred insights")
+
+        try:
+            await collect_insight_batches()
+        except Exception:
+            logger.exception("Error collecting insight batches")
+
+
+async def submit_deferred_insights():
+    """Submit every deferred prospect to the OpenAI Batch API as a single batch."""
+    if not _deferred:
+        return
+
+    jobs = _deferred[:settings.insights_batch_max_rows]
+    del _deferred[:len(jobs)]
+
+    db = get_supabase_admin()
+
+    try:
+        descriptions = {prospect_id: description for prospect_id, _, description in jobs}
+        org_ids = {org_id for _, org_id, _ in jobs}
+
+        prospects_result, products_result = await asyncio.gather(
+            asyncio.to_thread(
+                db.table("lead_agent_prospects").select(
+                    "id, org_id, business_name, address, website"
+                ).in_("id", list(descriptions)).execute
+            ),
+            asyncio.to_thread(
+                db.table("lead_agent_products").select("*").in_(
+                    "org_id", list(org_ids)
+                ).eq("is_active", True).execute
+            )
+        )
+
+        products_by_org: dict[str, list[Product]] = {}
+        for p in products_result.data:
+            products_by_org.setdefault(p["org_id"], []).append(Product.model_construct(**p))
+
+        requests = {}
+        tracked = {}
+        for prospect in prospects_result.data:
+            prospect_id = str(prospect["id"])
+            requests[prospect_id] = build_insights_request(
+                business_name=prospect["business_name"],
+                business_address=prospect.get("address"),
+                business_website=prospect.get("website"),
+                products=products_by_org.get(prospect["org_id"], []),
+                business_description=descriptions.get(prospect_id)
+            )
+            tracked[prospect_id] = {
+                "org_id": prospect["org_id"],
+                "business_name": prospect["business_name"],
+                "business_description": descriptions.get(prospect_id)
+            }
+
+        # Prospects deleted since they were deferred simply drop out
+        if not requests:
+            return
+
+        ai = get_lead_agent_ai()
+        batch_id, input_file_id = await ai.submit_insights_batch(requests)
+
+    except Exception:
+        logger.exception("Could not submit insights batch; falling back to direct calls")
+        _fall_back_to_queue(jobs)
+        return
+
+    try:
+        await asyncio.to_thread(
+            db.table("lead_agent_insight_batches").insert({
+                "openai_batch_id": batch_id,
+                "input_file_id": input_file_id,
+                "prospects": tracked,
+                "request_count": len(requests),
+                "status": "submitted"
+            }, returning=ReturnMethod.minimal).execute
+        )
+    except Exception:
+        # The batch runs on OpenAI's side, but untracked its results are never
+        # collected: cancel it so the prospects are only generated directly
+        logger.exception(
+            "Could not record insights batch %s; cancelling it and falling back to direct calls",
+            batch_id
+        )
+        try:
+            await ai.cancel_insights_batch(batch_id)
+        except Exception:
+            logger.exception("Could not cancel untracked insights batch %s", batch_id)
+        _fall_back_to_queue(jobs)
+        return
+
+    logger.info("Submitted insights batch %s (%d prospects)", batch_id, len(requests))
+
+
+async def collect_insight_batches():
+    """Poll submitted batches and write back the results of finished ones."""
+    db = get_supabase_admin()
+
+    batches_result = await asyncio.to_thread(
+        db.table("lead_agent_insight_batches").select(
+            "id, openai_batch_id, prospects"
+        ).eq("status", "submitted").order("created_at").execute
+    )
+
+    if not batches_result.data:
+        return
+
+    ai = get_lead_agent_ai()
+
+    for batch in batches_result.data:
+        batch_id = batch["openai_batch_id"]
+        tracked = batch["prospects"] or {}
+
+        try:
+            status, results = await ai.fetch_insights_batch(batch_id)
+        except Exception:
+            logger.exception("Could not check insights batch %s", batch_id)
+            continue
+
+        now = datetime.now(timezone.utc).isoformat()
+
+        if status in _DEAD_STATUSES:
+            logger.warning("Insights batch %s ended as %s; retrying directly", batch_id, status)
+            _fall_back_to_queue([
+                (prospect_id, info["org_id"], info.get("business_description"))
+                for prospect_id, info in tracked.items()
+            ])
+            await asyncio.to_thread(
+                db.table("lead_agent_insight_batches").update({
+                    "status": "failed",
+                    "completed_at": now
+                }, returning=ReturnMethod.minimal).eq("id", batch["id"]).execute
+            )
+            continue
+
+        if results is None:
+            continue  # Still running
+
+        updates = [
+            {
+                "id": prospect_id,
+                "business_summary": summary,
+                "pain_points": [pp.dict() for pp in pain_points],
+                "call_script": call_script,
+                "ai_generated_at": now
+            }
+            for prospect_id, (summary, pain_points, call_script) in results.items()
+            if prospect_id in tracked
+        ]
+
+        if updates:
+            # One round-trip for the whole batch (UPDATE ... FROM, see migration 015)
+            await asyncio.to_thread(
+                db.rpc("la_apply_prospect_insights", {"p_rows": updates}).execute
+            )
+
+        for prospect_id, (_, pain_points, _) in results.items():
+            info = tracked.get(prospect_id)
+            if info is None:
+                continue
+            await asyncio.to_thread(
+                BotTaskLogger.log_lead_agent_insights,
+                org_id=info["org_id"],
+                prospect_id=prospect_id,
+                business_name=info["business_name"],
+                pain_points_count=len(pain_points),
+                tokens_used=0,
+                execution_time_ms=0  # Ran asynchronously on OpenAI's side
+            )
+
+        missing = [
+            (prospect_id, info["org_id"], info.get("business_description"))
+            for prospect_id, info in tracked.items()
+            if prospect_id not in results
+        ]
+        if missing:
+            logger.warning(
+                "Insights batch %s returned no result for %d prospects; retrying directly",
+                batch_id, len(missing)
+            )
+            _fall_back_to_queue(missing)
+
+        await asyncio.to_thread(
+            db.table("lead_agent_insight_batches").update({
+                "status": "completed",
+                "completed_at": now
+            }, returning=ReturnMethod.minimal).eq("id", batch["id"]).execute
+        )
+
+        logger.info("Applied insights batch %s (%d/%d prospects)", batch_id, len(updates), len(tracked))
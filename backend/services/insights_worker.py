@@ -0,0 +1,413 @@
+"""
+Insights Worker - In-process queue for AI insight generation.
+
+Prospect endpoints enqueue insight jobs instead of running them as request
+BackgroundTasks, so slow GPT-4o calls never hold a request worker. A fixed
+pool of worker loops, started in the FastAPI lifespan, drains the queue.
+
+Jobs are coalesced per organization: every prospect queued for an org while
+a worker is busy is picked up together and analysed in one batched GPT-4o
+call (up to MAX_INSIGHTS_BATCH prospects per call).
+
+Scheduling is fair across orgs: a worker takes one batch at a time (no
+prefetch), and an org with more pending jobs goes to the back of the ready
+queue after each batch, so one busy org cannot starve the others.
+
+Each GPT-4o call has a deadline sized to the prospects in it (see
+insights_deadline). Prospects whose call times out or fails are put back on
+the queue, up to MAX_INSIGHTS_ATTEMPTS times, rather than dropped.
+
+Results are cached under a fingerprint of the prompt inputs (see
+insights_fingerprint), so re-submitting the same business skips GPT-4o.
+
+Non-urgent jobs can be routed to the OpenAI Batch API instead (see
+services/insights_batch.py).
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+from postgrest.types import ReturnMethod
+
+from models import Product
+from services import get_supabase_admin
+from services.ai_lead_agent import MAX_INSIGHTS_BATCH, get_lead_agent_ai
+from services.bot_task_logger import BotTaskLogger, TaskTimer
+from services.cache import cache_get, cache_set
+from services.lead_agent_catalog import get_active_products
+from services.insights_batch import defer_insights
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Times a prospect's insights are attempted before it is given up on
+MAX_INSIGHTS_ATTEMPTS = 2
+
+# org_id -> [(prospect_id, business_description), ...] waiting to be processed
+_pending: dict[str, list[tuple[str, Optional[str]]]] = {}
+
+# Org IDs that have pending jobs, in arrival order (each org queued at most once)
+_ready: Optional[asyncio.Queue] = None
+
+# prospect_id -> failed attempts so far, for prospects put back on the queue
+_attempts: dict[str, int] = {}
+
+
+def _get_ready_queue() -> asyncio.Queue:
+    """Get the shared ready-org queue (created lazily inside the running loop)."""
+    global _ready
+    if _ready is None:
+        _ready = asyncio.Queue()
+    return _ready
+
+
+def enqueue_insights(
+    prospect_id: str,
+    org_id: str,
+    business_description: Optional[str] = None,
+    urgent: bool = True
+):
+    """
+    Queue AI insight generation for a prospect. Returns immediately.
+
+    A prospect already waiting in the queue is not added twice. Non-urgent
+    jobs (bulk imports) go through the cheaper OpenAI Batch API instead when
+    settings.insights_batch_api_enabled is on.
+    """
+    if not urgent and settings.insights_batch_api_enabled:
+        defer_insights(prospect_id, org_id, business_description)
+        return
+
+    if org_id not in _pending:
+        _pending[org_id] = []
+        _get_ready_queue().put_nowait(org_id)
+    elif any(queued_id == prospect_id for queued_id, _ in _pending[org_id]):
+        return
+    _pending[org_id].append((prospect_id, business_description))
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Casefold and collapse whitespace so trivial edits don't change a fingerprint."""
+    return " ".join((text or "").casefold().split())
+
+
+def insights_fingerprint(
+    org_id: str,
+    prospect: dict,
+    product_rows: List[dict],
+    business_description: Optional[str]
+) -> str:
+    """
+    Exact-match cache key for a prospect's insights.
+
+    Covers everything that goes into the prompt: the org, the normalized
+    business details and description, and each active product's id and
+    updated_at (so editing a product invalidates its insights).
+    """
+    products_key = ",".join(sorted(
+        f"{p['id']}@{p.get('updated_at') or ''}" for p in product_rows
+    ))
+    parts = [
+        str(org_id),
+        _normalize(prospect.get("business_name")),
+        _normalize(prospect.get("address")),
+        _normalize(prospect.get("website")),
+        _normalize(business_description),
+        products_key,
+    ]
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def insights_deadline(prospect_count: int) -> int:
+    """Seconds allowed for one insights call covering prospect_count prospects."""
+    return (
+        settings.insights_job_timeout_seconds
+        + settings.insights_timeout_per_prospect_seconds * (prospect_count - 1)
+    )
+
+
+def _retry_later(org_id: str, jobs: List[tuple[str, Optional[str]]]):
+    """Put prospects whose insights failed back on the queue, up to MAX_INSIGHTS_ATTEMPTS."""
+    for prospect_id, business_description in jobs:
+        attempts = _attempts.pop(prospect_id, 0) + 1
+        if attempts >= MAX_INSIGHTS_ATTEMPTS:
+            logger.error(
+                "Giving up on AI insights for prospect %s after %d attempts",
+                prospect_id, attempts
+            )
+            continue
+        _attempts[prospect_id] = attempts
+        enqueue_insights(prospect_id, org_id, business_description)
+
+
+def _take_batch(org_id: str) -> list[tuple[str, Optional[str]]]:
+    """Pop up to MAX_INSIGHTS_BATCH jobs for an org, re-queueing the org if more remain."""
+    jobs = _pending.pop(org_id, [])
+    batch, rest = jobs[:MAX_INSIGHTS_BATCH], jobs[MAX_INSIGHTS_BATCH:]
+    if rest:
+        _pending[org_id] = rest
+        _get_ready_queue().put_nowait(org_id)
+    return batch
+
+
+async def insights_worker_loop(worker_id: int = 0):
+    """
+    Background loop that pulls per-org insight batches off the queue and runs them.
+
+    Args:
+        worker_id: Identifier used in log output
+    """
+    logger.info("Insights worker %s started", worker_id)
+    queue = _get_ready_queue()
+
+    while True:
+        org_id = await queue.get()
+        try:
+            jobs = _take_batch(org_id)
+            if len(jobs) == 1:
+                prospect_id, business_description = jobs[0]
+                job = generate_ai_insights_task(prospect_id, org_id, business_description)
+            elif jobs:
+                job = generate_ai_insights_batch_task(org_id, jobs)
+            else:
+                continue
+
+            # The GPT-4o calls inside carry their own deadlines
+            await job
+        except Exception:
+            logger.exception("Error in insights worker %s", worker_id)
+        finally:
+            queue.task_done()
+
+
+async def generate_ai_insights_task(
+    prospect_id: str,
+    org_id: str,
+    business_description: Optional[str] = None
+):
+    """
+    Generate AI insights for a prospect.
+
+    Two-tier LLM pipeline:
+    - Tier 1 (GPT-4o-mini): Already extracted business_description from URL (passed in)
+    - Tier 2 (GPT-4o): Generate strategic insights, pain points, and call script
+    """
+    db = get_supabase_admin()
+
+    try:
+        # Prospect and org's products (cached; invalidated on product writes) are
+        # independent: fetch them concurrently, off the event loop
+        prospect_result, product_rows = await asyncio.gather(
+            asyncio.to_thread(
+                db.table("lead_agent_prospects").select(
+                    "id, business_name, address, website"
+                ).eq("id", prospect_id).maybe_single().execute
+            ),
+            get_active_products(org_id)
+        )
+
+        if not prospect_result or not prospect_result.data:
+            return
+
+        prospect_data = prospect_result.data
+        products = [Product.model_construct(**p) for p in product_rows]
+
+        fingerprint = insights_fingerprint(
+            org_id, prospect_data, product_rows, business_description
+        )
+
+        with TaskTimer() as timer:
+            cached = cache_get("insights", fingerprint)
+            if cached is not None:
+                summary, pain_points, call_script = cached
+            else:
+                # Generate insights using GPT-4o (with business description from GPT-4o-mini)
+                ai = get_lead_agent_ai()
+                try:
+                    summary, pain_points, call_script = await asyncio.wait_for(
+                        ai.generate_prospect_insights(
+                            business_name=prospect_data["business_name"],
+                            business_address=prospect_data.get("address"),
+                            business_website=prospect_data.get("website"),
+                            products=products,
+                            business_description=business_description
+                        ),
+                        timeout=insights_deadline(1)
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("AI insights for prospect %s timed out", prospect_id)
+                    _retry_later(org_id, [(prospect_id, business_description)])
+                    return
+                if not summary:
+                    # Empty fallback from a failed call: retry rather than store it
+                    logger.warning("AI insights for prospect %s failed", prospect_id)
+                    _retry_later(org_id, [(prospect_id, business_description)])
+                    return
+                cache_set("insights", fingerprint, (summary, pain_points, call_script))
+
+        # Update prospect with AI-generated content (including call script)
+        await asyncio.to_thread(
+            db.table("lead_agent_prospects").update({
+                "business_summary": summary,
+                "pain_points": [pp.dict() for pp in pain_points],
+                "call_script": call_script,
+                "ai_generated_at": datetime.now(timezone.utc).isoformat()
+            }, returning=ReturnMethod.minimal).eq("id", prospect_id).execute
+        )
+
+        # Log bot task for reporting
+        BotTaskLogger.log_lead_agent_insights(
+            org_id=org_id,
+            prospect_id=prospect_id,
+            business_name=prospect_data["business_name"],
+            pain_points_count=len(pain_points),
+            tokens_used=0,  # Token tracking would require modifying ai_lead_agent.py
+            execution_time_ms=timer.execution_time_ms
+        )
+
+        _attempts.pop(prospect_id, None)
+        logger.info("AI insights generated for prospect %s", prospect_id)
+
+    except Exception:
+        logger.exception("Error generating AI insights for prospect %s", prospect_id)
+
+
+async def generate_ai_insights_batch_task(
+    org_id: str,
+    jobs: List[tuple[str, Optional[str]]]
+):
+    """
+    Generate AI insights for several prospects of one org with a single GPT-4o call.
+
+    Loads all prospects with one SELECT-IN and the org's products once, then
+    writes every prospect's insights back in a single bulk update. Prospects
+    the batched call misses fall back to concurrent single-prospect calls.
+    """
+    db = get_supabase_admin()
+    descriptions = {prospect_id: description for prospect_id, description in jobs}
+
+    try:
+        # Prospects and org's products (cached; invalidated on product writes) are
+        # independent: fetch them concurrently, off the event loop
+        prospects_result, product_rows = await asyncio.gather(
+            asyncio.to_thread(
+                db.table("lead_agent_prospects").select(
+                    "id, business_name, address, website"
+                ).in_("id", list(descriptions)).execute
+            ),
+            get_active_products(org_id)
+        )
+
+        if not prospects_result.data:
+            return
+
+        prospects = [
+            {**p, "business_description": descriptions.get(p["id"])}
+            for p in prospects_result.data
+        ]
+        products = [Product.model_construct(**p) for p in product_rows]
+
+        # Reuse cached insights; only the rest go to GPT-4o
+        fingerprints = {
+            str(p["id"]): insights_fingerprint(
+                org_id, p, product_rows, p["business_description"]
+            )
+            for p in prospects
+        }
+        insights = {}
+        for prospect_id, fingerprint in fingerprints.items():
+            cached = cache_get("insights", fingerprint)
+            if cached is not None:
+                insights[prospect_id] = cached
+        to_generate = [p for p in prospects if str(p["id"]) not in insights]
+
+        with TaskTimer() as timer:
+            if to_generate:
+                ai = get_lead_agent_ai()
+                try:
+                    generated_insights = await asyncio.wait_for(
+                        ai.generate_prospect_insights_batch(to_generate, products),
+                        timeout=insights_deadline(len(to_generate))
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(
+                        "Batched AI insights for %d prospects in org %s timed out",
+                        len(to_generate), org_id
+                    )
+                    generated_insights = {}
+
+                # Prospects the batched answer left out (or all of them, if the
+                # call failed) get their own calls, run concurrently, each with
+                # its own deadline
+                missing = [p for p in to_generate if str(p["id"]) not in generated_insights]
+                if missing:
+                    logger.warning(
+                        "Batched insights missed %d prospect(s) in org %s; generating them individually",
+                        len(missing), org_id
+                    )
+                    generated_insights.update(
+                        await ai.generate_prospect_insights_many(
+                            missing, products, timeout=insights_deadline(1)
+                        )
+                    )
+
+                for prospect_id, result in generated_insights.items():
+                    if result[0]:
+                        cache_set("insights", fingerprints[prospect_id], result)
+                insights.update(generated_insights)
+
+        now = datetime.now(timezone.utc).isoformat()
+        # Share the call's wall time across the prospects it covered
+        per_prospect_ms = timer.execution_time_ms // max(len(insights), 1)
+
+        updates = []
+        generated = []
+        failed = []
+        for prospect in prospects:
+            result = insights.get(str(prospect["id"]))
+            if result is None:
+                logger.warning("No insights generated for prospect %s", prospect["id"])
+                failed.append((prospect["id"], prospect["business_description"]))
+                continue
+
+            summary, pain_points, call_script = result
+            updates.append({
+                "id": prospect["id"],
+                "business_summary": summary,
+                "pain_points": [pp.dict() for pp in pain_points],
+                "call_script": call_script,
+                "ai_generated_at": now
+            })
+            generated.append((prospect, pain_points))
+
+        # Put the failed prospects back on the queue for another attempt
+        _retry_later(org_id, failed)
+
+        if not updates:
+            return
+
+        # One round-trip for the whole batch (UPDATE ... FROM, see migration 015)
+        await asyncio.to_thread(
+            db.rpc("la_apply_prospect_insights", {"p_rows": updates}).execute
+        )
+
+        for prospect, pain_points in generated:
+            _attempts.pop(prospect["id"], None)
+            BotTaskLogger.log_lead_agent_insights(
+                org_id=org_id,
+                prospect_id=prospect["id"],
+                business_name=prospect["business_name"],
+                pain_points_count=len(pain_points),
+                tokens_used=0,
+                execution_time_ms=per_prospect_ms
+            )
+
+        logger.info(
+            "Batched AI insights generated for %d/%d prospects in org %s",
+            len(insights), len(prospects), org_id
+        )
+
+    except Exception:
+        logger.exception("Error generating batched AI insights for org %s", org_id)
@@ -0,0 +1,91 @@
+"""
+Lead Agent catalog - cached lookups of an organization's products.
+
+Every prospect creation checks for active products and every insights or
+call-script generation loads them as prompt context, while the products
+themselves change rarely. The rows are cached in the catalog pool under
+keys carrying a per-org catalog version, which the product endpoints (lead
+agent and hub routers) bump through invalidate_catalog.
+
+The product list endpoints (lead agent and hub) share one cache entry that
+holds the already-encoded JSON response body, so a hit skips validation and
+serialization entirely.
+"""
+from typing import List
+
+from pydantic import TypeAdapter
+
+from models import Product
+from services.cache import (
+    cache_bump, cache_delete, cache_get, cache_set, cache_singleflight, cache_version
+)
+from services.postgrest_async import pg_get, pg_query_template
+
+
+_PRODUCTS_ADAPTER = TypeAdapter(List[Product])
+
+# Exactly the columns Product reads, so new table columns don't ride along
+PRODUCT_COLUMNS = ",".join(Product.model_fields)
+
+_PRODUCTS_QUERY = pg_query_template("lead_agent_products", {
+    "select": PRODUCT_COLUMNS,
+    "org_id": "eq.{org_id}",
+    "order": "created_at.desc"
+})
+
+_ACTIVE_PRODUCTS_QUERY = pg_query_template("lead_agent_products", {
+    "select": PRODUCT_COLUMNS,
+    "org_id": "eq.{org_id}",
+    "is_active": "eq.true"
+})
+
+
+def _version(org_id: str) -> int:
+    return cache_version(f"catalog:{org_id}")
+
+
+async def get_active_products(org_id: str) -> list[dict]:
+    """
+    Get an organization's active product rows (cached).
+
+    The returned list is shared with the cache: callers must not mutate it.
+    """
+    cache_key = f"active_products:{org_id}:v{_version(org_id)}"
+    cached = cache_get("catalog", cache_key)
+    if cached is not None:
+        return cached
+
+    async def load() -> list[dict]:
+        products = await pg_get(_ACTIVE_PRODUCTS_QUERY, org_id=org_id)
+        cache_set("catalog", cache_key, products)
+        return products
+
+    return await cache_singleflight(cache_key, load)
+
+
+def invalidate_catalog(org_id: str):
+    """Invalidate every cached product lookup of an organization after a product write."""
+    cache_bump(f"catalog:{org_id}")
+    # The lead agent dashboard shows the active product count
+    cache_delete("analytics", f"la_dashboard:{org_id}")
+
+
+async def get_products_json(org_id: str) -> bytes:
+    """
+    Get all of an organization's products, newest first, as encoded JSON (cached).
+
+    Invalidated with invalidate_catalog.
+    """
+    cache_key = f"products:{org_id}:v{_version(org_id)}"
+    cached = cache_get("catalog", cache_key)
+    if cached is not None:
+        return cached
+
+    async def load() -> bytes:
+        rows = await pg_get(_PRODUCTS_QUERY, org_id=org_id)
+        body = _PRODUCTS_ADAPTER.dump_json(_PRODUCTS_ADAPTER.validate_python(rows))
+        cache_set("catalog", cache_key, body)
+        return body
+
+    # Concurrent misses share one query
+    return await cache_singleflight(cache_key, load)
@@ -6,6 +6,7 @@ from the lead_agent_scheduled_notifications table.
 """
 import asyncio
 from datetime import datetime, timezone
+from postgrest.types import ReturnMethod
 
 from services import get_supabase_admin
 from services.notifications import send_journal_reminder
@@ -73,7 +74,7 @@ async def process_due_notifications():
             db.table("lead_agent_scheduled_notifications").update({
                 "status": "sent" if success else "pending",
                 "sent_at": datetime.now(timezone.utc).isoformat() if success else None
-            }).eq("id", notification["id"]).execute()
+            }, returning=ReturnMethod.minimal).eq("id", notification["id"]).execute()
 
             if success:
                 print(f"[NotificationScheduler] Sent notification {notification['id']}")
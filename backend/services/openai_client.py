@@ -0,0 +1,125 @@
+"""
+Shared OpenAI client.
+
+AsyncOpenAI keeps its own httpx connection pool. Building one per service
+object means separate pools (and TLS handshakes to api.openai.com) for each,
+with the small default pool limits. Services get one client per API key here,
+over a pooled httpx.AsyncClient sized for concurrent insight and scrape calls.
+
+Chat completions go through create_chat_completion, which:
+1. Waits on a token bucket sized to the account's requests and tokens per
+   minute (settings.openai_rpm_limit / openai_tpm_limit, off when 0), so
+   bursts are spread out on our side instead of coming back as 429s.
+2. Holds one of OPENAI_CONCURRENCY's slots (settings.openai_max_concurrency)
+   while the call is in flight.
+"""
+import asyncio
+import time
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI
+
+from config import settings
+
+
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=50,
+    keepalive_expiry=30
+)
+
+# Completions can take a while; connecting should not
+_HTTP_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+# In-flight chat completions across the whole process
+OPENAI_CONCURRENCY = asyncio.Semaphore(settings.openai_max_concurrency)
+
+
+@lru_cache()
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get the process-wide AsyncOpenAI client for an API key."""
+    http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=http_client,
+        # The SDK retries 408/409/429/5xx, timeouts and connection errors with
+        # exponential backoff and jitter, honouring Retry-After
+        max_retries=settings.openai_max_retries
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RATE LIMITING
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """
+    Requests-per-minute and tokens-per-minute budget, refilled continuously.
+
+    Both buckets start full (one minute's worth) and refill at limit / 60 per
+    second. A limit of 0 disables that bucket. Waiters are served in order.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    async def acquire(self, tokens: int):
+        """Wait until one request and `tokens` tokens are available, then take them."""
+        if not self.rpm and not self.tpm:
+            return
+
+        # A request larger than the whole budget waits for a full bucket
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.rpm
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+                if not wait:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+
+OPENAI_RATE_LIMIT = TokenBucket(settings.openai_rpm_limit, settings.openai_tpm_limit)
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    """
+    Rough token cost of a chat completion, as OpenAI counts it against TPM:
+    prompt (about 4 characters per token) plus the max_tokens reservation.
+    """
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+async def create_chat_completion(client: AsyncOpenAI, **request):
+    """Create a chat completion within the process-wide rate and concurrency limits."""
+    await OPENAI_RATE_LIMIT.acquire(
+        estimate_tokens(request["messages"], request.get("max_tokens") or 0)
+    )
+    async with OPENAI_CONCURRENCY:
+        return await client.chat.completions.create(**request)
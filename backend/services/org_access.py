@@ -0,0 +1,106 @@
+"""
+Organization access checks shared by the hub, lead agent and reports routers.
+
+A page load typically fires several org-scoped requests at once, and each
+one has to resolve the Telegram user and their membership. The decision is
+cached per (org_id, telegram_id) in the membership pool, so only the first
+request of a page pays the lookups. Hub membership writes invalidate the
+org's entries by prefix (member:{org_id}:). Sub-requests of one batch also
+share their resolved memberships directly (see share_memberships).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import HTTPException
+
+from services.cache import cache_get, cache_set
+from services.database import get_supabase_admin
+
+# Memberships resolved so far by the sub-requests of the current batch
+_batch_memberships: ContextVar[Optional[dict[str, tuple[str, str]]]] = ContextVar(
+    "batch_memberships", default=None
+)
+
+
+def _member_key(org_id: str, telegram_id: int) -> str:
+    return f"member:{org_id}:{telegram_id}"
+
+
+def get_user_id(telegram_id: int) -> str:
+    """Get the user ID for a Telegram user (cached). 404 if unknown."""
+    cache_key = f"user:{telegram_id}"
+    cached = cache_get("auth", cache_key)
+    if cached is not None:
+        return cached
+
+    db = get_supabase_admin()
+    result = db.table("users").select("id").eq(
+        "telegram_id", telegram_id
+    ).maybe_single().execute()
+
+    if not result or not result.data:
+        raise HTTPException(404, "User not found")
+
+    user_id = result.data["id"]
+    cache_set("auth", cache_key, user_id)
+    return user_id
+
+
+def get_org_membership(telegram_id: int, org_id: str) -> tuple[str, str]:
+    """
+    Verify a Telegram user is a member of the organization.
+    Returns (user_id, role). 403 if not a member (not cached).
+    """
+    member_key = _member_key(org_id, telegram_id)
+    shared = _batch_memberships.get()
+    if shared is not None and member_key in shared:
+        return shared[member_key]
+
+    cached = cache_get("membership", member_key)
+    if cached is not None:
+        if shared is not None:
+            shared[member_key] = cached
+        return cached
+
+    user_id = get_user_id(telegram_id)
+
+    db = get_supabase_admin()
+    membership = db.table("memberships").select("role").eq(
+        "user_id", user_id
+    ).eq("org_id", org_id).maybe_single().execute()
+
+    if not membership or not membership.data:
+        raise HTTPException(403, "Not a member of this organization")
+
+    member = (user_id, membership.data["role"])
+    cache_set("membership", member_key, member)
+    if shared is not None:
+        shared[member_key] = member
+    return member
+
+
+def require_org_admin(telegram_id: int, org_id: str) -> str:
+    """Verify a Telegram user is an admin of the organization. Returns user_id."""
+    user_id, role = get_org_membership(telegram_id, org_id)
+    if role != "admin":
+        raise HTTPException(403, "Admin access required")
+    return user_id
+
+
+def remember_org_membership(telegram_id: int, org_id: str, user_id: str, role: str):
+    """Warm the cache with a membership resolved elsewhere (e.g. by an RPC)."""
+    cache_set("membership", _member_key(org_id, telegram_id), (user_id, role))
+
+
+@contextmanager
+def share_memberships():
+    """
+    Share membership lookups between requests dispatched inside the block
+    (the sub-requests of a batch), even if the cache evicts them meanwhile.
+    """
+    token = _batch_memberships.set({})
+    try:
+        yield
+    finally:
+        _batch_memberships.reset(token)
@@ -0,0 +1,116 @@
+"""
+Async PostgREST helpers for hot read paths.
+
+supabase-py's client is synchronous: every .execute() inside an async
+handler blocks the event loop for the whole round-trip. These helpers talk
+to PostgREST directly over a shared httpx.AsyncClient (service key, HTTP/2,
+keep-alive pool), so handlers can await queries and run several at once.
+
+Filters use PostgREST query syntax, e.g.
+    await pg_select("lead_agent_searches", {
+        "select": "*", "org_id": f"eq.{org_id}", "order": "created_at.desc", "limit": 5
+    })
+
+Hot endpoints build their query string once at import time with
+pg_query_template and only fill in the per-request values (pg_get).
+"""
+from typing import Any, Optional
+from urllib.parse import quote, urlencode
+
+import httpx
+import orjson
+
+from config import settings
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_async_postgrest() -> httpx.AsyncClient:
+    """Get the shared async PostgREST client (created on first use)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=f"{settings.supabase_url}/rest/v1",
+            headers={
+                "apikey": settings.supabase_service_key,
+                "Authorization": f"Bearer {settings.supabase_service_key}",
+            },
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=30
+            ),
+            timeout=httpx.Timeout(120.0, connect=10.0)
+        )
+    return _client
+
+
+async def close_async_postgrest():
+    """Close the shared client (application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def pg_query_template(table: str, params: dict) -> str:
+    """
+    Pre-encode a GET path for pg_get. Values may contain str.format
+    placeholders ("{org_id}"), which pg_get fills in (URL-quoted) per request.
+    """
+    return f"/{table}?" + urlencode(params, safe=",.{}*")
+
+
+async def pg_get(template: str, **values: Any) -> list[dict]:
+    """GET rows through a path built by pg_query_template."""
+    path = template.format(**{name: quote(str(value), safe="") for name, value in values.items()})
+    response = await get_async_postgrest().get(path)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def pg_select(table: str, params: dict) -> list[dict]:
+    """GET rows from a table or view."""
+    response = await get_async_postgrest().get(f"/{table}", params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def pg_select_one(table: str, params: dict) -> Optional[dict]:
+    """GET exactly one row, or None if nothing matches (maybe_single)."""
+    response = await get_async_postgrest().get(
+        f"/{table}",
+        params=params,
+        headers={"Accept": "application/vnd.pgrst.object+json"}
+    )
+    # PostgREST answers 406 when the object request matched no rows
+    if response.status_code == 406:
+        return None
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def pg_count(table: str, params: dict) -> int:
+    """Exact row count via HEAD (no rows transferred)."""
+    response = await get_async_postgrest().head(
+        f"/{table}",
+        params=params,
+        headers={"Prefer": "count=exact"}
+    )
+    response.raise_for_status()
+    # Content-Range: "0-24/25" or "*/0"
+    total = response.headers.get("content-range", "*/0").rsplit("/", 1)[-1]
+    return int(total) if total.isdigit() else 0
+
+
+async def pg_rpc(function: str, args: dict) -> Any:
+    """Call a Postgres function (POST /rpc/<function>)."""
+    response = await get_async_postgrest().post(
+        f"/rpc/{function}",
+        content=orjson.dumps(args),
+        headers={"Content-Type": "application/json"}
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content) if response.content else None
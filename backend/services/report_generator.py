@@ -8,7 +8,10 @@ import json
 from datetime import date, timedelta
 from typing import List, Dict, Any
 from dataclasses import dataclass
-from openai import AsyncOpenAI
+
+import orjson
+
+from services.openai_client import create_chat_completion, get_openai_client
 
 
 @dataclass
@@ -45,7 +48,7 @@ class ReportGenerator:
     """Generate LLM-powered activity reports."""
 
     def __init__(self, api_key: str):
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
 
     async def generate_team_report(
         self,
@@ -104,7 +107,8 @@ Respond ONLY with valid JSON:
     "recommendations": ["suggestion 1", "suggestion 2", ...]
 }}"""
 
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
             model="gpt-4o-mini",
             messages=[
                 {
@@ -118,7 +122,7 @@ Respond ONLY with valid JSON:
             max_tokens=400
         )
 
-        result = json.loads(response.choices[0].message.content)
+        result = orjson.loads(response.choices[0].message.content)
         result["tokens_used"] = response.usage.total_tokens
 
         return result
@@ -189,7 +193,8 @@ Respond ONLY with valid JSON:
     "highlights": ["highlight 1", "highlight 2", ...]
 }}"""
 
-        response = await self.client.chat.completions.create(
+        response = await create_chat_completion(
+            self.client,
             model="gpt-4o-mini",
             messages=[
                 {
@@ -203,7 +208,7 @@ Respond ONLY with valid JSON:
             max_tokens=400
         )
 
-        result = json.loads(response.choices[0].message.content)
+        result = orjson.loads(response.choices[0].message.content)
         result["tokens_used"] = response.usage.total_tokens
 
         return result
@@ -3,13 +3,54 @@ Telegram authentication and utilities.
 """
 import hashlib
 import hmac
-import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from urllib.parse import parse_qs
 from typing import Optional
 from fastapi import HTTPException
 
 from config import settings
 from models import TelegramUser
+from services.cache import cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+# (initData, user) verified once by the batch endpoint; its sub-requests run
+# in copies of that context and reuse the user instead of verifying again
+_batch_user: ContextVar[Optional[tuple[str, TelegramUser]]] = ContextVar("batch_user", default=None)
+
+
+def _check_auth_date(parsed: dict):
+    """
+    Reject initData older than settings.init_data_max_age_seconds.
+
+    Cheap, so it runs before the HMAC and stale or replayed payloads never
+    cost a signature check. A max age of 0 disables the check.
+    """
+    max_age = settings.init_data_max_age_seconds
+    if max_age <= 0:
+        return
+
+    try:
+        auth_date = int(parsed.get("auth_date", ""))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Missing auth_date in initData")
+
+    if time.time() - auth_date > max_age:
+        raise HTTPException(status_code=401, detail="initData has expired")
+
+
+@lru_cache(maxsize=8)
+def _secret_key(token: str) -> bytes:
+    """HMAC-SHA256 of the bot token with "WebAppData" as key (constant per token)."""
+    return hmac.new(
+        key=b"WebAppData",
+        msg=token.encode(),
+        digestmod=hashlib.sha256
+    ).digest()
 
 
 def verify_init_data(init_data: str, bot_token: Optional[str] = None) -> dict:
@@ -26,13 +67,7 @@ def verify_init_data(init_data: str, bot_token: Optional[str] = None) -> dict:
     if not token:
         raise HTTPException(status_code=500, detail="Bot token not configured")
 
-    # Debug logging
-    print(f"\n{'='*80}")
-    print(f"[VERIFY_INIT_DATA] Starting validation")
-    print(f"[VERIFY_INIT_DATA] Bot token (first 20 chars): {token[:20]}...")
-    print(f"[VERIFY_INIT_DATA] Bot token (full length): {len(token)} chars")
-    print(f"[VERIFY_INIT_DATA] InitData length: {len(init_data)} chars")
-    print(f"[VERIFY_INIT_DATA] InitData (first 200 chars): {init_data[:200]}...")
+    logger.debug("Verifying initData (%d chars)", len(init_data))
 
     # Parse the query string
     parsed = dict(parse_qs(init_data, keep_blank_values=True))
@@ -42,50 +77,31 @@ def verify_init_data(init_data: str, bot_token: Optional[str] = None) -> dict:
     # Extract and remove hash
     received_hash = parsed.pop("hash", None)
     if not received_hash:
-        print(f"[VERIFY_INIT_DATA] ERROR: Missing hash in initData")
+        logger.debug("initData rejected: missing hash")
         raise HTTPException(status_code=401, detail="Missing hash in initData")
 
-    print(f"[VERIFY_INIT_DATA] Parsed fields: {list(parsed.keys())}")
-    if "user" in parsed:
-        print(f"[VERIFY_INIT_DATA] User data (first 100 chars): {parsed['user'][:100]}...")
+    logger.debug("initData fields: %s", list(parsed.keys()))
+
+    _check_auth_date(parsed)
 
     # Build data-check-string (sorted key=value pairs joined by newline)
     data_check_string = "\n".join(
         f"{k}={v}" for k, v in sorted(parsed.items())
     )
 
-    print(f"[VERIFY_INIT_DATA] Data check string (first 200 chars):")
-    print(f"  {data_check_string[:200]}...")
-
-    # Calculate secret key: HMAC-SHA256 of bot token with "WebAppData" as key
-    secret_key = hmac.new(
-        key=b"WebAppData",
-        msg=token.encode(),
-        digestmod=hashlib.sha256
-    ).digest()
-
-    print(f"[VERIFY_INIT_DATA] Secret key (first 20 bytes hex): {secret_key[:20].hex()}...")
-
     # Calculate expected hash
     expected_hash = hmac.new(
-        key=secret_key,
+        key=_secret_key(token),
         msg=data_check_string.encode(),
         digestmod=hashlib.sha256
     ).hexdigest()
 
-    # Debug logging
-    print(f"[VERIFY_INIT_DATA] Received hash: {received_hash}")
-    print(f"[VERIFY_INIT_DATA] Expected hash: {expected_hash}")
-    print(f"[VERIFY_INIT_DATA] Hashes match: {received_hash == expected_hash}")
-
     # Constant-time comparison
     if not hmac.compare_digest(received_hash, expected_hash):
-        print(f"[VERIFY_INIT_DATA] ❌ VALIDATION FAILED - Invalid signature")
-        print(f"{'='*80}\n")
+        logger.debug("initData rejected: invalid signature")
         raise HTTPException(status_code=401, detail="Invalid initData signature")
 
-    print(f"[VERIFY_INIT_DATA] ✅ VALIDATION SUCCESSFUL")
-    print(f"{'='*80}\n")
+    logger.debug("initData signature valid")
 
     return parsed
 
@@ -93,7 +109,20 @@ def verify_init_data(init_data: str, bot_token: Optional[str] = None) -> dict:
 def get_telegram_user(init_data: str) -> TelegramUser:
     """
     Verify initData and extract user information.
+
+    Verified users are cached briefly by a digest of the raw initData, so
+    repeat requests from an open Mini App skip parsing and the HMAC.
     """
+    batch_user = _batch_user.get()
+    if batch_user is not None and batch_user[0] == init_data:
+        return batch_user[1]
+
+    cache_key = hashlib.blake2b(init_data.encode(), digest_size=16).hexdigest() if init_data else ""
+    if cache_key:
+        cached = cache_get("init_data", cache_key)
+        if cached is not None:
+            return cached
+
     parsed = verify_init_data(init_data)
 
     user_json = parsed.get("user")
@@ -101,7 +130,20 @@ def get_telegram_user(init_data: str) -> TelegramUser:
         raise HTTPException(status_code=401, detail="No user data in initData")
 
     try:
-        user_data = json.loads(user_json)
-        return TelegramUser(**user_data)
-    except (json.JSONDecodeError, ValueError) as e:
+        # Parsed and validated in one pass by pydantic-core
+        user = TelegramUser.model_validate_json(user_json)
+    except ValueError as e:
         raise HTTPException(status_code=401, detail=f"Invalid user data: {e}")
+
+    cache_set("init_data", cache_key, user)
+    return user
+
+
+@contextmanager
+def share_verified_user(init_data: str, user: TelegramUser):
+    """Let requests dispatched inside the block reuse an already verified user."""
+    token = _batch_user.set((init_data, user))
+    try:
+        yield
+    finally:
+        _batch_user.reset(token)
@@ -5,12 +5,14 @@ Uses GPT-4o-mini to analyze journal entries and determine optimal follow-up time
 The agent schedules notifications that are sent via Telegram to remind users to
 follow up with their prospects at the right time.
 """
-import json
 from datetime import datetime, timezone, timedelta
 from typing import Optional
-from openai import AsyncOpenAI
+
+import orjson
+from postgrest.types import ReturnMethod
 
 from services import get_supabase_admin
+from services.openai_client import create_chat_completion, get_openai_client
 from config import settings
 
 
@@ -19,7 +21,7 @@ class TimekeepingAgent:
 
     def __init__(self, api_key: str):
         """Initialize with OpenAI API key."""
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
 
     async def analyze_and_schedule(
         self,
@@ -88,7 +90,8 @@ Respond ONLY with valid JSON:
 If should_notify is false, set days_from_now to 0 and message to empty string."""
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await create_chat_completion(
+                self.client,
                 model="gpt-4o-mini",
                 messages=[
                     {
@@ -105,7 +108,7 @@ If should_notify is false, set days_from_now to 0 and message to empty string.""
                 max_tokens=450
             )
 
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
 
             # Calculate actual scheduled time
             days = min(max(result.get("days_from_now", 7), 0), 365)
@@ -149,9 +152,11 @@ async def process_timekeeping_agent(
         prospect_name = prospect_result.data["business_name"]
 
         # Get all journal entries for this prospect by this user (oldest first)
-        entries_result = db.table("lead_agent_journal_entries").select("*").eq(
-            "prospect_id", prospect_id
-        ).eq("user_id", user_id).order("created_at", desc=False).execute()
+        entries_result = db.table("lead_agent_journal_entries").select(
+            "created_at, interaction_type, content"
+        ).eq("prospect_id", prospect_id).eq("user_id", user_id).order(
+            "created_at", desc=False
+        ).execute()
 
         if not entries_result.data:
             print(f"[TimekeepingAgent] No entries found for prospect {prospect_id}")
@@ -172,12 +177,12 @@ async def process_timekeeping_agent(
         if result.get("management_summary"):
             db.table("lead_agent_prospects").update({
                 "ai_overview": result["management_summary"]
-            }).eq("id", prospect_id).execute()
+            }, returning=ReturnMethod.minimal).eq("id", prospect_id).execute()
 
         # Cancel existing pending notification for this user/prospect
         db.table("lead_agent_scheduled_notifications").update({
             "status": "cancelled"
-        }).eq("prospect_id", prospect_id).eq(
+        }, returning=ReturnMethod.minimal).eq("prospect_id", prospect_id).eq(
             "user_id", user_id
         ).eq("status", "pending").execute()
 
@@ -5,13 +5,25 @@ This is the first tier of our two-tier LLM pipeline:
 1. GPT-4o-mini (cheap) - Extract & summarize business info from HTML
 2. GPT-4o (smart) - Generate insights & pain points with pattern recognition
 """
-import json
+import asyncio
 import hashlib
-from typing import Optional, Tuple
+import logging
+import random
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 import httpx
-from openai import AsyncOpenAI
+import tiktoken
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from selectolax.lexbor import LexborHTMLParser
+
+from config import settings
+from services.cache import cache_get, cache_set
+from services.openai_client import create_chat_completion, get_openai_client
+
+
+logger = logging.getLogger(__name__)
 
 
 class ScraperError(Exception):
@@ -22,6 +34,249 @@ class ScraperError(Exception):
         super().__init__(message)
 
 
+def compute_dedup_hash(business_name: str, website: Optional[str]) -> str:
+    """
+    Deduplication key for a prospect: business_name + website.
+
+    Casefolded for Unicode-correct case-insensitivity. BLAKE2b with a 16-byte
+    digest gives exactly the 32 hex chars stored in dedup_hash.
+    """
+    key = f"{business_name.casefold().strip()}:{(website or '').casefold().strip()}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+# Elements whose content is never visible page text
+_NON_TEXT_TAGS = ["script", "style", "noscript", "template", "svg"]
+
+
+def _html_to_text(html_content: str) -> str:
+    """
+    Visible text of a page, whitespace-collapsed, for the extraction prompt.
+
+    Parsed with lexbor (selectolax) rather than regexes: one C-level pass
+    that also handles malformed markup and entities. Header and footer are
+    kept, as that is often where the address is.
+    """
+    tree = LexborHTMLParser(html_content)
+    tree.strip_tags(_NON_TEXT_TAGS)
+    if tree.root is None:
+        return ""
+    return " ".join(tree.root.text(separator=" ", strip=True).split())
+
+_FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+# A site that accepts the connection gets 30s to answer; one that cannot be
+# reached fails fast, since connecting is retried (_fetch_with_retry)
+_FETCH_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+_fetch_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_fetch_client() -> httpx.AsyncClient:
+    """
+    Get the shared client for fetching business pages (created on first use).
+
+    One long-lived client keeps its SSL context and connection pool, instead
+    of building both for every scrape.
+    """
+    global _fetch_client
+    if _fetch_client is None:
+        _fetch_client = httpx.AsyncClient(
+            timeout=_FETCH_TIMEOUT,
+            follow_redirects=True,
+            headers=_FETCH_HEADERS,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=30
+            )
+        )
+    return _fetch_client
+
+
+async def close_fetch_client():
+    """Close the shared page fetch client (application shutdown)."""
+    global _fetch_client
+    if _fetch_client is not None:
+        await _fetch_client.aclose()
+        _fetch_client = None
+
+
+# Transient failures (failed or dropped connections, these statuses) are
+# retried with exponential backoff before the scrape is given up. Read
+# timeouts are not: a site that took 30s to not answer would likely do it
+# again, and the user is waiting on the scrape.
+_FETCH_ATTEMPTS = 3
+_FETCH_BACKOFF_SECONDS = 0.5
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+# Only the start of a page is used; the rest is never downloaded
+_MAX_PAGE_BYTES = 50_000
+
+
+async def _read_capped(response: httpx.Response) -> str:
+    """Read a streamed response up to _MAX_PAGE_BYTES and decode it."""
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body += chunk
+        if len(body) >= _MAX_PAGE_BYTES:
+            break
+    # A multi-byte character cut at the limit becomes one replacement char
+    return bytes(body[:_MAX_PAGE_BYTES]).decode(
+        response.charset_encoding or "utf-8", errors="replace"
+    )
+
+
+async def _fetch_with_retry(url: str) -> tuple[httpx.Response, str]:
+    """
+    GET a page, retrying transient failures. Returns (response, text): the
+    text is only read for successful responses, and only up to _MAX_PAGE_BYTES.
+    The last failure is returned or raised.
+    """
+    client = _get_fetch_client()
+    for attempt in range(_FETCH_ATTEMPTS):
+        last_attempt = attempt == _FETCH_ATTEMPTS - 1
+        try:
+            response = await client.send(client.build_request("GET", url), stream=True)
+            try:
+                if response.status_code not in _RETRY_STATUSES or last_attempt:
+                    text = await _read_capped(response) if response.is_success else ""
+                    return response, text
+            finally:
+                await response.aclose()
+        except _RETRY_ERRORS:
+            if last_attempt:
+                raise
+        await asyncio.sleep(_FETCH_BACKOFF_SECONDS * 2 ** attempt + random.random() * 0.25)
+
+
+class _ExtractionResult(BaseModel):
+    """What GPT-4o-mini returns for a page (strict structured output)."""
+    model_config = ConfigDict(extra="forbid")
+
+    business_name: str = Field(description="The company/business name")
+    description: Optional[str] = Field(
+        description="A 2-3 sentence description of what the business does, their services, and target market"
+    )
+    address: Optional[str] = Field(description="Physical address if found, or null")
+    google_maps_url: Optional[str] = Field(description="Google Maps link if found on page, or null")
+
+
+class _PageExtractionResult(_ExtractionResult):
+    """One page's entry in a multi-page extraction."""
+    page: int = Field(description="The PAGE number exactly as given")
+
+
+class _BatchExtractionResult(BaseModel):
+    """What GPT-4o-mini returns for several pages at once."""
+    model_config = ConfigDict(extra="forbid")
+
+    results: List[_PageExtractionResult]
+
+
+# Structured outputs: the model can only answer with these schemas
+_EXTRACTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "extracted_business",
+        "strict": True,
+        "schema": _ExtractionResult.model_json_schema()
+    }
+}
+_BATCH_EXTRACTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "extracted_businesses",
+        "strict": True,
+        "schema": _BatchExtractionResult.model_json_schema()
+    }
+}
+
+_EXTRACTION_SYSTEM_PROMPT = "You are a business information extraction assistant. Extract data accurately from website content."
+
+_EXTRACTION_RULES = """Rules:
+- Extract the actual business name, not the website domain
+- For description, summarize what the business does based on the content
+- Use null for any field you cannot find
+- For ADDRESS: Look for physical addresses, office locations, or mailing addresses"""
+
+# Cleaned page text sent for a single extraction, in tokens. Counting tokens
+# rather than characters bounds the prompt the same way for dense scripts
+# (CJK, code-heavy pages) as for English prose.
+_PAGE_TOKENS = 6000
+
+# Pages extracted per multi-page call, and the text sent for each of them
+MAX_EXTRACTION_BATCH = 10
+_BATCH_PAGE_TOKENS = 1000
+
+
+@lru_cache()
+def _encoding() -> Optional[tiktoken.Encoding]:
+    """
+    GPT-4o-mini's tokenizer, or None if it could not be loaded.
+
+    tiktoken downloads its BPE file the first time (then caches it on disk),
+    so this is loaded at startup in a thread (load_tokenizer) rather than in
+    a request.
+    """
+    try:
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        logger.exception("Could not load the GPT-4o-mini tokenizer; page text is cut by characters")
+        return None
+
+
+async def load_tokenizer():
+    """Load the tokenizer off the event loop (application startup)."""
+    await asyncio.to_thread(_encoding)
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of text that fits in max_tokens tokens."""
+    encoding = _encoding()
+    if encoding is None:
+        # About 4 characters per token, as in estimate_tokens
+        return text[:max_tokens * 4]
+
+    # Page text is untrusted: special-token markup is encoded as plain text
+    tokens = encoding.encode_ordinary(text)
+    if len(tokens) <= max_tokens:
+        return text
+    # A cut inside a multi-byte character decodes to U+FFFD; drop it
+    return encoding.decode(tokens[:max_tokens]).rstrip("\ufffd")
+
+
+def _page_text(html_content: str) -> str:
+    """
+    Cleaned text of a page for extraction.
+
+    Raises:
+        ScraperError: If the page has no meaningful text
+    """
+    cleaned = _truncate_tokens(_html_to_text(html_content), _PAGE_TOKENS)
+    if len(cleaned.strip()) < 50:
+        raise ScraperError(
+            "Unable to extract meaningful content from the page. The website might be JavaScript-heavy or blocked.",
+            f"Cleaned content too short: {len(cleaned)} chars"
+        )
+    return cleaned
+
+
+def _extraction_cache_key(url: str, cleaned: str, excerpt: bool = False) -> str:
+    """
+    Same URL and same page text: reuse the earlier extraction.
+
+    Multi-page extractions only saw an excerpt of each page, so they are kept
+    under their own keys (excerpt=True) and never served to a single scrape.
+    """
+    kind = "excerpt" if excerpt else "page"
+    return hashlib.blake2b(f"{kind}\x1f{url}\x1f{cleaned}".encode(), digest_size=16).hexdigest()
+
+
 @dataclass
 class ExtractedBusiness:
     """Business information extracted from a website."""
@@ -36,8 +291,37 @@ class ExtractedBusiness:
         Generate hash for deduplication.
         Uses business_name + website as unique identifier.
         """
-        key = f"{self.business_name.lower().strip()}:{self.website.lower().strip()}"
-        return hashlib.sha256(key.encode()).hexdigest()[:32]
+        return compute_dedup_hash(self.business_name, self.website)
+
+
+def _to_business(url: str, data: _ExtractionResult) -> ExtractedBusiness:
+    """
+    Build an ExtractedBusiness from a model answer.
+
+    Raises:
+        ScraperError: If the model could not name the business
+    """
+    business_name = data.business_name.strip()
+    if not business_name or business_name == "Unknown Business":
+        raise ScraperError(
+            "Could not identify the business name from the website content. The page might not contain sufficient business information.",
+            "No valid business_name in response"
+        )
+
+    return ExtractedBusiness(
+        business_name=business_name,
+        description=data.description,
+        address=data.address,
+        website=url,
+        google_maps_url=data.google_maps_url
+    )
+
+
+def _normalize_url(url: str) -> str:
+    """Default to https:// for URLs entered without a scheme."""
+    if not url.startswith(('http://', 'https://')):
+        url = f'https://{url}'
+    return url
 
 
 class URLScraperService:
@@ -52,7 +336,7 @@ class URLScraperService:
 
     def __init__(self, api_key: str):
         """Initialize the service with OpenAI API key."""
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
 
     async def scrape_business(self, url: str) -> ExtractedBusiness:
         """
@@ -67,17 +351,192 @@ class URLScraperService:
         Raises:
             ScraperError: If scraping or extraction fails
         """
-        # Normalize URL
-        if not url.startswith(('http://', 'https://')):
-            url = f'https://{url}'
+        url = _normalize_url(url)
 
         # Step 1: Fetch HTML content
-        html_content = await self._fetch_html(url)
+        html_content = await self._fetch_page(url)
 
         # Step 2: Extract business info using GPT-4o-mini
         business = await self._extract_with_openai(url, html_content)
         return business
 
+    async def scrape_many(
+        self,
+        urls: List[str],
+        concurrency: int = 10
+    ) -> List[Union[ExtractedBusiness, ScraperError]]:
+        """
+        Scrape several URLs: pages are fetched concurrently, then extracted
+        together (extract_many).
+
+        Args:
+            urls: Website URLs to scrape
+            concurrency: Maximum page fetches in flight
+
+        Returns:
+            One entry per URL, in order: the ExtractedBusiness, or the
+            ScraperError explaining why that URL failed
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(url: str) -> Union[Tuple[str, str], ScraperError]:
+            url = _normalize_url(url)
+            async with semaphore:
+                try:
+                    return url, await self._fetch_page(url)
+                except ScraperError as e:
+                    return e
+
+        fetched = await asyncio.gather(*(fetch_one(url) for url in urls))
+
+        extracted = iter(await self.extract_many([
+            page for page in fetched if not isinstance(page, ScraperError)
+        ]))
+        return [
+            page if isinstance(page, ScraperError) else next(extracted)
+            for page in fetched
+        ]
+
+    async def extract_many(
+        self,
+        pages: List[Tuple[str, str]]
+    ) -> List[Union[ExtractedBusiness, ScraperError]]:
+        """
+        Extract businesses from several fetched pages.
+
+        Pages without a cached extraction (full-page, or an earlier batch's
+        excerpt extraction) are sent to GPT-4o-mini in groups of
+        up to MAX_EXTRACTION_BATCH per call (with a shorter excerpt of each page),
+        so the instructions are paid for once per group rather than per page.
+        A group of one page uses the single-page extraction.
+
+        Args:
+            pages: (url, html_content) pairs
+
+        Returns:
+            One entry per page, in order: the ExtractedBusiness, or the
+            ScraperError explaining why that page failed
+        """
+        results: List[Union[ExtractedBusiness, ScraperError, None]] = [None] * len(pages)
+        pending = []  # (index, url, cleaned, cache_key)
+
+        for index, (url, html_content) in enumerate(pages):
+            try:
+                cleaned = _page_text(html_content)
+            except ScraperError as e:
+                results[index] = e
+                continue
+            cache_key = _extraction_cache_key(url, cleaned)
+            cached = cache_get("scrape", cache_key)
+            if cached is None:
+                cached = cache_get("scrape", _extraction_cache_key(url, cleaned, excerpt=True))
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append((index, url, cleaned, cache_key))
+
+        groups = [
+            pending[start:start + MAX_EXTRACTION_BATCH]
+            for start in range(0, len(pending), MAX_EXTRACTION_BATCH)
+        ]
+        extracted = await asyncio.gather(*(self._extract_group(group) for group in groups))
+
+        for group, group_results in zip(groups, extracted):
+            for (index, _, _, _), result in zip(group, group_results):
+                results[index] = result
+
+        return results
+
+    async def _extract_group(
+        self,
+        group: List[Tuple[int, str, str, str]]
+    ) -> List[Union[ExtractedBusiness, ScraperError]]:
+        """Extract one group from extract_many; errors are returned per page."""
+        if len(group) == 1:
+            _, url, cleaned, cache_key = group[0]
+            try:
+                return [await self._extract_cleaned(url, cleaned, cache_key)]
+            except ScraperError as e:
+                return [e]
+
+        pages_context = "\n\n".join(
+            f"PAGE {page}\nURL: {url}\nWEBSITE CONTENT:\n{_truncate_tokens(cleaned, _BATCH_PAGE_TOKENS)}"
+            for page, (_, url, cleaned, _) in enumerate(group)
+        )
+        prompt = f"""You are extracting business information from several websites. Each PAGE below is a different business; treat them independently.
+
+Extract the following information about each business. Be accurate - only extract what is actually present on its page. Return one result per PAGE.
+
+{_EXTRACTION_RULES}
+
+{pages_context}"""
+
+        try:
+            response = await create_chat_completion(
+                self.client,
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": _EXTRACTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.1,
+                max_tokens=300 * len(group),
+                response_format=_BATCH_EXTRACTION_RESPONSE_FORMAT
+            )
+            answer = _BatchExtractionResult.model_validate_json(
+                response.choices[0].message.content or ""
+            )
+        except Exception as e:
+            logger.exception("Error during batch extraction of %d pages", len(group))
+            error = ScraperError(
+                "An error occurred while analyzing the website content. Please try again.",
+                f"Batch extraction error: {str(e)}"
+            )
+            return [error] * len(group)
+
+        by_page = {item.page: item for item in answer.results}
+        results = []
+        for page, (_, url, cleaned, _) in enumerate(group):
+            item = by_page.get(page)
+            if item is None:
+                results.append(ScraperError(
+                    "Could not identify the business name from the website content. The page might not contain sufficient business information.",
+                    "Page missing from batch extraction response"
+                ))
+                continue
+            try:
+                business = _to_business(url, item)
+            except ScraperError as e:
+                results.append(e)
+                continue
+            cache_set("scrape", _extraction_cache_key(url, cleaned, excerpt=True), business)
+            results.append(business)
+
+        return results
+
+    async def fetch_page_text(self, url: str) -> Tuple[str, str]:
+        """
+        Fetch a page and clean it for a model prompt, without extracting.
+
+        For callers that run their own extraction (LeadAgentAI.extract_with_insights).
+
+        Returns:
+            tuple: (normalized url, cleaned page text)
+
+        Raises:
+            ScraperError: If the page cannot be fetched or has no meaningful text
+        """
+        url = _normalize_url(url)
+        return url, _page_text(await self._fetch_page(url))
+
+    async def _fetch_page(self, url: str) -> str:
+        """Fetch a page's HTML, reusing a recently fetched copy."""
+        html_content = cache_get("pages", url)
+        if html_content is None:
+            html_content = await self._fetch_html(url)
+            cache_set("pages", url, html_content)
+        return html_content
+
     async def _fetch_html(self, url: str) -> str:
         """
         Fetch HTML content from URL.
@@ -86,32 +545,24 @@ class URLScraperService:
             ScraperError: If fetching fails
         """
         try:
-            async with httpx.AsyncClient(
-                timeout=30.0,
-                follow_redirects=True,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                }
-            ) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                # Get text content, limit to first 50KB to avoid huge pages
-                content = response.text[:50000]
-                print(f"[URLScraper] Fetched {len(content)} chars from {url}")
-
-                # Check if we got meaningful content
-                if len(content.strip()) < 100:
-                    raise ScraperError(
-                        "The website returned insufficient content. It may require JavaScript or have blocked access.",
-                        f"Content length: {len(content)}"
-                    )
-
-                return content
+            # Only the first 50KB is downloaded, to avoid huge pages
+            response, content = await _fetch_with_retry(url)
+            response.raise_for_status()
+
+            logger.debug("Fetched %d chars from %s", len(content), url)
+
+            # Check if we got meaningful content
+            if len(content.strip()) < 100:
+                raise ScraperError(
+                    "The website returned insufficient content. It may require JavaScript or have blocked access.",
+                    f"Content length: {len(content)}"
+                )
+
+            return content
 
         except httpx.HTTPStatusError as e:
             status_code = e.response.status_code
-            print(f"[URLScraper] HTTP error fetching {url}: {status_code}")
+            logger.warning("HTTP error fetching %s: %s", url, status_code)
 
             # Provide user-friendly error messages based on status code
             if status_code == 403:
@@ -141,14 +592,14 @@ class URLScraperService:
                 )
 
         except httpx.TimeoutException as e:
-            print(f"[URLScraper] Timeout fetching {url}: {e}")
+            logger.warning("Timeout fetching %s: %s", url, e)
             raise ScraperError(
                 "The website took too long to respond. Please try again or check if the URL is correct.",
                 f"Timeout connecting to {url}"
             )
 
         except httpx.RequestError as e:
-            print(f"[URLScraper] Request error fetching {url}: {e}")
+            logger.warning("Request error fetching %s: %s", url, e)
             raise ScraperError(
                 "Unable to connect to the website. Please check the URL and your internet connection.",
                 f"Connection error: {str(e)}"
@@ -159,7 +610,7 @@ class URLScraperService:
             raise
 
         except Exception as e:
-            print(f"[URLScraper] Unexpected error fetching {url}: {e}")
+            logger.exception("Unexpected error fetching %s", url)
             raise ScraperError(
                 "An unexpected error occurred while fetching the website. Please try again.",
                 f"Unexpected error: {str(e)}"
@@ -178,20 +629,23 @@ class URLScraperService:
         """
 
         # Clean up HTML to reduce tokens
-        import re
-        cleaned = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = re.sub(r'<style[^>]*>.*?</style>', '', cleaned, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = re.sub(r'<[^>]+>', ' ', cleaned)  # Remove HTML tags
-        cleaned = re.sub(r'\s+', ' ', cleaned)  # Collapse whitespace
-        cleaned = cleaned[:20000]  # Limit to 20K chars
-
-        # Check if cleaned content is meaningful
-        if len(cleaned.strip()) < 50:
-            raise ScraperError(
-                "Unable to extract meaningful content from the page. The website might be JavaScript-heavy or blocked.",
-                f"Cleaned content too short: {len(cleaned)} chars"
-            )
+        cleaned = _page_text(html_content)
+
+        cache_key = _extraction_cache_key(url, cleaned)
+        cached = cache_get("scrape", cache_key)
+        if cached is not None:
+            logger.debug("Reusing extraction for %s", url)
+            return cached
+
+        return await self._extract_cleaned(url, cleaned, cache_key)
 
+    async def _extract_cleaned(self, url: str, cleaned: str, cache_key: str) -> ExtractedBusiness:
+        """
+        Extract business information from a page's cleaned text using GPT-4o-mini.
+
+        Raises:
+            ScraperError: If extraction fails
+        """
         prompt = f"""You are extracting business information from a website.
 
 URL: {url}
@@ -201,65 +655,44 @@ WEBSITE CONTENT:
 
 Extract the following information about this business. Be accurate - only extract what is actually present on the page.
 
-Return ONLY valid JSON in this exact format:
-{{
-    "business_name": "The company/business name",
-    "description": "A 2-3 sentence description of what the business does, their services, and target market",
-    "address": "Physical address if found, or null",
-    "google_maps_url": "Google Maps link if found on page, or null"
-}}
-
-Rules:
-- Extract the actual business name, not the website domain
-- For description, summarize what the business does based on the content
-- Use null for any field you cannot find
-- For ADDRESS: Look for physical addresses, office locations, or mailing addresses
-- Return raw JSON only, no markdown formatting"""
+{_EXTRACTION_RULES}"""
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await create_chat_completion(
+                self.client,
                 model="gpt-4o-mini",
                 messages=[
-                    {"role": "system", "content": "You are a business information extraction assistant. Extract data accurately from website content and return valid JSON."},
+                    {"role": "system", "content": _EXTRACTION_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
                 max_tokens=500,
-                response_format={"type": "json_object"}
+                response_format=_EXTRACTION_RESPONSE_FORMAT
             )
 
-            # Parse the JSON response
-            response_text = response.choices[0].message.content.strip()
-            print(f"[URLScraper] GPT-4o-mini response: {response_text[:300]}...")
-
-            data = json.loads(response_text)
-
-            # Validate that we got at least a business name
-            business_name = data.get("business_name", "").strip()
-            if not business_name or business_name == "Unknown Business":
+            # The schema guarantees the shape; a refusal comes back without content
+            response_text = response.choices[0].message.content
+            if not response_text:
                 raise ScraperError(
                     "Could not identify the business name from the website content. The page might not contain sufficient business information.",
-                    f"No valid business_name in response"
+                    f"No content in response (refusal: {response.choices[0].message.refusal})"
                 )
+            logger.debug("GPT-4o-mini response: %.300s", response_text)
 
-            # Build ExtractedBusiness
-            business = ExtractedBusiness(
-                business_name=business_name,
-                description=data.get("description"),
-                address=data.get("address"),
-                website=url,
-                google_maps_url=data.get("google_maps_url")
-            )
+            data = _ExtractionResult.model_validate_json(response_text)
 
-            print(f"[URLScraper] Extracted: {business.business_name}")
+            # Validate that we got at least a business name
+            business = _to_business(url, data)
+
+            logger.debug("Extracted: %s", business.business_name)
+            cache_set("scrape", cache_key, business)
             return business
 
-        except json.JSONDecodeError as e:
-            print(f"[URLScraper] JSON parse error: {e}")
-            print(f"[URLScraper] Response text: {response_text if 'response_text' in locals() else 'N/A'}")
+        except ValidationError as e:
+            logger.warning("Response did not match the schema: %s\nResponse text: %s", e, response_text)
             raise ScraperError(
                 "Failed to parse business information from the website. The AI returned invalid data.",
-                f"JSON decode error: {str(e)}"
+                f"Schema validation error: {str(e)}"
             )
 
         except ScraperError:
@@ -267,8 +700,14 @@ Rules:
             raise
 
         except Exception as e:
-            print(f"[URLScraper] Error during extraction: {e}")
+            logger.exception("Error during extraction for %s", url)
             raise ScraperError(
                 "An error occurred while analyzing the website content. Please try again.",
                 f"Extraction error: {str(e)}"
             )
+
+
+@lru_cache()
+def get_url_scraper() -> URLScraperService:
+    """Get the shared URLScraperService (uses the process-wide OpenAI client)."""
+    return URLScraperService(settings.openai_api_key)
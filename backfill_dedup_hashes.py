@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Recompute lead_agent_prospects.dedup_hash with the current formula.
+
+Prospect dedup keys switched from truncated SHA-256 over lowercased values to
+BLAKE2b (16-byte digest) over casefolded values. Run this once after
+deploying that change so existing prospects keep deduplicating against new
+ones. Safe to re-run: rows that already match are skipped.
+
+Usage: python backfill_dedup_hashes.py [--dry-run]
+"""
+import sys
+from pathlib import Path
+
+# Reuse the backend's settings (.env) and the exact hashing function
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.database import get_supabase_admin  # noqa: E402
+from services.url_scraper import compute_dedup_hash  # noqa: E402
+
+PAGE_SIZE = 1000
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv[1:]
+    db = get_supabase_admin()
+
+    scanned = updated = conflicts = 0
+    offset = 0
+
+    print("🔄 Recomputing prospect dedup hashes..." + (" (dry run)" if dry_run else ""))
+
+    while True:
+        page = db.table("lead_agent_prospects").select(
+            "id, org_id, business_name, website, dedup_hash"
+        ).order("id").range(offset, offset + PAGE_SIZE - 1).execute()
+
+        rows = page.data or []
+        if not rows:
+            break
+
+        for row in rows:
+            scanned += 1
+            new_hash = compute_dedup_hash(row["business_name"], row.get("website"))
+            if new_hash == row["dedup_hash"]:
+                continue
+
+            if dry_run:
+                updated += 1
+                continue
+
+            try:
+                db.table("lead_agent_prospects").update({
+                    "dedup_hash": new_hash
+                }).eq("id", row["id"]).execute()
+                updated += 1
+            except Exception as e:
+                # Two rows that only differed by case now collide on (org_id, dedup_hash)
+                conflicts += 1
+                print(f"⚠️  Skipped prospect {row['id']} (org {row['org_id']}): {e}")
+
+        offset += PAGE_SIZE
+
+    print()
+    print(f"✅ Scanned {scanned} prospects, {'would update' if dry_run else 'updated'} {updated}")
+    if conflicts:
+        print(f"⚠️  {conflicts} prospects left unchanged because they duplicate another prospect")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+-- Migration: Bulk write of AI-generated prospect insights
+--
+-- The insights worker analyses several prospects per GPT-4o call. This
+-- function writes all of their results back in a single round-trip.
+-- It is an UPDATE ... FROM rather than an upsert, so a prospect deleted
+-- while its insights were being generated is not re-inserted.
+
+CREATE OR REPLACE FUNCTION la_apply_prospect_insights(p_rows JSONB)
+RETURNS INTEGER
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE lead_agent_prospects p
+        SET
+            business_summary = r.business_summary,
+            pain_points = COALESCE(r.pain_points, '[]'::jsonb),
+            call_script = COALESCE(r.call_script, '[]'::jsonb),
+            ai_generated_at = COALESCE(r.ai_generated_at, NOW())
+        FROM jsonb_to_recordset(p_rows) AS r(
+            id UUID,
+            business_summary TEXT,
+            pain_points JSONB,
+            call_script JSONB,
+            ai_generated_at TIMESTAMPTZ
+        )
+        WHERE p.id = r.id
+        RETURNING p.id
+    )
+    SELECT COUNT(*)::INTEGER FROM updated;
+$$;
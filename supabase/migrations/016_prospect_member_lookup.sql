@@ -0,0 +1,30 @@
+-- Migration: Fetch a prospect and the caller's org membership in one call
+--
+-- Per-prospect endpoints used to load the prospect, then look up the user
+-- and their membership of the prospect's org. This function does all three
+-- with one query.
+--
+-- Returns NULL when the prospect does not exist. Otherwise returns:
+--   { "prospect": {...row...}, "user_id": uuid|null, "role": text|null }
+-- A null user_id means the Telegram user is unknown. A null role means
+-- they are not a member of the prospect's org.
+-- Runs as the invoker, so the anon-deny RLS policies still apply.
+
+CREATE OR REPLACE FUNCTION la_get_prospect_for_member(
+    p_prospect_id UUID,
+    p_telegram_id BIGINT
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'prospect', to_jsonb(p),
+        'user_id', u.id,
+        'role', m.role
+    )
+    FROM lead_agent_prospects p
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE p.id = p_prospect_id;
+$$;
@@ -0,0 +1,40 @@
+-- Migration: Include the next follow-up in the prospect lookup RPC
+--
+-- The prospect detail endpoint also needs the earliest pending scheduled
+-- notification. p_with_follow_up = TRUE adds it as "next_follow_up", so the
+-- detail view is served by a single round-trip. It is only computed for
+-- members of the prospect's org.
+
+DROP FUNCTION IF EXISTS la_get_prospect_for_member(UUID, BIGINT);
+
+CREATE OR REPLACE FUNCTION la_get_prospect_for_member(
+    p_prospect_id UUID,
+    p_telegram_id BIGINT,
+    p_with_follow_up BOOLEAN DEFAULT FALSE
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'prospect', to_jsonb(p),
+        'user_id', u.id,
+        'role', m.role,
+        'next_follow_up', CASE WHEN p_with_follow_up AND m.role IS NOT NULL THEN (
+            SELECT jsonb_build_object(
+                'date', n.scheduled_for,
+                'message', n.message,
+                'reasoning', COALESCE(n.ai_reasoning, '')
+            )
+            FROM lead_agent_scheduled_notifications n
+            WHERE n.prospect_id = p.id
+              AND n.status = 'pending'
+            ORDER BY n.scheduled_for ASC
+            LIMIT 1
+        ) END
+    )
+    FROM lead_agent_prospects p
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE p.id = p_prospect_id;
+$$;
@@ -0,0 +1,40 @@
+-- Migration: Track AI insight jobs submitted to the OpenAI Batch API
+--
+-- Non-urgent insights (bulk imports) are sent through the Batch API at half
+-- the token price. Each row is one submitted batch; the poller in the backend
+-- picks up rows still 'submitted', downloads finished results and writes them
+-- back with la_apply_prospect_insights.
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- LEAD AGENT INSIGHT BATCHES TABLE
+-- ─────────────────────────────────────────────────────────────────────────────
+
+CREATE TABLE IF NOT EXISTS lead_agent_insight_batches (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    openai_batch_id TEXT NOT NULL UNIQUE,
+    input_file_id TEXT,
+
+    -- prospect_id -> {org_id, business_name, business_description} per request
+    prospects JSONB NOT NULL DEFAULT '{}',
+    request_count INTEGER NOT NULL DEFAULT 0,
+
+    status TEXT NOT NULL DEFAULT 'submitted'
+        CHECK (status IN ('submitted', 'completed', 'failed')),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    completed_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_lead_agent_insight_batches_submitted
+    ON lead_agent_insight_batches(created_at)
+    WHERE status = 'submitted';
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- ENABLE ROW LEVEL SECURITY
+-- ─────────────────────────────────────────────────────────────────────────────
+
+ALTER TABLE lead_agent_insight_batches ENABLE ROW LEVEL SECURITY;
+
+-- Deny all access for anon role (service role bypasses RLS)
+DROP POLICY IF EXISTS "Deny all for anon on lead_agent_insight_batches" ON lead_agent_insight_batches;
+CREATE POLICY "Deny all for anon on lead_agent_insight_batches"
+    ON lead_agent_insight_batches TO anon USING (false);
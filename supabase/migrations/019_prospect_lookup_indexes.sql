@@ -0,0 +1,17 @@
+-- Migration: Composite indexes for per-prospect lookups
+--
+-- The prospect detail's next follow-up (la_get_prospect_for_member, 017)
+-- filters pending notifications by prospect and takes the earliest one, and
+-- the journal list reads a prospect's entries newest first. The existing
+-- single-column indexes leave a filter + sort for both; these make them a
+-- single index range scan.
+--
+-- (org_id, dedup_hash) is already covered by the UNIQUE constraint on
+-- lead_agent_prospects (005), so no extra index is needed for dedup.
+
+CREATE INDEX IF NOT EXISTS idx_notifications_prospect_pending
+    ON lead_agent_scheduled_notifications(prospect_id, scheduled_for)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_journal_entries_prospect_created
+    ON lead_agent_journal_entries(prospect_id, created_at DESC);
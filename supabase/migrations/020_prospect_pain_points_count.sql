@@ -0,0 +1,9 @@
+-- Migration: Pain point count for the prospect list
+--
+-- The prospect list only needs to know whether AI insights exist, not the
+-- full pain_points JSONB. A stored generated column keeps the count in sync
+-- without a trigger, so the list can select it instead of the whole blob.
+
+ALTER TABLE lead_agent_prospects
+    ADD COLUMN IF NOT EXISTS pain_points_count INTEGER
+    GENERATED ALWAYS AS (jsonb_array_length(COALESCE(pain_points, '[]'::jsonb))) STORED;
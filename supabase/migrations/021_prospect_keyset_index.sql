@@ -0,0 +1,8 @@
+-- Migration: Index for keyset pagination of the prospect list
+--
+-- GET /prospects pages with a (created_at, id) cursor within an org instead
+-- of OFFSET. This index serves the filter and the ORDER BY created_at DESC,
+-- id DESC directly, so each page is a range scan no matter how deep it is.
+
+CREATE INDEX IF NOT EXISTS idx_lead_agent_prospects_org_created
+    ON lead_agent_prospects(org_id, created_at DESC, id DESC);
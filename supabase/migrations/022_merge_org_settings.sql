@@ -0,0 +1,16 @@
+-- Migration: Atomic merge into organizations.settings
+--
+-- Settings endpoints used to read settings, merge in Python and write the
+-- whole object back: two round-trips, and a concurrent write between them
+-- was silently lost. This merges a patch in a single UPDATE instead.
+-- Top-level keys in p_patch replace existing ones; other keys are kept.
+
+CREATE OR REPLACE FUNCTION merge_org_settings(p_org_id UUID, p_patch JSONB)
+RETURNS JSONB
+LANGUAGE sql
+AS $$
+    UPDATE organizations
+    SET settings = COALESCE(settings, '{}'::jsonb) || p_patch
+    WHERE id = p_org_id
+    RETURNING settings;
+$$;
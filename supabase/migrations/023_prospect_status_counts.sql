@@ -0,0 +1,12 @@
+-- Migration: Per-status prospect counts
+--
+-- The lead agent dashboard only needs how many prospects an org has in each
+-- status. Grouping in Postgres returns at most four rows instead of every
+-- prospect's status. security_invoker keeps the prospects table's RLS in
+-- force for callers of the view.
+
+CREATE OR REPLACE VIEW lead_agent_prospect_status_counts
+WITH (security_invoker = true) AS
+SELECT org_id, status, COUNT(*)::INTEGER AS count
+FROM lead_agent_prospects
+GROUP BY org_id, status;
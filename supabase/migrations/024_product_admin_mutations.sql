@@ -0,0 +1,91 @@
+-- Migration: Product update/delete with the admin check in the same call
+--
+-- The lead agent product endpoints looked up the product's org, checked the
+-- caller's role and then ran the UPDATE/DELETE: two round-trips per write.
+-- These functions resolve the org and the caller's role and apply the
+-- change only for an org admin, in one call. The caller gets back what it
+-- needs to report errors and invalidate caches:
+--   {found, org_id, user_id, role, product}
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- UPDATE
+-- ─────────────────────────────────────────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION la_update_product_as_admin(
+    p_product_id UUID,
+    p_telegram_id BIGINT,
+    p_patch JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+    v_product JSONB;
+BEGIN
+    SELECT p.org_id, u.id, m.role
+    INTO v_org_id, v_user_id, v_role
+    FROM lead_agent_products p
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE p.id = p_product_id;
+
+    IF v_role = 'admin' THEN
+        UPDATE lead_agent_products
+        SET
+            name = COALESCE(p_patch->>'name', name),
+            description = COALESCE(p_patch->>'description', description),
+            price = COALESCE((p_patch->>'price')::DECIMAL(12, 2), price),
+            is_active = COALESCE((p_patch->>'is_active')::BOOLEAN, is_active)
+        WHERE id = p_product_id
+        RETURNING to_jsonb(lead_agent_products.*) INTO v_product;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'product', v_product
+    );
+END;
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- DELETE
+-- ─────────────────────────────────────────────────────────────────────────────
+
+CREATE OR REPLACE FUNCTION la_delete_product_as_admin(
+    p_product_id UUID,
+    p_telegram_id BIGINT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+BEGIN
+    SELECT p.org_id, u.id, m.role
+    INTO v_org_id, v_user_id, v_role
+    FROM lead_agent_products p
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE p.id = p_product_id;
+
+    IF v_role = 'admin' THEN
+        DELETE FROM lead_agent_products WHERE id = p_product_id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'product', NULL
+    );
+END;
+$$;
@@ -0,0 +1,9 @@
+-- Migration: Index for per-status prospect counts
+--
+-- The dashboard reads lead_agent_prospect_status_counts (023) for one org.
+-- With (org_id, status) the per-org GROUP BY status is an index-only scan
+-- instead of a heap read of every prospect in the org. The same index also
+-- serves the prospect list filtered by status.
+
+CREATE INDEX IF NOT EXISTS idx_lead_agent_prospects_org_status
+    ON lead_agent_prospects(org_id, status);
@@ -0,0 +1,188 @@
+-- Migration: Prospect and journal writes with the access check in the same call
+--
+-- The prospect status/contact/delete and journal edit/delete endpoints first
+-- loaded the row with the caller's membership (la_get_prospect_for_member),
+-- then ran the UPDATE/DELETE: two round-trips per write, with a window
+-- between the check and the write. Like the product functions (024), these
+-- resolve the caller and apply the change only when the check passes, and
+-- return what the endpoint needs to report errors and invalidate caches.
+--
+-- Prospects: {found, org_id, user_id, role, prospect}
+-- Journal:   {found, org_id, user_id, role, author_id, entry}
+-- (author_id is the entry's creator; only they may edit or delete it)
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- PROSPECTS
+-- ─────────────────────────────────────────────────────────────────────────────
+
+-- p_patch may contain status, phone and email; absent keys are left as-is
+CREATE OR REPLACE FUNCTION la_update_prospect_as_member(
+    p_prospect_id UUID,
+    p_telegram_id BIGINT,
+    p_patch JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+    v_prospect JSONB;
+BEGIN
+    SELECT p.org_id, u.id, m.role
+    INTO v_org_id, v_user_id, v_role
+    FROM lead_agent_prospects p
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE p.id = p_prospect_id
+    FOR UPDATE OF p;
+
+    IF v_role IS NOT NULL THEN
+        UPDATE lead_agent_prospects
+        SET
+            status = CASE WHEN p_patch ? 'status' THEN p_patch->>'status' ELSE status END,
+            phone = CASE WHEN p_patch ? 'phone' THEN p_patch->>'phone' ELSE phone END,
+            email = CASE WHEN p_patch ? 'email' THEN p_patch->>'email' ELSE email END
+        WHERE id = p_prospect_id
+        -- The endpoints only build a card from it: leave out the call script
+        RETURNING to_jsonb(lead_agent_prospects.*) - 'call_script' - 'dedup_hash' INTO v_prospect;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'prospect', v_prospect
+    );
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION la_delete_prospect_as_member(
+    p_prospect_id UUID,
+    p_telegram_id BIGINT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+BEGIN
+    SELECT p.org_id, u.id, m.role
+    INTO v_org_id, v_user_id, v_role
+    FROM lead_agent_prospects p
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE p.id = p_prospect_id
+    FOR UPDATE OF p;
+
+    IF v_role IS NOT NULL THEN
+        DELETE FROM lead_agent_prospects WHERE id = p_prospect_id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'prospect', NULL
+    );
+END;
+$$;
+
+-- ─────────────────────────────────────────────────────────────────────────────
+-- JOURNAL ENTRIES
+-- ─────────────────────────────────────────────────────────────────────────────
+
+-- p_patch may contain content and interaction_type; an empty patch returns
+-- the entry unchanged
+CREATE OR REPLACE FUNCTION la_update_journal_entry_as_author(
+    p_entry_id UUID,
+    p_prospect_id UUID,
+    p_telegram_id BIGINT,
+    p_patch JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+    v_author_id UUID;
+    v_entry JSONB;
+BEGIN
+    SELECT p.org_id, u.id, m.role, e.user_id, to_jsonb(e)
+    INTO v_org_id, v_user_id, v_role, v_author_id, v_entry
+    FROM lead_agent_journal_entries e
+    JOIN lead_agent_prospects p ON p.id = e.prospect_id
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE e.id = p_entry_id
+      AND e.prospect_id = p_prospect_id
+    FOR UPDATE OF e;
+
+    IF v_role IS NOT NULL AND v_author_id = v_user_id AND p_patch <> '{}'::JSONB THEN
+        UPDATE lead_agent_journal_entries
+        SET
+            content = CASE WHEN p_patch ? 'content' THEN p_patch->>'content' ELSE content END,
+            interaction_type = CASE
+                WHEN p_patch ? 'interaction_type' THEN p_patch->>'interaction_type'
+                ELSE interaction_type
+            END
+        WHERE id = p_entry_id
+        RETURNING to_jsonb(lead_agent_journal_entries.*) INTO v_entry;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'author_id', v_author_id,
+        'entry', v_entry
+    );
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION la_delete_journal_entry_as_author(
+    p_entry_id UUID,
+    p_prospect_id UUID,
+    p_telegram_id BIGINT
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+    v_author_id UUID;
+BEGIN
+    SELECT p.org_id, u.id, m.role, e.user_id
+    INTO v_org_id, v_user_id, v_role, v_author_id
+    FROM lead_agent_journal_entries e
+    JOIN lead_agent_prospects p ON p.id = e.prospect_id
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE e.id = p_entry_id
+      AND e.prospect_id = p_prospect_id
+    FOR UPDATE OF e;
+
+    IF v_role IS NOT NULL AND v_author_id = v_user_id THEN
+        DELETE FROM lead_agent_journal_entries WHERE id = p_entry_id;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'author_id', v_author_id,
+        'entry', NULL
+    );
+END;
+$$;
@@ -0,0 +1,13 @@
+-- Migration: Keyset index for the status-filtered prospect list
+--
+-- GET /prospects?status=... pages with the same (created_at, id) cursor as
+-- the unfiltered list (021). With status between org_id and the sort keys,
+-- each filtered page is a single index range scan too.
+--
+-- Its (org_id, status) prefix also serves the per-status counts, so the
+-- narrower index from 025 is no longer needed.
+
+CREATE INDEX IF NOT EXISTS idx_lead_agent_prospects_org_status_created
+    ON lead_agent_prospects(org_id, status, created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_lead_agent_prospects_org_status;
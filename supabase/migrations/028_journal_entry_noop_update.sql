@@ -0,0 +1,70 @@
+-- Migration: Skip journal entry updates that change nothing
+--
+-- Mobile clients often save an entry without editing it. The update
+-- function (026) still rewrote the row, and the endpoint re-ran the
+-- timekeeping agent (an LLM call) for it. The UPDATE now only runs when a
+-- patched field differs from the stored value, and the result carries
+-- 'changed' so the endpoint can skip the agent too.
+--
+-- Returns {found, org_id, user_id, role, author_id, entry, changed}
+
+CREATE OR REPLACE FUNCTION la_update_journal_entry_as_author(
+    p_entry_id UUID,
+    p_prospect_id UUID,
+    p_telegram_id BIGINT,
+    p_patch JSONB
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_org_id UUID;
+    v_user_id UUID;
+    v_role TEXT;
+    v_author_id UUID;
+    v_entry JSONB;
+    v_changed BOOLEAN := FALSE;
+BEGIN
+    SELECT p.org_id, u.id, m.role, e.user_id, to_jsonb(e)
+    INTO v_org_id, v_user_id, v_role, v_author_id, v_entry
+    FROM lead_agent_journal_entries e
+    JOIN lead_agent_prospects p ON p.id = e.prospect_id
+    LEFT JOIN users u ON u.telegram_id = p_telegram_id
+    LEFT JOIN memberships m ON m.user_id = u.id AND m.org_id = p.org_id
+    WHERE e.id = p_entry_id
+      AND e.prospect_id = p_prospect_id
+    FOR UPDATE OF e;
+
+    IF v_role IS NOT NULL AND v_author_id = v_user_id THEN
+        SELECT EXISTS (
+            SELECT 1
+            FROM jsonb_each_text(p_patch) AS patch(key, value)
+            WHERE patch.key IN ('content', 'interaction_type')
+              AND patch.value IS DISTINCT FROM v_entry->>patch.key
+        )
+        INTO v_changed;
+    END IF;
+
+    IF v_changed THEN
+        UPDATE lead_agent_journal_entries
+        SET
+            content = CASE WHEN p_patch ? 'content' THEN p_patch->>'content' ELSE content END,
+            interaction_type = CASE
+                WHEN p_patch ? 'interaction_type' THEN p_patch->>'interaction_type'
+                ELSE interaction_type
+            END
+        WHERE id = p_entry_id
+        RETURNING to_jsonb(lead_agent_journal_entries.*) INTO v_entry;
+    END IF;
+
+    RETURN jsonb_build_object(
+        'found', v_org_id IS NOT NULL,
+        'org_id', v_org_id,
+        'user_id', v_user_id,
+        'role', v_role,
+        'author_id', v_author_id,
+        'entry', v_entry,
+        'changed', v_changed
+    );
+END;
+$$;